@@ -22,5 +22,7 @@ from mingus.containers.note_container import NoteContainer
 from mingus.containers.bar import Bar
 from mingus.containers.track import Track
 from mingus.containers.composition import Composition
+from mingus.containers.note_table import NoteTable
+from mingus.containers.timeline import Timeline
 from mingus.containers.suite import Suite
 from mingus.containers.instrument import Instrument, Piano, Guitar, MidiInstrument
@@ -18,43 +18,199 @@
 
 from __future__ import absolute_import
 
+import copy
+from fractions import Fraction
+
 import six
 
 from mingus.containers.mt_exceptions import MeterFormatError
+from mingus.containers.note import Note, _set_slots_state, _slots_state
 from mingus.containers.note_container import NoteContainer
 from mingus.core import meter as _meter
 from mingus.core import progressions, keys
+from mingus.core import value as _value
 from typing import Optional
 
 
+def _event_note(pitch, velocity, channel, validate, container=None):
+    """Return a Note for a pitch in an event.
+
+    Note strings without an octave are placed like container.add_note
+    would place them, if a container is given.
+    """
+    if hasattr(pitch, "name"):
+        if velocity is None and channel is None:
+            return pitch
+        # Copy Notes instead of changing the velocity of the caller's Note
+        n = copy.copy(pitch)
+    elif container is not None and isinstance(pitch, six.string_types):
+        n = container._note_from_string(pitch)
+    else:
+        n = Note(pitch)
+    if validate:
+        if velocity is not None:
+            n.set_velocity(velocity)
+        if channel is not None:
+            n.set_channel(channel)
+    else:
+        if velocity is not None:
+            n.velocity = velocity
+        if channel is not None:
+            n.channel = channel
+    return n
+
+
+def _event_notes(event, validate=True):
+    """Return the NoteContainer (None for a rest) and the duration of an
+    event, a (pitch, duration[, velocity, channel]) tuple.
+
+    The pitch can be None, an integer (see Note.from_int), a note string, a
+    Note, a NoteContainer, or a list or tuple of integers, note strings and
+    Notes for a chord. Note strings without an octave are placed like
+    NoteContainer does: a single note in octave 4, and the notes of a
+    chord on or above the note before. The velocity and channel are set on
+    new Notes and on copies of the given Notes; NoteContainers are used as
+    they are.
+
+    If validate is True the velocity and channel are checked like Note does.
+    """
+    pitch = event[0]
+    velocity = event[2] if len(event) > 2 else None
+    channel = event[3] if len(event) > 3 else None
+    if pitch is None or hasattr(pitch, "notes"):
+        return (pitch, event[1])
+    if isinstance(pitch, (list, tuple)):
+        container = NoteContainer()
+        for p in pitch:
+            container.add_note(_event_note(p, velocity, channel, validate, container))
+        return (container, event[1])
+    return (NoteContainer._from_notes([_event_note(pitch, velocity, channel, validate)]), event[1])
+
+
+class BarEntry(object):
+    """An entry in a Bar: the beat it starts on, its duration and the
+    NoteContainer that is played (None for a rest).
+
+    Entries behave like the [beat, duration, notes] lists Bars used to
+    hold: they can be indexed, assigned to, unpacked and compared with
+    lists, but take less memory.
+
+    Example:
+    >>> e = BarEntry(0.0, 4, None)
+    >>> e[1] = 8
+    >>> e
+    [0.0, 8, None]
+    >>> e == [0.0, 8, None]
+    True
+    """
+
+    __slots__ = ("beat", "duration", "notes")
+
+    def __init__(self, beat, duration, notes):
+        self.beat = beat
+        self.duration = duration
+        self.notes = notes
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.beat
+        if index == 1:
+            return self.duration
+        if index == 2:
+            return self.notes
+        return [self.beat, self.duration, self.notes][index]
+
+    def __setitem__(self, index, value):
+        setattr(self, self.__slots__[index], value)
+
+    def __iter__(self):
+        return iter((self.beat, self.duration, self.notes))
+
+    def __len__(self):
+        return 3
+
+    def __eq__(self, other):
+        if not isinstance(other, (BarEntry, list, tuple)):
+            return NotImplemented
+        return [self.beat, self.duration, self.notes] == list(other)
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        if res is NotImplemented:
+            return res
+        return not res
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (BarEntry, (self.beat, self.duration, self.notes))
+
+    def __repr__(self):
+        return repr([self.beat, self.duration, self.notes])
+
+
 class Bar(object):
     """A bar object.
 
     A Bar is basically a container for NoteContainers.
 
     Bars can be stored together with Instruments in Tracks.
+
+    If exact is True, the positions and the length of the Bar are kept as
+    Fractions of a whole note instead of floats, so they add up exactly
+    (see value.length) and a Bar is only full when it is completely filled.
+
+    The entries of the Bar are kept in the list bar as BarEntry objects,
+    which can be used like [beat, duration, notes] lists.
     """
 
-    key = "C"
-    meter = (4, 4)
-    current_beat = 0.0
-    length = 0.0
-    bar = []
+    __slots__ = ("key", "meter", "current_beat", "length", "bar", "exact")
 
-    def __init__(self, key="C", meter=(4, 4)):
+    def __init__(self, key="C", meter=(4, 4), exact=False):
         # warning should check types
         if isinstance(key, six.string_types):
             key = keys.Key(key)
         self.key = key
+        self.exact = exact
         self.set_meter(meter)
         self.empty()
 
+    @classmethod
+    def from_events(cls, events, key="C", meter=(4, 4), exact=False, validate=True):
+        """Return a new Bar with the events placed one after the other.
+
+        The events are (pitch, duration[, velocity, channel]) tuples; see
+        Track.extend for the pitches that are understood. If validate is
+        False the velocities and channels are not checked, which is a bit
+        faster for trusted input.
+
+        Raise a ValueError if the events don't fit in the bar.
+
+        Example:
+        >>> Bar.from_events([(48, 2), (['E', 'G'], 4, 90), (None, 4)])
+        [[0.0, 2, ['C-4']], [0.5, 4, ['E-4', 'G-4']], [0.75, 4, None]]
+        """
+        bar = cls(key, meter, exact)
+        for event in events:
+            (notes, duration) = _event_notes(event, validate)
+            if not bar._place(notes, duration):
+                raise ValueError(
+                    "The event %r doesn't fit in a bar of %d/%d" % (event, meter[0], meter[1])
+                )
+        return bar
+
     def empty(self):
         """Empty the Bar, remove all the NoteContainers."""
         self.bar = []
-        self.current_beat = 0.0
+        self.current_beat = Fraction(0) if self.exact else 0.0
         return self.bar
 
+    def _length(self, duration):
+        """Return the length of a note value in whole notes."""
+        if self.exact:
+            return _value.length(duration)
+        return 1.0 / duration
+
     def set_meter(self, meter):
         """Set the meter of this bar.
 
@@ -66,10 +222,13 @@ class Bar(object):
         # warning should raise exception
         if _meter.valid_beat_duration(meter[1]):
             self.meter = (meter[0], meter[1])
-            self.length = meter[0] * (1.0 / meter[1])
+            if self.exact:
+                self.length = Fraction(meter[0], meter[1])
+            else:
+                self.length = meter[0] * (1.0 / meter[1])
         elif meter == (0, 0):
             self.meter = (0, 0)
-            self.length = 0.0
+            self.length = Fraction(0) if self.exact else 0.0
         else:
             raise MeterFormatError(
                 "The meter argument '%s' is not an "
@@ -98,18 +257,32 @@ class Bar(object):
             notes = NoteContainer(notes)
         elif isinstance(notes, list):
             notes = NoteContainer(notes)
-        if self.current_beat + 1.0 / duration <= self.length or self.length == 0.0:
-            self.bar.append([self.current_beat, duration, notes])
-            self.current_beat += 1.0 / duration
+        return self._place(notes, duration)
+
+    def _place(self, notes, duration):
+        """Place a NoteContainer (or None) on the current_beat if it fits."""
+        length = self._length(duration)
+        if self.current_beat + length <= self.length or self.length == 0.0:
+            self.bar.append(BarEntry(self.current_beat, duration, notes))
+            self.current_beat += length
             return True
         else:
             return False
 
     def place_notes_at(self, notes, at):
         """Place notes at the given index."""
-        for x in self.bar:
-            if x[0] == at:
-                x[2] += notes
+        # The entries are ordered by beat (place_notes appends them), so the
+        # ones at the beat can be found with a binary search
+        (lo, hi) = (0, len(self.bar))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.bar[mid][0] < at:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < len(self.bar) and self.bar[lo][0] == at:
+            self.bar[lo][2] += notes
+            lo += 1
 
     def place_rest(self, duration):
         """Place a rest of given duration on the current_beat.
@@ -127,7 +300,7 @@ class Bar(object):
 
     def remove_last_entry(self):
         """Remove the last NoteContainer in the Bar."""
-        self.current_beat -= 1.0 / self.bar[-1][1]
+        self.current_beat -= self._length(self.bar[-1][1])
         self.bar = self.bar[:-1]
         return self.current_beat
 
@@ -138,6 +311,8 @@ class Bar(object):
             return False
         if len(self.bar) == 0:
             return False
+        if self.exact:
+            return self.current_beat >= self.length
         if self.current_beat >= self.length - 0.001:
             return True
         return False
@@ -172,6 +347,8 @@ class Bar(object):
 
     def value_left(self):
         """Return the value left on the Bar."""
+        if self.exact:
+            return 1 / self.space_left()
         return 1.0 / self.space_left()
 
     def augment(self):
@@ -265,6 +442,12 @@ class Bar(object):
             value = res
         self.bar[index][2] = value
 
+    def __getstate__(self):
+        return _slots_state(self)
+
+    def __setstate__(self, state):
+        _set_slots_state(self, state)
+
     def __repr__(self):
         """Enable str() and repr() for Bars."""
         return str(self.bar)
@@ -19,6 +19,7 @@ from __future__ import absolute_import
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from mingus.containers.mt_exceptions import UnexpectedObjectError
+from mingus.containers.note import _set_slots_state, _slots_state
 
 
 class Composition(object):
@@ -30,16 +31,20 @@ class Composition(object):
     Composition can be stored together in Suites.
     """
 
-    title = "Untitled"
-    subtitle = ""
-    author = ""
-    email = ""
-    description = ""
-    tracks = []
-    selected_tracks = []
+    __slots__ = (
+        "title",
+        "subtitle",
+        "author",
+        "email",
+        "description",
+        "tracks",
+        "selected_tracks",
+    )
 
     def __init__(self):
-        self.empty()
+        self.reset()
+        self.description = ""
+        self.selected_tracks = []
 
     def empty(self):
         """Remove all the tracks from this class."""
@@ -107,6 +112,12 @@ class Composition(object):
         """Enable the len() function."""
         return len(self.tracks)
 
+    def __getstate__(self):
+        return _slots_state(self)
+
+    def __setstate__(self, state):
+        _set_slots_state(self, state)
+
     def __repr__(self):
         """Return a string representing the class."""
         result = ""
@@ -29,6 +29,23 @@ _DEFAULT_CHANNEL = 1
 _DEFAULT_VELOCITY = 64
 
 
+def _slots_state(obj):
+    """Return the attributes of obj, an instance of a class with __slots__,
+    as a dictionary. Pickle protocols 0 and 1 can't do without it."""
+    state = dict(getattr(obj, "__dict__", ()))
+    for cls in type(obj).__mro__:
+        for attr in getattr(cls, "__slots__", ()):
+            if attr != "__dict__" and hasattr(obj, attr):
+                state[attr] = getattr(obj, attr)
+    return state
+
+
+def _set_slots_state(obj, state):
+    """Set the attributes of obj from a dictionary made by _slots_state."""
+    for (attr, value) in state.items():
+        setattr(obj, attr, value)
+
+
 class Note(object):
 
     """A note object.
@@ -44,12 +61,15 @@ class Note(object):
 
     You can use the class NoteContainer to group Notes together in intervals
     and chords.
+
+    Notes compare and hash by their integer value, which is computed once
+    and kept until the name or octave changes. Don't change a Note while it
+    is in a set or used as a dictionary key.
     """
 
-    name = _DEFAULT_NAME
-    octave = _DEFAULT_OCTAVE
-    channel = _DEFAULT_CHANNEL
-    velocity = _DEFAULT_VELOCITY
+    # string and fret are only set on notes that are played on a string
+    # instrument (see mingus.extra.tunings and mingus.extra.tablature)
+    __slots__ = ("_name", "_octave", "_int", "_velocity", "_channel", "string", "fret")
 
     def __init__(self, name="C", octave=4, dynamics=None, velocity=None, channel=None):
         """
@@ -59,6 +79,7 @@ class Note(object):
         :param int velocity: Integer (0-127)
         :param int channel: Integer (0-15)
         """
+        self._init_slots()
         if dynamics is None:
             dynamics = {}
 
@@ -78,6 +99,49 @@ class Note(object):
             raise NoteFormatError(
                 "Don't know what to do with name object: %r" % name)
 
+    def _init_slots(self):
+        self._name = _DEFAULT_NAME
+        self._octave = _DEFAULT_OCTAVE
+        self._int = None
+        # None until set, so players can tell the defaults from values that
+        # were set on the note
+        self._velocity = None
+        self._channel = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        self._int = None
+
+    @property
+    def octave(self):
+        return self._octave
+
+    @octave.setter
+    def octave(self, octave):
+        self._octave = octave
+        self._int = None
+
+    @property
+    def velocity(self):
+        return _DEFAULT_VELOCITY if self._velocity is None else self._velocity
+
+    @velocity.setter
+    def velocity(self, velocity):
+        self._velocity = velocity
+
+    @property
+    def channel(self):
+        return _DEFAULT_CHANNEL if self._channel is None else self._channel
+
+    @channel.setter
+    def channel(self, channel):
+        self._channel = channel
+
     @property
     def dynamics(self):
         """
@@ -190,13 +254,13 @@ class Note(object):
         >>> a
         'A-4'
         """
-        (old, o_octave) = (self.name, self.octave)
+        old = int(self)
         self.name = intervals.from_shorthand(self.name, interval, up)
         if up:
-            if self < Note(old, o_octave):
+            if int(self) < old:
                 self.octave += 1
         else:
-            if self > Note(old, o_octave):
+            if int(self) > old:
                 self.octave -= 1
 
     def from_int(self, integer):
@@ -210,6 +274,7 @@ class Note(object):
         """
         self.name = notes.int_to_note(integer % 12)
         self.octave = integer // 12
+        self._int = int(integer)
         return self
 
     def measure(self, other):
@@ -300,6 +365,12 @@ class Note(object):
                 octave += 1
         return self.set_note(name, octave, {})
 
+    def __getstate__(self):
+        return _slots_state(self)
+
+    def __setstate__(self, state):
+        _set_slots_state(self, state)
+
     def __int__(self):
         """Return the current octave multiplied by twelve and add
         notes.note_to_int to it.
@@ -307,13 +378,15 @@ class Note(object):
         This means a C-0 returns 0, C-1 returns 12, etc. This method allows
         you to use int() on Notes.
         """
-        res = self.octave * 12 + notes.note_to_int(self.name[0])
-        for n in self.name[1:]:
-            if n == "#":
-                res += 1
-            elif n == "b":
-                res -= 1
-        return res
+        if self._int is None:
+            res = self._octave * 12 + notes.note_to_int(self._name[0])
+            for n in self._name[1:]:
+                if n == "#":
+                    res += 1
+                elif n == "b":
+                    res -= 1
+            self._int = res
+        return self._int
 
     def __lt__(self, other):
         """Enable the comparing operators on Notes (>, <, \ ==, !=, >= and <=).
@@ -337,16 +410,34 @@ class Note(object):
         return int(self) == int(other)
 
     def __ne__(self, other):
-        return not self == other
+        if other is None:
+            return True
+        return int(self) != int(other)
 
     def __gt__(self, other):
-        return not (self < other or self == other)
+        if other is None:
+            return True
+        return int(self) > int(other)
 
     def __le__(self, other):
-        return self < other or self == other
+        if other is None:
+            return False
+        return int(self) <= int(other)
 
     def __ge__(self, other):
-        return not self < other
+        if other is None:
+            return True
+        return int(self) >= int(other)
+
+    def __hash__(self):
+        """Hash Notes by their note value, so enharmonic notes are the same
+        set member or dictionary key, like they are equal.
+
+        Example:
+        >>> len(set([Note('C#'), Note('Db'), Note('C#', 5)]))
+        2
+        """
+        return hash(int(self))
 
     def __repr__(self):
         """Return a helpful representation for printing Note classes."""
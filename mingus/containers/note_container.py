@@ -18,11 +18,17 @@ from __future__ import absolute_import
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from mingus.containers.note import Note
+from bisect import bisect_left
+from operator import attrgetter
+
+from mingus.containers.note import Note, _set_slots_state, _slots_state
 from mingus.core import intervals, chords, progressions
 from mingus.containers.mt_exceptions import UnexpectedObjectError
 import six
 
+# The integer value a Note has cached, or None
+_cached_int = attrgetter("_int")
+
 
 class NoteContainer(object):
 
@@ -33,47 +39,124 @@ class NoteContainer(object):
 
     It can be used to store single and multiple notes and is required for
     working with Bars.
+
+    The container keeps the sorted integer values of its notes next to
+    them, so notes can be inserted and looked up with a binary search
+    instead of by comparing Notes. Before the index is used it is checked
+    against the integer values the Notes cache, so it is rebuilt when the
+    notes list or the Notes in it are changed outside of the container.
     """
 
-    notes = []
+    # _indexed is the notes list the index was built for, _pitches a tuple
+    # with the integer values of its notes and _sorted whether they are in
+    # order
+    __slots__ = ("notes", "_indexed", "_pitches", "_sorted")
 
     def __init__(self, notes=None):
         if notes is None:
             notes = []
+        self._indexed = None
+        self._pitches = None
+        self._sorted = True
         self.empty()
         self.add_notes(notes)
 
+    @classmethod
+    def _from_notes(cls, notes):
+        """Return a container with the Note objects in notes, like
+        NoteContainer(notes) but without checking them one by one."""
+        by_pitch = {}
+        for n in notes:
+            by_pitch.setdefault(int(n), n)
+        pitches = sorted(by_pitch)
+        res = cls.__new__(cls)
+        res.notes = [by_pitch[p] for p in pitches]
+        res._pitches = tuple(pitches)
+        res._sorted = True
+        res._indexed = res.notes
+        return res
+
     def empty(self):
         """Empty the container."""
         self.notes = []
 
+    def _index(self):
+        """Return the integer values of the notes, rebuilding the index if
+        the notes have been changed outside of the container."""
+        if not self._index_is_valid():
+            pitches = tuple([int(n) for n in self.notes])
+            self._pitches = pitches
+            self._sorted = all(pitches[i] <= pitches[i + 1] for i in range(len(pitches) - 1))
+            self._indexed = self.notes
+        return self._pitches
+
+    def _index_is_valid(self):
+        """Return True if the index still holds the integer values of the
+        notes, in order.
+
+        Changing the name or octave of a Note clears its cached integer
+        value, so comparing the cached values with the index catches Notes
+        that were changed in place, also through other containers.
+        """
+        if self._indexed is not self.notes or len(self._pitches) != len(self.notes):
+            return False
+        try:
+            return tuple(map(_cached_int, self.notes)) == self._pitches
+        except AttributeError:
+            return False
+
+    def _invalidate(self):
+        self._indexed = None
+
+    def _has_pitch(self, pitch):
+        pitches = self._index()
+        if self._sorted:
+            i = bisect_left(pitches, pitch)
+            return i < len(pitches) and pitches[i] == pitch
+        return pitch in pitches
+
     def add_note(self, note, octave=None, dynamics=None):
         """Add a note to the container and sorts the notes from low to high.
 
         The note can either be a string, in which case you could also use
         the octave and dynamics arguments, or a Note object.
         """
-        if dynamics is None:
-            dynamics = {}
         if isinstance(note, six.string_types):
-            if octave is not None:
-                note = Note(note, octave, dynamics)
-            elif len(self.notes) == 0:
-                note = Note(note, 4, dynamics)
-            else:
-                if Note(note, self.notes[-1].octave) < self.notes[-1]:
-                    note = Note(note, self.notes[-1].octave + 1, dynamics)
-                else:
-                    note = Note(note, self.notes[-1].octave, dynamics)
+            note = self._note_from_string(note, octave, dynamics)
         if not hasattr(note, "name"):
             raise UnexpectedObjectError(
                 "Object '%s' was not expected. " "Expecting a mingus.containers.Note object." % note
             )
-        if note not in self.notes:
+        pitches = self._index()
+        pitch = int(note)
+        if self._sorted:
+            i = bisect_left(pitches, pitch)
+            if i == len(pitches) or pitches[i] != pitch:
+                self.notes.insert(i, note)
+                self._pitches = pitches[:i] + (pitch,) + pitches[i:]
+        elif pitch not in pitches:
             self.notes.append(note)
             self.notes.sort()
+            self._invalidate()
         return self.notes
 
+    def _note_from_string(self, note, octave=None, dynamics=None):
+        """Return a Note for the string note, like add_note would add it.
+
+        Without an octave, the note is placed in octave 4 if the container
+        is empty, or else on or just above the highest note.
+        """
+        if dynamics is None:
+            dynamics = {}
+        if octave is not None:
+            return Note(note, octave, dynamics)
+        elif len(self.notes) == 0:
+            return Note(note, 4, dynamics)
+        elif Note(note, self.notes[-1].octave) < self.notes[-1]:
+            return Note(note, self.notes[-1].octave + 1, dynamics)
+        else:
+            return Note(note, self.notes[-1].octave, dynamics)
+
     def add_notes(self, notes):
         """Feed notes to self.add_note.
 
@@ -224,19 +307,29 @@ class NoteContainer(object):
         note's name. If no specific octave is given, the note gets removed
         in every octave.
         """
-        res = []
-        for x in self.notes:
-            if isinstance(note, six.string_types):
-                if x.name != note:
-                    res.append(x)
-                else:
-                    if x.octave != octave and octave != -1:
-                        res.append(x)
+        pitches = self._index()
+        if isinstance(note, six.string_types):
+            keep = [x.name != note or (x.octave != octave and octave != -1) for x in self.notes]
+        elif note is None:
+            keep = [True] * len(self.notes)
+        else:
+            pitch = int(note)
+            if not self._has_pitch(pitch):
+                keep = [True] * len(self.notes)
             else:
-                if x != note:
-                    res.append(x)
-        self.notes = res
-        return res
+                keep = [p != pitch for p in pitches]
+        self._set_notes(
+            [x for (x, k) in zip(self.notes, keep) if k],
+            tuple([p for (p, k) in zip(pitches, keep) if k]),
+        )
+        return self.notes
+
+    def _set_notes(self, notes, pitches):
+        """Replace the notes by a subsequence of them, with their integer
+        values."""
+        self.notes = notes
+        self._pitches = pitches
+        self._indexed = notes
 
     def remove_notes(self, notes):
         """Remove notes from the containers.
@@ -255,26 +348,34 @@ class NoteContainer(object):
 
     def remove_duplicate_notes(self):
         """Remove duplicate and enharmonic notes from the container."""
-        res = []
-        for x in self.notes:
-            if x not in res:
-                res.append(x)
-        self.notes = res
-        return res
+        pitches = self._index()
+        seen = set()
+        keep = []
+        for p in pitches:
+            keep.append(p not in seen)
+            seen.add(p)
+        self._set_notes(
+            [x for (x, k) in zip(self.notes, keep) if k],
+            tuple([p for (p, k) in zip(pitches, keep) if k]),
+        )
+        return self.notes
 
     def sort(self):
         """Sort the notes in the container from low to high."""
         self.notes.sort()
+        self._invalidate()
 
     def augment(self):
         """Augment all the notes in the NoteContainer."""
         for n in self.notes:
             n.augment()
+        self._invalidate()
 
     def diminish(self):
         """Diminish all the notes in the NoteContainer."""
         for n in self.notes:
             n.diminish()
+        self._invalidate()
 
     def determine(self, shorthand=False):
         """Determine the type of chord or interval currently in the
@@ -286,6 +387,7 @@ class NoteContainer(object):
         interval."""
         for n in self.notes:
             n.transpose(interval, up)
+        self._invalidate()
         return self
 
     def get_note_names(self):
@@ -299,6 +401,12 @@ class NoteContainer(object):
                 res.append(n.name)
         return res
 
+    def __getstate__(self):
+        return _slots_state(self)
+
+    def __setstate__(self, state):
+        _set_slots_state(self, state)
+
     def __repr__(self):
         """Return a nice and clean string representing the note container."""
         return str(self.notes)
@@ -329,6 +437,7 @@ class NoteContainer(object):
             self.notes[item] = n
         else:
             self.notes[item] = value
+        self._invalidate()
         return self.notes
 
     def __add__(self, notes):
@@ -358,7 +467,13 @@ class NoteContainer(object):
         return len(self.notes)
 
     def __contains__(self, item):
-        return item in self.notes
+        if item is None:
+            return False
+        try:
+            pitch = int(item)
+        except (TypeError, ValueError):
+            return item in self.notes
+        return self._has_pitch(pitch)
 
     def __eq__(self, other):
         """Enable the '==' operator for NoteContainer instances."""
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, note_table module.
+#    Copyright (C) 2008-2009, Bart Spaans
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A compact, column oriented store for the notes in Tracks and
+Compositions."""
+
+from __future__ import absolute_import
+
+from array import array
+from bisect import bisect_left
+
+from mingus.containers.bar import Bar, BarEntry
+from mingus.containers.composition import Composition
+from mingus.containers.note import Note
+from mingus.containers.note_container import NoteContainer
+from mingus.containers.track import Track
+from mingus.core import notes as _notes
+from six.moves import range
+
+# The name ids of rests: an empty NoteContainer and None
+REST = -1
+NONE_REST = -2
+
+_composition_info = ("title", "subtitle", "author", "email", "description")
+
+
+def _unset(value):
+    """Return the velocity or channel value for the table: -1 if it is not
+    set."""
+    return -1 if value is None else value
+
+
+def _is_pitch(name):
+    """Return True if name is a spelled note name, like 'C#'."""
+    return bool(name) and _notes.is_valid_note(name)
+
+
+def _note_extras(note):
+    """Return the class of note and the attributes the columns don't hold,
+    or None if note is a plain Note with a pitch name."""
+    attrs = dict(getattr(note, "__dict__", ()))
+    for attr in ("string", "fret"):
+        if hasattr(note, attr):
+            attrs[attr] = getattr(note, attr)
+    if not _is_pitch(note.name):
+        attrs["octave"] = note.octave
+    elif type(note) is Note and not attrs:
+        return None
+    return (type(note), attrs)
+
+
+class NoteTable(object):
+
+    """A table with a row for every note in a number of Tracks.
+
+    The notes are kept in parallel columns (array.array objects) instead of
+    as Note, NoteContainer and Bar objects, which takes a lot less memory
+    and makes it cheap to work on all the notes of a piece at once:
+
+     * track: the number of the track
+     * bar: the number of the bar, counting the bars of all the tracks
+     * entry: the number of the bar entry, counting the entries of all the
+       bars
+     * onset: the position in whole notes from the start of the track
+     * beat: the position in whole notes from the start of the bar
+     * duration: the note value, as used in Bars (4 is a quarter note)
+     * pitch: the MIDI note number (int(note) + 12)
+     * velocity and channel: as set on the Note, or -1 if the Note uses
+       the default
+     * name: the index of the spelled note name in names
+
+    Rests get a row too, with the name REST (an empty NoteContainer) or
+    NONE_REST (None) and a pitch, velocity and channel of 0.
+
+    The float columns are for computing; the beats and durations of the
+    entries are also kept as they were given (as integers or Fractions, for
+    instance) in entry_beats and entry_durations. Notes that aren't plain
+    Notes, like PercussionNotes and Notes with a string and fret, keep
+    their class and other attributes in extras, by row. PercussionNotes
+    have the name of their instrument and are left alone by transpose.
+
+    The columns support the buffer protocol, so numpy.frombuffer can be
+    used to work on them as NumPy arrays without copying.
+
+    Example:
+    >>> t = Track()
+    >>> t.add_notes(['C', 'E'], 4)
+    True
+    >>> t.add_notes('G', 2)
+    True
+    >>> table = NoteTable.from_track(t)
+    >>> list(table.pitch)
+    [60, 64, 67]
+    >>> table.transpose('3')
+    >>> table.to_track().bars[0]
+    [[0.0, 4, ['E-4', 'G#-4']], [0.25, 2, ['B-4']]]
+    """
+
+    def __init__(self):
+        self.track = array("H")
+        self.bar = array("i")
+        self.entry = array("i")
+        self.onset = array("d")
+        self.beat = array("d")
+        self.duration = array("d")
+        self.pitch = array("h")
+        self.velocity = array("h")
+        self.channel = array("h")
+        self.name = array("h")
+        self.names = []
+        self._name_ids = {}
+        self.extras = {}
+
+        # Per entry
+        self.entry_beats = []
+        self.entry_durations = []
+
+        # Per bar
+        self.bar_starts = array("d")
+        self.bar_keys = []
+        self.bar_meters = []
+        self.bar_current_beats = []
+        self.bar_exact = []
+
+        # Per track: the first row, the first bar and the Track attributes
+        self.track_rows = array("i")
+        self.track_bars = array("i")
+        self.track_names = []
+        self.instruments = []
+        self.tunings = []
+        self.track_exact = []
+
+        self.info = {}
+
+    @classmethod
+    def from_track(cls, track):
+        """Return a NoteTable with the notes in track."""
+        return cls().add_track(track)
+
+    @classmethod
+    def from_composition(cls, composition):
+        """Return a NoteTable with the notes in all the tracks of
+        composition."""
+        table = cls()
+        for t in composition.tracks:
+            table.add_track(t)
+        for attr in _composition_info:
+            table.info[attr] = getattr(composition, attr)
+        return table
+
+    def name_id(self, name):
+        """Return the index of the note name in names, adding it if
+        necessary."""
+        try:
+            return self._name_ids[name]
+        except KeyError:
+            self._name_ids[name] = len(self.names)
+            self.names.append(name)
+            return self._name_ids[name]
+
+    def add_track(self, track):
+        """Add the notes in track to the table."""
+        n = len(self.track_rows)
+        self.track_rows.append(len(self.name))
+        self.track_bars.append(len(self.bar_keys))
+        self.track_names.append(track.name)
+        self.instruments.append(track.instrument)
+        self.tunings.append(track.tuning)
+        self.track_exact.append(track.exact)
+        start = 0.0
+        for b in track.bars:
+            bar_nr = len(self.bar_keys)
+            self.bar_starts.append(start)
+            self.bar_keys.append(getattr(b.key, "key", b.key))
+            self.bar_meters.append(b.meter)
+            self.bar_current_beats.append(b.current_beat)
+            self.bar_exact.append(b.exact)
+            for (beat, duration, container) in b.bar:
+                row = (n, bar_nr, len(self.entry_beats), start + beat, beat, duration)
+                self.entry_beats.append(beat)
+                self.entry_durations.append(duration)
+                if container is None or len(container) == 0:
+                    self._add_row(row, 0, 0, 0, NONE_REST if container is None else REST)
+                    continue
+                for note in container:
+                    extras = _note_extras(note)
+                    if extras is not None:
+                        self.extras[len(self.name)] = extras
+                    self._add_row(
+                        row,
+                        int(note) + 12,
+                        _unset(note._velocity),
+                        _unset(note._channel),
+                        self.name_id(note.name),
+                    )
+            start += b.length
+        return self
+
+    def _add_row(self, row, pitch, velocity, channel, name):
+        (track, bar, entry, onset, beat, duration) = row
+        self.track.append(track)
+        self.bar.append(bar)
+        self.entry.append(entry)
+        self.onset.append(onset)
+        self.beat.append(beat)
+        self.duration.append(duration)
+        self.pitch.append(pitch)
+        self.velocity.append(velocity)
+        self.channel.append(channel)
+        self.name.append(name)
+
+    def _rows(self, track):
+        """Return the first and last + 1 row of track."""
+        end = self.track_rows[track + 1] if track + 1 < len(self.track_rows) else len(self.name)
+        return (self.track_rows[track], end)
+
+    def _bars(self, track):
+        """Return the first and last + 1 bar of track."""
+        end = self.track_bars[track + 1] if track + 1 < len(self.track_bars) else len(self.bar_keys)
+        return (self.track_bars[track], end)
+
+    def to_track(self, track=0):
+        """Return the notes of the track with the given number as a Track."""
+        t = Track(self.instruments[track], self.track_exact[track])
+        t.name = self.track_names[track]
+        t.tuning = self.tunings[track]
+        (bar_start, bar_end) = self._bars(track)
+        bars = []
+        for i in range(bar_start, bar_end):
+            b = Bar(self.bar_keys[i], self.bar_meters[i], self.bar_exact[i])
+            b.current_beat = self.bar_current_beats[i]
+            bars.append(b)
+        (start, end) = self._rows(track)
+        entry = None
+        for row in range(start, end):
+            if entry != self.entry[row]:
+                entry = self.entry[row]
+                container = None if self.name[row] == NONE_REST else NoteContainer()
+                bars[self.bar[row] - bar_start].bar.append(
+                    BarEntry(self.entry_beats[entry], self.entry_durations[entry], container)
+                )
+            if self.name[row] >= 0:
+                container.notes.append(self._note(row))
+        t.bars = bars
+        return t
+
+    def _note(self, row):
+        """Return the Note in row."""
+        name = self.names[self.name[row]]
+        extras = self.extras.get(row)
+        cls = Note if extras is None else extras[0]
+        n = cls.__new__(cls)
+        n._init_slots()
+        if extras is not None:
+            for (attr, value) in extras[1].items():
+                setattr(n, attr, value)
+        n.name = name
+        if _is_pitch(name):
+            semitones = _notes.to_pitch(name).semitones
+            n.octave = (self.pitch[row] - 12 - semitones) // 12
+        velocity = self.velocity[row]
+        channel = self.channel[row]
+        n.velocity = None if velocity < 0 else velocity
+        n.channel = None if channel < 0 else channel
+        return n
+
+    def to_composition(self):
+        """Return all the tracks as a Composition."""
+        c = Composition()
+        for i in range(len(self.track_rows)):
+            c.add_track(self.to_track(i))
+        for (attr, value) in self.info.items():
+            setattr(c, attr, value)
+        return c
+
+    def transpose(self, interval, up=True):
+        """Transpose all the notes up or down the interval, like
+        Note.transpose does. Notes without a pitch name, like
+        PercussionNotes, are left alone."""
+        new_names = []
+        deltas = []
+        for (i, name) in enumerate(list(self.names)):
+            if not _is_pitch(name):
+                new_names.append(i)
+                deltas.append(0)
+                continue
+            n = Note(name, 4)
+            n.transpose(interval, up)
+            new_names.append(self.name_id(n.name))
+            deltas.append(int(n) - int(Note(name, 4)))
+        self.pitch = array(
+            "h", [p + deltas[n] if n >= 0 else p for (p, n) in zip(self.pitch, self.name)]
+        )
+        self.name = array("h", [new_names[n] if n >= 0 else n for n in self.name])
+
+    def select(self, start=0.0, end=None, track=None):
+        """Return the numbers of the rows with an onset between start
+        (inclusive) and end (exclusive), for one or all tracks."""
+        result = []
+        tracks = range(len(self.track_rows)) if track is None else [track]
+        for t in tracks:
+            (lo, hi) = self._rows(t)
+            first = bisect_left(self.onset, start, lo, hi)
+            last = hi if end is None else bisect_left(self.onset, end, first, hi)
+            result.extend(range(first, last))
+        return result
+
+    def __len__(self):
+        return len(self.name)
@@ -33,6 +33,7 @@ class PercussionNote(Note):
         Set duration in milliseconds if you want to stop the instrument before it stops itself.
         For example, a player might manual stop a triangle after 1 second.
         """    
+        self._init_slots()
         if isinstance(instr, six.string_types):
             instr = MidiPercuInstr[instr]
         elif isinstance(instr, int):
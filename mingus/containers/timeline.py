@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, timeline module.
+#    Copyright (C) 2008-2009, Bart Spaans
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""An index of when the notes in Tracks and Compositions sound.
+
+A Timeline answers questions like "which notes sound at this moment" and
+"which bar is playing at this moment" in logarithmic time, instead of
+walking through the bars from the start.
+
+Times are measured in whole notes from the start of the piece, like the
+onsets in a NoteTable. Use seconds_to_time to convert a time in seconds.
+"""
+
+from __future__ import absolute_import
+
+from array import array
+from bisect import bisect_right
+
+from mingus.containers.composition import Composition
+from mingus.containers.track import Track
+from six.moves import range
+
+# Subtrees with up to 2 ** (_SCAN_LEVEL + 1) - 1 rows are searched linearly
+_SCAN_LEVEL = 3
+
+
+def seconds_to_time(seconds, bpm=120):
+    """Return the time in whole notes after the given number of seconds, at
+    bpm quarter notes per minute.
+
+    Example:
+    >>> seconds_to_time(3, 120)
+    1.5
+    """
+    return seconds * bpm / 240.0
+
+
+class Timeline(object):
+
+    """An index of the notes in a Track or Composition by time.
+
+    Every entry with notes (rests are left out) gets a row, sorted by
+    onset. The rows are kept in parallel columns:
+
+     * onset and offset: the time the entry starts and stops sounding
+     * track: the number of the track
+     * bar: the number of the bar in its track
+     * entry: the number of the entry in its bar
+     * notes: the NoteContainer of the entry
+
+    On top of the rows sits an interval tree, laid out in the same order
+    as the rows, which stores the latest offset in every subtree. This
+    makes finding the rows that sound at a time or during a range of time
+    take O(log n + k) for k results.
+
+    The bar starts of every track are kept as prefix sums in bar_starts, to
+    find the bar at a time with a binary search.
+
+    A Timeline is a snapshot: build a new one after changing the music.
+
+    Example:
+    >>> t = Track()
+    >>> t.add_notes('C', 2)
+    True
+    >>> t.add_notes(['E', 'G'], 4)
+    True
+    >>> t.add_notes('B', 4)
+    True
+    >>> tl = Timeline(t)
+    >>> tl.notes_at(0.6)
+    ['E-4', 'G-4']
+    >>> tl.position(0.6)
+    (0, 0.6)
+    >>> tl.between(0.4, 0.8)
+    [0, 1, 2]
+    """
+
+    def __init__(self, music):
+        """Index music, which can be a Track or a Composition."""
+        tracks = music.tracks if isinstance(music, Composition) else [music]
+        self.onset = array("d")
+        self.offset = array("d")
+        self.track = array("H")
+        self.bar = array("i")
+        self.entry = array("i")
+        self.notes = []
+        self.bar_starts = []
+        rows = []
+        for (t, track) in enumerate(tracks):
+            starts = [0.0]
+            start = 0
+            for (b, bar) in enumerate(track.bars):
+                for (i, (beat, duration, notes)) in enumerate(bar.bar):
+                    if notes is None or len(notes) == 0:
+                        continue
+                    onset = start + beat
+                    offset = onset + bar._length(duration)
+                    rows.append((float(onset), float(offset), t, b, i, notes))
+                start += bar.length
+                starts.append(float(start))
+            self.bar_starts.append(starts)
+        rows.sort(key=lambda r: (r[0], r[2], r[3], r[4]))
+        for (onset, offset, t, b, i, notes) in rows:
+            self.onset.append(onset)
+            self.offset.append(offset)
+            self.track.append(t)
+            self.bar.append(b)
+            self.entry.append(i)
+            self.notes.append(notes)
+        self._index()
+
+    def _index(self):
+        """Build the implicit interval tree over the rows.
+
+        The rows at even indices are the leaves. A row with k trailing one
+        bits is a node on level k, with its children k - 1 levels down at
+        row - 2 ** (k - 1) and row + 2 ** (k - 1). max_offset holds the
+        latest offset in the subtree of every row. Nodes past the end of the
+        rows don't exist, but still get searched through their left
+        subtree.
+        """
+        n = len(self.onset)
+        self.max_offset = array("d", self.offset)
+        self._root_level = -1
+        if n == 0:
+            return
+        max_offset = self.max_offset
+        last_i = (n - 1) & ~1
+        last = max_offset[last_i]
+        k = 1
+        while 1 << k <= n:
+            x = 1 << (k - 1)
+            for i in range((x << 1) - 1, n, x << 2):
+                right = max_offset[i + x] if i + x < n else last
+                max_offset[i] = max(max_offset[i], max_offset[i - x], right)
+            last_i = last_i - x if (last_i >> k) & 1 else last_i + x
+            if last_i < n and max_offset[last_i] > last:
+                last = max_offset[last_i]
+            k += 1
+        self._root_level = k - 1
+
+    def _overlap(self, start, end, closed):
+        """Return the rows that sound after start and begin before end (or
+        at end if closed is True), in order."""
+        n = len(self.onset)
+        if n == 0:
+            return []
+        (onset, offset, max_offset) = (self.onset, self.offset, self.max_offset)
+        result = []
+        k = self._root_level
+        stack = [(k, (1 << k) - 1, False)]
+        while stack:
+            (k, x, left_done) = stack.pop()
+            if k <= _SCAN_LEVEL:
+                i = x >> k << k
+                last = min(i + (1 << (k + 1)) - 1, n)
+                while i < last and (onset[i] < end or closed and onset[i] == end):
+                    if start < offset[i]:
+                        result.append(i)
+                    i += 1
+            elif not left_done:
+                stack.append((k, x, True))
+                y = x - (1 << (k - 1))
+                if y >= n or max_offset[y] > start:
+                    stack.append((k - 1, y, False))
+            elif x < n and (onset[x] < end or closed and onset[x] == end):
+                if start < offset[x]:
+                    result.append(x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+        return result
+
+    def at(self, time):
+        """Return the rows that sound at time: the ones that start at or
+        before time and stop after it."""
+        return self._overlap(time, time, True)
+
+    def between(self, start, end):
+        """Return the rows that sound somewhere between start (inclusive)
+        and end (exclusive)."""
+        return self._overlap(start, end, False)
+
+    def notes_at(self, time):
+        """Return the Notes that sound at time, from low to high."""
+        result = []
+        for row in self.at(time):
+            result.extend(self.notes[row])
+        result.sort()
+        return result
+
+    def position(self, time, track=0):
+        """Return the number of the bar in track that plays at time and the
+        time since the start of that bar.
+
+        Times after the end of the track are placed in its last bar; times
+        before the start in the first.
+        """
+        starts = self.bar_starts[track]
+        b = bisect_right(starts, time, 0, max(len(starts) - 1, 1)) - 1
+        b = max(b, 0)
+        return (b, time - starts[b])
+
+    def __len__(self):
+        return len(self.onset)
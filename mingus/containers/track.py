@@ -20,8 +20,9 @@ from __future__ import absolute_import
 
 from mingus.containers.mt_exceptions import InstrumentRangeError, UnexpectedObjectError
 from mingus.containers.note_container import NoteContainer
-from mingus.containers.bar import Bar
+from mingus.containers.bar import Bar, _event_notes
 from mingus.containers.instrument import Instrument
+from mingus.containers.note import _set_slots_state, _slots_state
 import mingus.core.value as value
 import six
 from six.moves import range
@@ -37,16 +38,19 @@ class Track(object):
     optional.
 
     Tracks can be stored together in Compositions.
+
+    If exact is True, the Bars that add_notes creates keep their positions
+    as Fractions (see Bar).
     """
 
-    bars = []
-    instrument = None
-    name = "Untitled"  # Will be looked for when saving a MIDI file.
-    tuning = None  # Used by tablature
+    __slots__ = ("bars", "instrument", "name", "tuning", "exact")
 
-    def __init__(self, instrument=None):
+    def __init__(self, instrument=None, exact=False):
         self.bars = []
         self.instrument = instrument
+        self.name = "Untitled"  # Will be looked for when saving a MIDI file.
+        self.tuning = None  # Used by tablature
+        self.exact = exact
 
     def add_bar(self, bar):
         """Add a Bar to the current track."""
@@ -76,14 +80,70 @@ class Track(object):
         # Check whether the last bar is full, if so create a new bar and add the
         # note there
         if len(self.bars) == 0:
-            self.bars.append(Bar())
+            self.bars.append(Bar(exact=self.exact))
         last_bar = self.bars[-1]
         if last_bar.is_full():
-            self.bars.append(Bar(last_bar.key, last_bar.meter))
+            self.bars.append(Bar(last_bar.key, last_bar.meter, last_bar.exact))
             # warning should hold note if it doesn't fit
 
         return self.bars[-1].place_notes(note, duration)
 
+    def extend(self, events, validate=True):
+        """Add a number of events to the Track, filling and adding Bars
+        like add_notes does.
+
+        The events are (pitch, duration[, velocity, channel]) tuples. The
+        pitch can be None for a rest, an integer (see Note.from_int), a note
+        string (octave 4 if none is given), a Note, a NoteContainer, or a
+        list or tuple of integers, note strings and Notes for a chord.
+
+        Return True if all the events were added. If an event doesn't fit in
+        a Bar that isn't full, it and the events after it are not added and
+        False is returned.
+
+        An InstrumentRangeError exception will be raised if an Instrument is
+        attached to the Track, but a note turns out not to be within its
+        range; the events before it will have been added. If validate is
+        False the range, velocities and channels are not checked, which is
+        faster for trusted input.
+
+        Example:
+        >>> t = Track()
+        >>> t.extend([(48, 2), (['E', 'G'], 4, 90), (None, 4), ('C-5', 1)])
+        True
+        >>> t
+        [None, [[[0.0, 2, ['C-4']], [0.5, 4, ['E-4', 'G-4']], [0.75, 4, None]], [[0.0, 1, ['C-5']]]]]
+        """
+        instrument = self.instrument if validate else None
+        if isinstance(instrument, Instrument):
+            (low, high) = (int(instrument.range[0]), int(instrument.range[1]))
+            # Instruments with their own rules are asked about every chord
+            custom = type(instrument).can_play_notes is not Instrument.can_play_notes
+        else:
+            instrument = None
+        bar = self.bars[-1] if self.bars else None
+        for event in events:
+            (notes, duration) = _event_notes(event, validate)
+            if notes and instrument is not None:
+                for n in notes:
+                    if not low <= int(n) <= high:
+                        raise InstrumentRangeError(
+                            "Note '%s' is not in range of the instrument (%s)" % (n, instrument)
+                        )
+                if custom and not instrument.can_play_notes(notes):
+                    raise InstrumentRangeError(
+                        "Note '%s' is not in range of the instrument (%s)" % (notes, instrument)
+                    )
+            if bar is None:
+                bar = Bar(exact=self.exact)
+                self.bars.append(bar)
+            elif bar.is_full():
+                bar = Bar(bar.key, bar.meter, bar.exact)
+                self.bars.append(bar)
+            if not bar._place(notes, duration):
+                return False
+        return True
+
     def get_notes(self):
         """Return an iterator that iterates through every bar in the this
         track."""
@@ -228,6 +288,12 @@ class Track(object):
             )
         self.bars[index] = value
 
+    def __getstate__(self):
+        return _slots_state(self)
+
+    def __setstate__(self, state):
+        _set_slots_state(self, state)
+
     def __repr__(self):
         """Return a string representing the class."""
         return str([self.instrument, self.bars])
@@ -26,4 +26,5 @@ __all__ = [
     "progressions",
     "mt_exceptions",
     "value",
+    "cache",
 ]
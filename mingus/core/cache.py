@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, cache module.
+#    Copyright (C) 2008-2009, Bart Spaans
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Bounded caches for the functions in mingus.core.
+
+Functions like chords.from_shorthand, intervals.from_shorthand and
+progressions.to_chords are usually called over and over with the same few
+hundred arguments. Their results are kept in least recently used caches,
+which are registered here by name so they can be inspected, resized and
+cleared.
+
+Example:
+>>> from mingus.core import chords, cache
+>>> cache.clear()
+>>> chords.from_shorthand('Am7')
+['A', 'C', 'E', 'G']
+>>> chords.from_shorthand('Am7')
+['A', 'C', 'E', 'G']
+>>> cache.info('chords.from_shorthand')
+CacheInfo(hits=1, misses=1, evictions=0, maxsize=1024, currsize=1)
+"""
+
+from __future__ import absolute_import
+
+from collections import OrderedDict, namedtuple
+
+DEFAULT_MAXSIZE = 1024
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+# All the caches, by name
+caches = {}
+
+
+class LRUCache(object):
+
+    """A mapping that holds at most maxsize items and evicts the least
+    recently used one when it is full.
+
+    A maxsize of None makes the cache unbounded, a maxsize of 0 disables it.
+    Callers should only store immutable values, or copy them on the way in
+    and out, so the cached values can't be changed by accident.
+    """
+
+    def __init__(self, name, maxsize=DEFAULT_MAXSIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        caches[name] = self
+
+    def get(self, key, default=None):
+        """Return the value for key and mark it as recently used, or return
+        default if key is not in the cache."""
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used values
+        if the cache is full."""
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._evict()
+
+    def resize(self, maxsize):
+        """Set the maximum number of items, evicting items if necessary."""
+        self.maxsize = maxsize
+        if maxsize == 0:
+            self.evictions += len(self._data)
+            self._data.clear()
+        self._evict()
+
+    def clear(self):
+        """Remove all the items and reset the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self):
+        """Return the hits, misses, evictions, maxsize and current size."""
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def _evict(self):
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def info(name=None):
+    """Return the CacheInfo of the cache called name, or a dictionary with
+    the CacheInfo of every cache if no name is given."""
+    if name is not None:
+        return caches[name].info()
+    return dict((n, c.info()) for n, c in caches.items())
+
+
+def clear(name=None):
+    """Clear the cache called name, or all the caches."""
+    for c in [caches[name]] if name is not None else caches.values():
+        c.clear()
+
+
+def set_maxsize(maxsize, name=None):
+    """Set the maximum size of the cache called name, or of all the caches.
+
+    Use None for an unbounded cache and 0 to disable caching.
+    """
+    for c in [caches[name]] if name is not None else caches.values():
+        c.resize(maxsize)
@@ -93,12 +93,15 @@ Useful Functions
  * determine - Can recognize all the chords that can be generated with \
 from_shorthand (a lot) and their inversions.
  * from_shorthand - Generates chords from shorthand (eg. 'Cmin7')
+ * from_formula - Generates chords from intervals (eg. ('1', 'b3', '5'))
+ * register_chord - Adds a chord type to from_shorthand and determine
 """
 from __future__ import absolute_import
 
 from mingus.core import intervals
 from mingus.core import notes
 from mingus.core import keys
+from mingus.core import cache
 from mingus.core.mt_exceptions import NoteFormatError, FormatError
 import six
 from six.moves import range
@@ -108,6 +111,9 @@ _triads_cache = {}
 # A cache for composed sevenths
 _sevenths_cache = {}
 
+# A cache for from_shorthand
+_shorthand_cache = cache.LRUCache("chords.from_shorthand")
+
 chord_shorthand_meaning = {  # Triads Augmented chords Suspended chords Sevenths
     # Sixths Ninths Elevenths Thirteenths Altered
     # Chords Special
@@ -164,6 +170,207 @@ chord_shorthand_meaning = {  # Triads Augmented chords Suspended chords Sevenths
     "5": " perfect fifth",
 }
 
+# The intervals above the root of every chord in chord_shorthand, in the
+# order in which the notes are returned. A step is a degree (1-13) preceded
+# by any number of accidentals, like the shorthands in
+# intervals.from_shorthand.
+chord_formulas = {
+    "m": ("1", "b3", "5"),
+    "M": ("1", "3", "5"),
+    "": ("1", "3", "5"),
+    "dim": ("1", "b3", "b5"),
+    "aug": ("1", "3", "#5"),
+    "+": ("1", "3", "#5"),
+    "7#5": ("1", "3", "#5", "b7"),
+    "M7+5": ("1", "3", "#5", "b7"),
+    "M7+": ("1", "3", "#5", "7"),
+    "m7+": ("1", "3", "#5", "b7"),
+    "7+": ("1", "3", "#5", "7"),
+    "sus47": ("1", "4", "5", "b7"),
+    "sus4": ("1", "4", "5"),
+    "sus2": ("1", "2", "5"),
+    "sus": ("1", "4", "5"),
+    "11": ("1", "5", "b7", "11"),
+    "sus4b9": ("1", "4", "5", "b9"),
+    "susb9": ("1", "4", "5", "b9"),
+    "m7": ("1", "b3", "5", "b7"),
+    "M7": ("1", "3", "5", "7"),
+    "7": ("1", "3", "5", "b7"),
+    "dom7": ("1", "3", "5", "b7"),
+    "m7b5": ("1", "b3", "b5", "b7"),
+    "dim7": ("1", "b3", "b5", "bb7"),
+    "m/M7": ("1", "b3", "5", "7"),
+    "mM7": ("1", "b3", "5", "7"),
+    "m6": ("1", "b3", "5", "6"),
+    "M6": ("1", "3", "5", "6"),
+    "6": ("1", "3", "5", "6"),
+    "6/7": ("1", "3", "5", "6", "b7"),
+    "67": ("1", "3", "5", "6", "b7"),
+    "6/9": ("1", "3", "5", "6", "9"),
+    "69": ("1", "3", "5", "6", "9"),
+    "9": ("1", "3", "5", "b7", "9"),
+    "7b9": ("1", "3", "5", "b7", "b9"),
+    "7#9": ("1", "3", "5", "b7", "#9"),
+    "M9": ("1", "3", "5", "7", "9"),
+    "m9": ("1", "b3", "5", "b7", "9"),
+    "7#11": ("1", "3", "5", "b7", "#11"),
+    "m11": ("1", "b3", "5", "b7", "11"),
+    "M13": ("1", "3", "5", "7", "9", "13"),
+    "m13": ("1", "b3", "5", "b7", "9", "13"),
+    "13": ("1", "3", "5", "b7", "9", "13"),
+    "7b5": ("1", "3", "b5", "b7"),
+    "hendrix": ("1", "3", "5", "b7", "b3"),
+    "7b12": ("1", "3", "5", "b7", "b3"),
+    "5": ("1", "5"),
+}
+
+# The meanings that were there before any chords were registered
+_builtin_meanings = dict(chord_shorthand_meaning)
+
+# The compiled formulas: a (letters, half notes, accidentals) triple for
+# every step, by formula
+_formula_steps = {}
+
+# The chords added with register_chord, by shorthand, and their spelled
+# intervals: (letter steps, semitones) of every note but the root
+_registered_chords = {}
+
+
+def _compile_formula(formula):
+    """Return the (letters, half notes, accidentals) triples of the steps in
+    formula.
+
+    Throw a FormatError exception if a step is not recognised.
+    """
+    try:
+        return _formula_steps[formula]
+    except (KeyError, TypeError):
+        pass
+    steps = []
+    for step in formula:
+        degree = step.lstrip("#b")
+        if not degree.isdigit() or int(degree) < 1 or "#" in step and "b" in step:
+            raise FormatError("Unrecognised step '%s' in chord formula %r" % (step, formula))
+        letters = (int(degree) - 1) % 7
+        half_notes = intervals._shorthand_steps[str(letters + 1)][0][1]
+        accidentals = step.count("#") - step.count("b")
+        steps.append((letters, half_notes, accidentals))
+    steps = tuple(steps)
+    if isinstance(formula, tuple):
+        _formula_steps[formula] = steps
+    return steps
+
+
+def from_formula(note, formula):
+    """Build the chord with the intervals in formula on note.
+
+    Examples:
+    >>> from_formula('C', ('1', 'b3', '5', 'b7', '9'))
+    ['C', 'Eb', 'G', 'Bb', 'D']
+    >>> from_formula('A', ('1', '3', '#5'))
+    ['A', 'C#', 'E#']
+    """
+    res = []
+    for (letters, half_notes, accidentals) in _compile_formula(formula):
+        if letters == 0:
+            n = note
+        else:
+            n = intervals._interval_from(note, letters, half_notes)
+        if accidentals != 0:
+            pitch = notes.to_pitch(n)
+            n = notes.Pitch(pitch.letter, pitch.accidentals + accidentals).name
+        res.append(n)
+    return res
+
+
+def _normalize_shorthand(shorthand_string):
+    """Shrink shorthand_string to a format recognised by chord_shorthand."""
+    shorthand_string = shorthand_string.replace("min", "m")
+    shorthand_string = shorthand_string.replace("mi", "m")
+    shorthand_string = shorthand_string.replace("-", "m")
+    shorthand_string = shorthand_string.replace("maj", "M")
+    return shorthand_string.replace("ma", "M")
+
+
+def register_chord(shorthand, formula, meaning):
+    """Add a chord type, so it can be built with from_shorthand and named by
+    determine.
+
+    The shorthand is shrunk like the shorthands in from_shorthand, so 'maj'
+    and 'M' are the same. The formula should start at the root ('1'). Throw
+    a FormatError exception if the shorthand is already used or the formula
+    is not recognised.
+
+    Example:
+    >>> register_chord('7#5#9', ('1', '3', '#5', 'b7', '#9'), 'altered dominant')
+    >>> from_shorthand('C7#5#9')
+    ['C', 'E', 'G#', 'Bb', 'D#']
+    >>> 'C altered dominant' in determine(['C', 'E', 'G#', 'Bb', 'D#'])
+    True
+    >>> unregister_chord('7#5#9')
+    """
+    shorthand = _normalize_shorthand(shorthand)
+    formula = tuple(formula)
+    if shorthand in chord_shorthand:
+        raise FormatError("The chord shorthand '%s' is already used" % shorthand)
+    steps = _compile_formula(formula)
+    if not steps or steps[0] != (0, 0, 0):
+        raise FormatError("A chord formula should start with '1', not %r" % (formula,))
+    chord_formulas[shorthand] = formula
+    chord_shorthand[shorthand] = lambda note: from_formula(note, formula)
+    chord_shorthand_meaning[shorthand] = " " + meaning
+    _registered_chords[shorthand] = tuple(
+        (letters, half_notes + accidentals) for (letters, half_notes, accidentals) in steps[1:]
+    )
+    _clear_caches()
+
+
+def unregister_chord(shorthand):
+    """Remove a chord type that was added with register_chord."""
+    shorthand = _normalize_shorthand(shorthand)
+    if shorthand not in _registered_chords:
+        raise FormatError("The chord shorthand '%s' is not registered" % shorthand)
+    for d in (_registered_chords, chord_formulas, chord_shorthand):
+        del d[shorthand]
+    if shorthand in _builtin_meanings:
+        chord_shorthand_meaning[shorthand] = _builtin_meanings[shorthand]
+    else:
+        del chord_shorthand_meaning[shorthand]
+    _clear_caches()
+
+
+def _clear_caches():
+    """Forget the results that depend on the registered chords."""
+    _shorthand_cache.clear()
+    _determine_index.clear()
+    if "progressions.to_chords" in cache.caches:
+        cache.clear("progressions.to_chords")
+
+
+def _determine_registered(chord, shorthand=False, no_inversions=False):
+    """Name chord with the chords added with register_chord."""
+    result = []
+    for tries in range(1, 5 if not no_inversions else 2):
+        if tries > len(chord):
+            break
+        inversion = chord[len(chord) - tries + 1 :] + chord[: len(chord) - tries + 1]
+        root = notes.to_pitch(inversion[0])
+        spelled = []
+        for n in inversion[1:]:
+            pitch = notes.to_pitch(n)
+            spelled.append(
+                ((pitch.letter - root.letter) % 7, (pitch.semitones - root.semitones) % 12)
+            )
+        for (short, steps) in _registered_chords.items():
+            if len(steps) == len(spelled) and all(
+                l == sl and h % 12 == sh for ((l, h), (sl, sh)) in zip(steps, spelled)
+            ):
+                if shorthand:
+                    result.append(inversion[0] + short)
+                else:
+                    result.append(inversion[0] + chord_shorthand_meaning[short] + int_desc(tries))
+    return result
+
 
 def triad(note, key):
     """Return the triad on note in key as a list.
@@ -196,7 +403,7 @@ def major_triad(note):
     >>> major_triad('C')
     ['C', 'E', 'G']
     """
-    return [note, intervals.major_third(note), intervals.perfect_fifth(note)]
+    return from_formula(note, chord_formulas["M"])
 
 
 def minor_triad(note):
@@ -206,7 +413,7 @@ def minor_triad(note):
     >>> minor_triad('C')
     ['C', 'Eb', 'G']
     """
-    return [note, intervals.minor_third(note), intervals.perfect_fifth(note)]
+    return from_formula(note, chord_formulas["m"])
 
 
 def diminished_triad(note):
@@ -216,7 +423,7 @@ def diminished_triad(note):
     >>> diminished_triad('C')
     ['C', 'Eb', 'Gb']
     """
-    return [note, intervals.minor_third(note), intervals.minor_fifth(note)]
+    return from_formula(note, chord_formulas["dim"])
 
 
 def augmented_triad(note):
@@ -226,11 +433,7 @@ def augmented_triad(note):
     >>> augmented_triad('C')
     ['C', 'E', 'G#']
     """
-    return [
-        note,
-        intervals.major_third(note),
-        notes.augment(intervals.major_fifth(note)),
-    ]
+    return from_formula(note, chord_formulas["aug"])
 
 
 def seventh(note, key):
@@ -259,7 +462,7 @@ def major_seventh(note):
     >>> major_seventh('C')
     ['C', 'E', 'G', 'B']
     """
-    return major_triad(note) + [intervals.major_seventh(note)]
+    return from_formula(note, chord_formulas["M7"])
 
 
 def minor_seventh(note):
@@ -269,7 +472,7 @@ def minor_seventh(note):
     >>> minor_seventh('C')
     ['C', 'Eb', 'G', 'Bb']
     """
-    return minor_triad(note) + [intervals.minor_seventh(note)]
+    return from_formula(note, chord_formulas["m7"])
 
 
 def dominant_seventh(note):
@@ -279,7 +482,7 @@ def dominant_seventh(note):
     >>> dominant_seventh('C')
     ['C', 'E', 'G', 'Bb']
     """
-    return major_triad(note) + [intervals.minor_seventh(note)]
+    return from_formula(note, chord_formulas["7"])
 
 
 def half_diminished_seventh(note):
@@ -290,7 +493,7 @@ def half_diminished_seventh(note):
     >>> half_diminished_seventh('C')
     ['C', 'Eb', 'Gb', 'Bb']
     """
-    return diminished_triad(note) + [intervals.minor_seventh(note)]
+    return from_formula(note, chord_formulas["m7b5"])
 
 
 def minor_seventh_flat_five(note):
@@ -309,7 +512,7 @@ def diminished_seventh(note):
     >>> diminished_seventh('C')
     ['C', 'Eb', 'Gb', 'Bbb']
     """
-    return diminished_triad(note) + [notes.diminish(intervals.minor_seventh(note))]
+    return from_formula(note, chord_formulas["dim7"])
 
 
 def minor_major_seventh(note):
@@ -319,7 +522,7 @@ def minor_major_seventh(note):
     >>> minor_major_seventh('C')
     ['C', 'Eb', 'G', 'B']
     """
-    return minor_triad(note) + [intervals.major_seventh(note)]
+    return from_formula(note, chord_formulas["mM7"])
 
 
 def minor_sixth(note):
@@ -329,7 +532,7 @@ def minor_sixth(note):
     >>> minor_sixth('C')
     ['C', 'Eb', 'G', 'A']
     """
-    return minor_triad(note) + [intervals.major_sixth(note)]
+    return from_formula(note, chord_formulas["m6"])
 
 
 def major_sixth(note):
@@ -339,7 +542,7 @@ def major_sixth(note):
     >>> major_sixth('C')
     ['C', 'E', 'G', 'A']
     """
-    return major_triad(note) + [intervals.major_sixth(note)]
+    return from_formula(note, chord_formulas["M6"])
 
 
 def dominant_sixth(note):
@@ -349,7 +552,7 @@ def dominant_sixth(note):
     >>> dominant_sixth('C')
     ['C', 'E', 'G', 'A', 'Bb']
     """
-    return major_sixth(note) + [intervals.minor_seventh(note)]
+    return from_formula(note, chord_formulas["67"])
 
 
 def sixth_ninth(note):
@@ -359,7 +562,7 @@ def sixth_ninth(note):
     >>> sixth_ninth('C')
     ['C', 'E', 'G', 'A', 'D']
     """
-    return major_sixth(note) + [intervals.major_second(note)]
+    return from_formula(note, chord_formulas["69"])
 
 
 def minor_ninth(note):
@@ -369,7 +572,7 @@ def minor_ninth(note):
     >>> minor_ninth('C')
     ['C', 'Eb', 'G', 'Bb', 'D']
     """
-    return minor_seventh(note) + [intervals.major_second(note)]
+    return from_formula(note, chord_formulas["m9"])
 
 
 def major_ninth(note):
@@ -379,7 +582,7 @@ def major_ninth(note):
     >>> major_ninth('C')
     ['C', 'E', 'G', 'B', 'D']
     """
-    return major_seventh(note) + [intervals.major_second(note)]
+    return from_formula(note, chord_formulas["M9"])
 
 
 def dominant_ninth(note):
@@ -389,7 +592,7 @@ def dominant_ninth(note):
     >>> dominant_ninth('C')
     ['C', 'E', 'G', 'Bb', 'D']
     """
-    return dominant_seventh(note) + [intervals.major_second(note)]
+    return from_formula(note, chord_formulas["9"])
 
 
 def dominant_flat_ninth(note):
@@ -399,9 +602,7 @@ def dominant_flat_ninth(note):
     >>> dominant_flat_ninth('C')
     ['C', 'E', 'G', 'Bb', 'Db']
     """
-    res = dominant_ninth(note)
-    res[4] = intervals.minor_second(note)
-    return res
+    return from_formula(note, chord_formulas["7b9"])
 
 
 def dominant_sharp_ninth(note):
@@ -411,9 +612,7 @@ def dominant_sharp_ninth(note):
     >>> dominant_sharp_ninth('C')
     ['C', 'E', 'G', 'Bb', 'D#']
     """
-    res = dominant_ninth(note)
-    res[4] = notes.augment(intervals.major_second(note))
-    return res
+    return from_formula(note, chord_formulas["7#9"])
 
 
 def eleventh(note):
@@ -423,12 +622,7 @@ def eleventh(note):
     >>> eleventh('C')
     ['C', 'G', 'Bb', 'F']
     """
-    return [
-        note,
-        intervals.perfect_fifth(note),
-        intervals.minor_seventh(note),
-        intervals.perfect_fourth(note),
-    ]
+    return from_formula(note, chord_formulas["11"])
 
 
 def minor_eleventh(note):
@@ -438,7 +632,7 @@ def minor_eleventh(note):
     >>> minor_eleventh('C')
     ['C', 'Eb', 'G', 'Bb', 'F']
     """
-    return minor_seventh(note) + [intervals.perfect_fourth(note)]
+    return from_formula(note, chord_formulas["m11"])
 
 
 def minor_thirteenth(note):
@@ -448,7 +642,7 @@ def minor_thirteenth(note):
     >>> minor_thirteenth('C')
     ['C', 'Eb', 'G', 'Bb', 'D', 'A']
     """
-    return minor_ninth(note) + [intervals.major_sixth(note)]
+    return from_formula(note, chord_formulas["m13"])
 
 
 def major_thirteenth(note):
@@ -458,7 +652,7 @@ def major_thirteenth(note):
     >>> major_thirteenth('C')
     ['C', 'E', 'G', 'B', 'D', 'A']
     """
-    return major_ninth(note) + [intervals.major_sixth(note)]
+    return from_formula(note, chord_formulas["M13"])
 
 
 def dominant_thirteenth(note):
@@ -468,7 +662,7 @@ def dominant_thirteenth(note):
     >>> dominant_thirteenth('C')
     ['C', 'E', 'G', 'Bb', 'D', 'A']
     """
-    return dominant_ninth(note) + [intervals.major_sixth(note)]
+    return from_formula(note, chord_formulas["13"])
 
 
 def suspended_triad(note):
@@ -483,7 +677,7 @@ def suspended_second_triad(note):
     >>> suspended_second_triad('C')
     ['C', 'D', 'G']
     """
-    return [note, intervals.major_second(note), intervals.perfect_fifth(note)]
+    return from_formula(note, chord_formulas["sus2"])
 
 
 def suspended_fourth_triad(note):
@@ -493,7 +687,7 @@ def suspended_fourth_triad(note):
     >>> suspended_fourth_triad('C')
     ['C', 'F', 'G']
     """
-    return [note, intervals.perfect_fourth(note), intervals.perfect_fifth(note)]
+    return from_formula(note, chord_formulas["sus4"])
 
 
 def suspended_seventh(note):
@@ -503,7 +697,7 @@ def suspended_seventh(note):
     >>> suspended_seventh('C')
     ['C', 'F', 'G', 'Bb']
     """
-    return suspended_fourth_triad(note) + [intervals.minor_seventh(note)]
+    return from_formula(note, chord_formulas["sus47"])
 
 
 def suspended_fourth_ninth(note):
@@ -513,7 +707,7 @@ def suspended_fourth_ninth(note):
     >>> suspended_fourth_ninth('C')
     ['C', 'F', 'G', 'Db']
     """
-    return suspended_fourth_triad(note) + [intervals.minor_second(note)]
+    return from_formula(note, chord_formulas["sus4b9"])
 
 
 def augmented_major_seventh(note):
@@ -523,7 +717,7 @@ def augmented_major_seventh(note):
     >>> augmented_major_seventh('C')
     ['C', 'E', 'G#', 'B']
     """
-    return augmented_triad(note) + [intervals.major_seventh(note)]
+    return from_formula(note, chord_formulas["M7+"])
 
 
 def augmented_minor_seventh(note):
@@ -533,7 +727,7 @@ def augmented_minor_seventh(note):
     >>> augmented_minor_seventh('C')
     ['C', 'E', 'G#', 'Bb']
     """
-    return augmented_triad(note) + [intervals.minor_seventh(note)]
+    return from_formula(note, chord_formulas["7#5"])
 
 
 def dominant_flat_five(note):
@@ -543,9 +737,7 @@ def dominant_flat_five(note):
     >>> dominant_flat_five('C')
     ['C', 'E', 'Gb', 'Bb']
     """
-    res = dominant_seventh(note)
-    res[2] = notes.diminish(res[2])
-    return res
+    return from_formula(note, chord_formulas["7b5"])
 
 
 def lydian_dominant_seventh(note):
@@ -555,7 +747,7 @@ def lydian_dominant_seventh(note):
     >>> lydian_dominant_seventh('C')
     ['C', 'E', 'G', 'Bb', 'F#']
     """
-    return dominant_seventh(note) + [notes.augment(intervals.perfect_fourth(note))]
+    return from_formula(note, chord_formulas["7#11"])
 
 
 def hendrix_chord(note):
@@ -565,7 +757,7 @@ def hendrix_chord(note):
     >>> hendrix_chord('C')
     ['C', 'E', 'G', 'Bb', 'Eb']
     """
-    return dominant_seventh(note) + [intervals.minor_third(note)]
+    return from_formula(note, chord_formulas["hendrix"])
 
 
 def tonic(key):
@@ -835,6 +1027,21 @@ def from_shorthand(shorthand_string, slash=None):
 
     Special: '5', 'NC', 'hendrix'
     """
+    if not isinstance(shorthand_string, six.string_types) or not (
+        slash is None or isinstance(slash, six.string_types)
+    ):
+        return _from_shorthand(shorthand_string, slash)
+    cache_key = (shorthand_string, slash)
+    res = _shorthand_cache.get(cache_key)
+    if res is None:
+        res = tuple(_from_shorthand(shorthand_string, slash))
+        _shorthand_cache.put(cache_key, res)
+    return list(res)
+
+
+def _from_shorthand(shorthand_string, slash=None):
+    """Take a chord written in shorthand and return the notes in the chord,
+    without consulting the cache."""
     # warning reduce??
     if isinstance(shorthand_string, list):
         res = []
@@ -844,12 +1051,7 @@ def from_shorthand(shorthand_string, slash=None):
     if shorthand_string in ["NC", "N.C."]:
         return []
 
-    # Shrink shorthand_string to a format recognised by chord_shorthand
-    shorthand_string = shorthand_string.replace("min", "m")
-    shorthand_string = shorthand_string.replace("mi", "m")
-    shorthand_string = shorthand_string.replace("-", "m")
-    shorthand_string = shorthand_string.replace("maj", "M")
-    shorthand_string = shorthand_string.replace("ma", "M")
+    shorthand_string = _normalize_shorthand(shorthand_string)
 
     # Get the note name
     if not notes.is_valid_note(shorthand_string[0]):
@@ -883,7 +1085,7 @@ def from_shorthand(shorthand_string, slash=None):
         s += 1
 
     # Generate slash chord
-    if slash_index != -1 and rest_of_string not in ["m/M7", "6/9", "6/7"]:
+    if slash_index != -1 and rest_of_string not in chord_shorthand:
         res = shorthand_string[: len(name) + slash_index]
         return from_shorthand(
             shorthand_string[: len(name) + slash_index],
@@ -920,7 +1122,37 @@ def determine(chord, shorthand=False, no_inversions=False, no_polychords=False):
     """Name a chord.
 
     This function can determine almost every chord, from a simple triad to a
-    fourteen note polychord."""
+    fourteen note polychord.
+
+    Chords of three to seven notes are looked up in an index keyed on the
+    spelled intervals of the chord, so naming a voicing that has been seen
+    before (in any transposition) does not recompute its inversions."""
+    if 3 <= len(chord) <= 7:
+        signature = _chord_signature(chord)
+        if signature is not None:
+            if not _determine_index:
+                _build_determine_index()
+            key = (signature, bool(shorthand), bool(no_inversions), bool(no_polychords))
+            templates = _determine_index.get(key)
+            if templates is None:
+                result = _determine(chord, shorthand, no_inversions, no_polychords)
+                if not _index_result(key, chord, result):
+                    return result
+                templates = _determine_index[key]
+            return [_render_template(t, chord) for t in templates]
+    return _determine(chord, shorthand, no_inversions, no_polychords)
+
+
+def _determine(chord, shorthand=False, no_inversions=False, no_polychords=False):
+    """Name a chord without consulting the determine index."""
+    if _registered_chords and 3 <= len(chord) <= 7:
+        return _determine_builtin(
+            chord, shorthand, no_inversions, no_polychords
+        ) + _determine_registered(chord, shorthand, no_inversions)
+    return _determine_builtin(chord, shorthand, no_inversions, no_polychords)
+
+
+def _determine_builtin(chord, shorthand=False, no_inversions=False, no_polychords=False):
     if chord == []:
         return []
     elif len(chord) == 1:
@@ -1277,6 +1509,106 @@ def determine_extended_chord7(chord, shorthand=False, no_inversions=False, no_po
     return inversion_exhauster(chord, shorthand, 1, [], [])
 
 
+# The determine index maps (signature, shorthand, no_inversions,
+# no_polychords) to a tuple of result templates. A template is a tuple of
+# (index of the root note in the chord, suffix) pairs, one for each part of
+# a polychord.
+_determine_index = {}
+
+# A cache for the (letter index, semitones above C) pairs of valid notes
+_note_signature_cache = cache.LRUCache("chords.note_signature")
+
+
+def _note_signature(note):
+    """Return the letter index and the unreduced number of semitones above C
+    of a note, or None if the note can't be used in the determine index.
+
+    Notes that mix sharps and flats (e.g. 'C#b') are not indexed, because
+    different strings would share the same signature.
+    """
+    if not isinstance(note, six.string_types):
+        return None
+    sig = _note_signature_cache.get(note)
+    if sig is not None:
+        return sig
+    if note != "" and notes.is_valid_note(note):
+        acc = note[1:]
+        if "#" not in acc or "b" not in acc:
+            sig = (
+                "CDEFGAB".index(note[0]),
+                notes._note_dict[note[0]] + len(acc) * (1 if "#" in acc else -1),
+            )
+            _note_signature_cache.put(note, sig)
+    return sig
+
+
+def _chord_signature(chord):
+    """Return the spelled intervals of every note in chord relative to its
+    first note, or None if one of the notes can't be indexed.
+
+    The result of determine only depends on these intervals and on the note
+    names themselves, so chords sharing a signature share their results.
+    """
+    sigs = [_note_signature(n) for n in chord]
+    if None in sigs:
+        return None
+    letter, semitones = sigs[0]
+    return tuple(((l - letter) % 7, s - semitones) for l, s in sigs)
+
+
+def _render_template(template, chord):
+    return "|".join([chord[i] + suffix for i, suffix in template])
+
+
+def _index_result(key, chord, result):
+    """Store result in the determine index as templates over the positions
+    of chord; return False if it can't be expressed that way."""
+    templates = []
+    for name in result:
+        template = []
+        for part in name.split("|"):
+            root = part[:1]
+            for c in part[1:]:
+                if c != "#" and c != "b":
+                    break
+                root += c
+            if root not in chord:
+                return False
+            template.append((chord.index(root), part[len(root) :]))
+        template = tuple(template)
+        if _render_template(template, chord) != name:
+            return False
+        templates.append(template)
+    _determine_index[key] = tuple(templates)
+    return True
+
+
+def _build_determine_index():
+    """Seed the determine index with every chord in chord_shorthand on every
+    root, in all of its inversions."""
+    roots = [n + acc for n in "CDEFGAB" for acc in ["", "#", "b"]]
+    for short in chord_shorthand:
+        for root in roots:
+            chord = chord_shorthand[short](root)
+            if not 3 <= len(chord) <= 7:
+                continue
+            for i in range(len(chord)):
+                inversion = chord[i:] + chord[:i]
+                signature = _chord_signature(inversion)
+                if signature is None:
+                    continue
+                for shorthand in [False, True]:
+                    key = (signature, shorthand, False, False)
+                    if key not in _determine_index:
+                        try:
+                            result = _determine(inversion, shorthand)
+                        except TypeError:
+                            # int_desc has no description beyond the third
+                            # inversion; leave these to determine itself.
+                            continue
+                        _index_result(key, inversion, result)
+
+
 def int_desc(tries):
     """Return the inversion of the triad in a string."""
     if tries == 1:
@@ -1294,6 +1626,9 @@ def determine_polychords(chord, shorthand=False):
 
     This function can handle anything from polychords based on two triads to
     6 note extended chords.
+
+    Every part of the chord is named at most once, and parts that can't
+    start with a triad are skipped by looking up their pitch classes.
     """
     polychords = []
     function_list = [
@@ -1313,14 +1648,43 @@ def determine_polychords(chord, shorthand=False):
         function_nr = list(range(0, len(chord) - 3))
     else:
         function_nr = list(range(0, 5))
+    if not _triad_masks:
+        _build_triad_masks()
+    names = {}
+
+    def name_part(start, size):
+        """Name the size notes of chord from start on, without inversions
+        and polychords."""
+        if (start, size) in names:
+            return names[start, size]
+        part = chord[start : start + size]
+        if size == 3:
+            root = notes.note_to_int(part[0])
+            mask = (
+                (notes.note_to_int(part[1]) - root) % 12,
+                (notes.note_to_int(part[2]) - root) % 12,
+            )
+            res = function_list[0](part, True, True, True) if mask in _triad_masks else []
+        elif size < 7 and not name_part(start, size - 1):
+            # Sevenths and extended chords are named after the chord on
+            # their first notes
+            res = []
+        else:
+            res = function_list[size - 3](part, True, True, True)
+        names[start, size] = res
+        return res
+
     for f in function_nr:
+        # The clever part: Try the function_list[f] on the len(chord) - (3 +
+        # f) last notes of the chord. Then try the function_list[f2] on the
+        # f2 + 3 first notes of the chord. Thus, trying all possible
+        # combinations.
+        upper = name_part(len(chord) - (3 + f), 3 + f)
+        if not upper:
+            continue
         for f2 in function_nr:
-            # The clever part: Try the function_list[f] on the len(chord) - (3 +
-            # f) last notes of the chord. Then try the function_list[f2] on the
-            # f2 + 3 first notes of the chord. Thus, trying all possible
-            # combinations.
-            for chord1 in function_list[f](chord[len(chord) - (3 + f) :], True, True, True):
-                for chord2 in function_list[f2](chord[: f2 + 3], True, True, True):
+            for chord1 in upper:
+                for chord2 in name_part(0, f2 + 3):
                     polychords.append("%s|%s" % (chord1, chord2))
     if shorthand:
         for p in polychords:
@@ -1328,6 +1692,19 @@ def determine_polychords(chord, shorthand=False):
     return polychords
 
 
+# The intervals in semitones between the first note and the other two notes
+# of the triads that determine_triad can name in root position
+_triad_masks = set()
+
+
+def _build_triad_masks():
+    spelled = [n + acc for n in "CDEFGAB" for acc in ["", "#", "b", "##", "bb"]]
+    for n1 in spelled:
+        for n2 in spelled:
+            if determine_triad(["C", n1, n2], True, True):
+                _triad_masks.add((notes.note_to_int(n1), notes.note_to_int(n2)))
+
+
 # A dictionairy that can be used to present chord abbreviations. This
 # dictionairy is also used in from_shorthand()
 chord_shorthand = {  # Triads Augmented chords Suspended chords Sevenths Sixths
@@ -1378,5 +1755,5 @@ chord_shorthand = {  # Triads Augmented chords Suspended chords Sevenths Sixths
     "7b5": dominant_flat_five,
     "hendrix": hendrix_chord,
     "7b12": hendrix_chord,
-    "5": lambda x: [x, intervals.perfect_fifth(x)],
+    "5": lambda x: from_formula(x, chord_formulas["5"]),
 }
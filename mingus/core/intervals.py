@@ -33,6 +33,39 @@ from __future__ import absolute_import
 
 from mingus.core import notes
 from mingus.core import keys
+from mingus.core import cache
+from six.moves import range
+
+# A cache for from_shorthand
+_shorthand_cache = cache.LRUCache("intervals.from_shorthand")
+
+# The notes the minor and major functions return, by (note, letters,
+# half_notes). Filled below for every note with up to four accidentals.
+_interval_table = {}
+
+# [name, shorthand_name, half notes for major version of this interval], by
+# the number of letters between the notes
+_interval_numbers = [
+    ["unison", "1", 0],
+    ["second", "2", 2],
+    ["third", "3", 4],
+    ["fourth", "4", 5],
+    ["fifth", "5", 7],
+    ["sixth", "6", 9],
+    ["seventh", "7", 11],
+]
+
+# The (letters, half_notes) of the interval functions from_shorthand uses, up
+# and down
+_shorthand_steps = {
+    "1": ((0, 0), (0, 0)),
+    "2": ((1, 2), (6, 10)),
+    "3": ((2, 4), (5, 8)),
+    "4": ((3, 5), (4, 7)),
+    "5": ((4, 7), (3, 5)),
+    "6": ((5, 9), (2, 3)),
+    "7": ((6, 11), (1, 1)),
+}
 
 
 def interval(key, start_note, interval):
@@ -47,7 +80,7 @@ def interval(key, start_note, interval):
     """
     if not notes.is_valid_note(start_note):
         raise KeyError("The start note '%s' is not a valid note" % start_note)
-    notes_in_key = keys.get_notes(key)
+    notes_in_key = keys.get_key_info(key).notes
     for n in notes_in_key:
         if n[0] == start_note[0]:
             index = notes_in_key.index(n)
@@ -153,6 +186,20 @@ def seventh(note, key):
     return interval(key, note, 6)
 
 
+def _interval_from(note, letters, half_notes):
+    """Return the note that is letters steps and half_notes half notes above
+    note. A helper function for the minor and major functions."""
+    try:
+        return _interval_table[note, letters, half_notes]
+    except (KeyError, TypeError):
+        pass
+    if not isinstance(note, notes.Pitch) and not notes.is_valid_note(note[0]):
+        raise KeyError("The start note '%s' is not a valid note" % note[0])
+    pitch = notes.to_pitch(note)
+    natural = notes.Pitch((pitch.letter + letters) % 7)
+    return augment_or_diminish_until_the_interval_is_right(pitch, natural, half_notes)
+
+
 def minor_unison(note):
     return notes.diminish(note)
 
@@ -166,33 +213,27 @@ def augmented_unison(note):
 
 
 def minor_second(note):
-    sec = second(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, sec, 1)
+    return _interval_from(note, 1, 1)
 
 
 def major_second(note):
-    sec = second(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, sec, 2)
+    return _interval_from(note, 1, 2)
 
 
 def minor_third(note):
-    trd = third(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, trd, 3)
+    return _interval_from(note, 2, 3)
 
 
 def major_third(note):
-    trd = third(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, trd, 4)
+    return _interval_from(note, 2, 4)
 
 
 def minor_fourth(note):
-    frt = fourth(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, frt, 4)
+    return _interval_from(note, 3, 4)
 
 
 def major_fourth(note):
-    frt = fourth(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, frt, 5)
+    return _interval_from(note, 3, 5)
 
 
 def perfect_fourth(note):
@@ -200,13 +241,11 @@ def perfect_fourth(note):
 
 
 def minor_fifth(note):
-    fif = fifth(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, fif, 6)
+    return _interval_from(note, 4, 6)
 
 
 def major_fifth(note):
-    fif = fifth(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, fif, 7)
+    return _interval_from(note, 4, 7)
 
 
 def perfect_fifth(note):
@@ -214,23 +253,19 @@ def perfect_fifth(note):
 
 
 def minor_sixth(note):
-    sth = sixth(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, sth, 8)
+    return _interval_from(note, 5, 8)
 
 
 def major_sixth(note):
-    sth = sixth(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, sth, 9)
+    return _interval_from(note, 5, 9)
 
 
 def minor_seventh(note):
-    sth = seventh(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, sth, 10)
+    return _interval_from(note, 6, 10)
 
 
 def major_seventh(note):
-    sth = seventh(note[0], "C")
-    return augment_or_diminish_until_the_interval_is_right(note, sth, 11)
+    return _interval_from(note, 6, 11)
 
 
 def get_interval(note, interval, key="C"):
@@ -240,7 +275,7 @@ def get_interval(note, interval, key="C"):
     the minor and major functions to work around the corner cases.
     """
     intervals = [(notes.note_to_int(key) + x) % 12 for x in [0, 2, 4, 5, 7, 9, 11]]
-    key_notes = keys.get_notes(key)
+    key_notes = keys.get_key_info(key).notes
     for x in key_notes:
         if x[0] == note[0]:
             result = (intervals[key_notes.index(x)] + interval) % 12
@@ -260,11 +295,7 @@ def measure(note1, note2):
     >>> measure('D', 'C')
     10
     """
-    res = notes.note_to_int(note2) - notes.note_to_int(note1)
-    if res < 0:
-        return 12 - res * -1
-    else:
-        return res
+    return (notes.to_pitch(note2).pitch_class - notes.to_pitch(note1).pitch_class) % 12
 
 
 def augment_or_diminish_until_the_interval_is_right(note1, note2, interval):
@@ -272,41 +303,19 @@ def augment_or_diminish_until_the_interval_is_right(note1, note2, interval):
 
     You should probably not use this directly.
     """
-    cur = measure(note1, note2)
-    while cur != interval:
-        if cur > interval:
-            note2 = notes.diminish(note2)
-        elif cur < interval:
-            note2 = notes.augment(note2)
-        cur = measure(note1, note2)
-
-    # We are practically done right now, but we need to be able to create the
-    # minor seventh of Cb and get Bbb instead of B######### as the result
-    val = 0
-    for token in note2[1:]:
-        if token == "#":
-            val += 1
-        elif token == "b":
-            val -= 1
-
-    # These are some checks to see if we have generated too much #'s or too much
-    # b's. In these cases we need to convert #'s to b's and vice versa.
+    pitch = notes.to_pitch(note2)
+    val = pitch.accidentals + interval - measure(note1, note2)
+
+    # We need to be able to create the minor seventh of Cb and get Bbb instead
+    # of B######### as the result, so convert too many #'s to b's and vice
+    # versa.
     if val > 6:
         val = val % 12
         val = -12 + val
     elif val < -6:
         val = val % -12
         val = 12 + val
-
-    # Rebuild the note
-    result = note2[0]
-    while val > 0:
-        result = notes.augment(result)
-        val -= 1
-    while val < 0:
-        result = notes.diminish(result)
-        val += 1
-    return result
+    return notes.Pitch(pitch.letter, val).name
 
 
 def invert(interval):
@@ -342,21 +351,13 @@ def determine(note1, note2, shorthand=False):
     >>> determine('C', 'F')
     'perfect fourth'
     """
+    pitch1 = notes.to_pitch(note1)
+    pitch2 = notes.to_pitch(note2)
+
     # Corner case for unisons ('A' and 'Ab', for instance)
-    if note1[0] == note2[0]:
-
-        def get_val(note):
-            """Private function: count the value of accidentals."""
-            r = 0
-            for x in note[1:]:
-                if x == "b":
-                    r -= 1
-                elif x == "#":
-                    r += 1
-            return r
-
-        x = get_val(note1)
-        y = get_val(note2)
+    if pitch1.letter == pitch2.letter:
+        x = pitch1.accidentals
+        y = pitch2.accidentals
         if x == y:
             if not shorthand:
                 return "major unison"
@@ -375,28 +376,14 @@ def determine(note1, note2, shorthand=False):
             return "bb1"
 
     # Other intervals
-    n1 = notes.fifths.index(note1[0])
-    n2 = notes.fifths.index(note2[0])
-    number_of_fifth_steps = n2 - n1
-    if n2 < n1:
-        number_of_fifth_steps = len(notes.fifths) - n1 + n2
-
-    # [name, shorthand_name, half notes for major version of this interval]
-    fifth_steps = [
-        ["unison", "1", 0],
-        ["fifth", "5", 7],
-        ["second", "2", 2],
-        ["sixth", "6", 9],
-        ["third", "3", 4],
-        ["seventh", "7", 11],
-        ["fourth", "4", 5],
-    ]
-
-    # Count half steps between note1 and note2
-    half_notes = measure(note1, note2)
-
-    # Get the proper list from the number of fifth steps
-    current = fifth_steps[number_of_fifth_steps]
+    half_notes = (pitch2.pitch_class - pitch1.pitch_class) % 12
+    return _interval_names[(pitch2.letter - pitch1.letter) % 7][half_notes][bool(shorthand)]
+
+
+def _name_interval(letters, half_notes, shorthand):
+    """Name the interval of letters steps (1-6) and half_notes half notes.
+    Used to fill the table determine looks the names up in."""
+    current = _interval_numbers[letters]
 
     # maj = number of major steps for this interval
     maj = current[2]
@@ -430,6 +417,12 @@ def determine(note1, note2, shorthand=False):
         return "b" * (maj - half_notes) + current[1]
 
 
+# The names of the intervals by letters steps, half notes and shorthand
+_interval_names = [
+    [(_name_interval(l, h, False), _name_interval(l, h, True)) for h in range(12)] for l in range(7)
+]
+
+
 def from_shorthand(note, interval, up=True):
     """Return the note on interval up or down.
 
@@ -441,49 +434,50 @@ def from_shorthand(note, interval, up=True):
     >>> from_shorthand('E', '2', False)
     'D'
     """
+    try:
+        cache_key = (note, interval, bool(up))
+        res = _shorthand_cache.get(cache_key)
+    except TypeError:
+        return _from_shorthand(note, interval, up)
+    if res is None:
+        res = _from_shorthand(note, interval, up)
+        _shorthand_cache.put(cache_key, res)
+    return res
+
+
+def _from_shorthand(note, interval, up=True):
+    """Return the note on interval up or down, without consulting the
+    cache."""
     # warning should be a valid note.
     if not notes.is_valid_note(note):
         return False
 
-    # [shorthand, interval function up, interval function down]
-    shorthand_lookup = [
-        ["1", major_unison, major_unison],
-        ["2", major_second, minor_seventh],
-        ["3", major_third, minor_sixth],
-        ["4", major_fourth, major_fifth],
-        ["5", major_fifth, major_fourth],
-        ["6", major_sixth, minor_third],
-        ["7", major_seventh, minor_second],
-    ]
-
-    # Looking up last character in interval in shorthand_lookup and calling that
-    # function.
-    val = False
-    for shorthand in shorthand_lookup:
-        if shorthand[0] == interval[-1]:
-            if up:
-                val = shorthand[1](note)
-            else:
-                val = shorthand[2](note)
-
-    # warning Last character in interval should be 1-7
-    if val == False:
+    # Look up the last character in interval
+    try:
+        (letters, half_notes) = _shorthand_steps[interval[-1]][0 if up else 1]
+    except KeyError:
+        # warning Last character in interval should be 1-7
         return False
+    if letters == 0:
+        val = note
+    else:
+        val = _interval_from(note, letters, half_notes)
 
-    # Collect accidentals
+    # Count the accidentals
+    accidentals = 0
     for x in interval:
         if x == "#":
-            if up:
-                val = notes.augment(val)
-            else:
-                val = notes.diminish(val)
+            accidentals += 1
         elif x == "b":
-            if up:
-                val = notes.diminish(val)
-            else:
-                val = notes.augment(val)
+            accidentals -= 1
         else:
-            return val
+            break
+    if accidentals == 0:
+        return val
+    pitch = notes.to_pitch(val)
+    if not up:
+        accidentals = -accidentals
+    return notes.Pitch(pitch.letter, pitch.accidentals + accidentals).name
 
 
 def is_consonant(note1, note2, include_fourths=True):
@@ -536,3 +530,18 @@ def is_dissonant(note1, note2, include_fourths=False):
     can be changed by setting exclude_fourths to True.
     """
     return not is_consonant(note1, note2, not include_fourths)
+
+
+def _fill_interval_table():
+    """Fill _interval_table for every note with up to four accidentals."""
+    for letter in range(7):
+        for accidentals in range(-4, 5):
+            name = notes.Pitch(letter, accidentals).name
+            for letters in range(1, 7):
+                maj = _interval_numbers[letters][2]
+                for half_notes in (maj - 1, maj):
+                    res = _interval_from(name, letters, half_notes)
+                    _interval_table[name, letters, half_notes] = res
+
+
+_fill_interval_table()
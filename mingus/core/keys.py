@@ -22,6 +22,7 @@ This module provides a simple interface for dealing with keys.
 """
 from __future__ import absolute_import
 
+from collections import namedtuple
 from itertools import cycle, islice
 
 from six.moves import range
@@ -52,15 +53,72 @@ minor_keys = [couple[1] for couple in keys]
 
 base_scale = ["C", "D", "E", "F", "G", "A", "B"]
 
-_key_cache = {}
+KeyInfo = namedtuple(
+    "KeyInfo", ["key", "mode", "name", "signature", "accidentals", "notes", "relative"]
+)
+
+
+def _make_key_info(key, signature, relative):
+    """Compute the KeyInfo record of key."""
+    if key[0].islower():
+        mode = "minor"
+    else:
+        mode = "major"
+    if len(key) > 1:
+        symbol = "sharp " if key[1] == "#" else "flat "
+    else:
+        symbol = ""
+    name = "{0} {1}{2}".format(key[0].upper(), symbol, mode)
+
+    if signature < 0:
+        accidentals = tuple(x + "b" for x in reversed(notes.fifths))[:-signature]
+    else:
+        accidentals = tuple(x + "#" for x in notes.fifths)[:signature]
+
+    altered_notes = [x[0] for x in accidentals]
+    symbol = "b" if signature < 0 else "#"
+    raw_tonic_index = base_scale.index(key.upper()[0])
+    scale_notes = []
+    for note in islice(cycle(base_scale), raw_tonic_index, raw_tonic_index + 7):
+        if note in altered_notes:
+            scale_notes.append(note + symbol)
+        else:
+            scale_notes.append(note)
+    return KeyInfo(key, mode, name, signature, accidentals, tuple(scale_notes), relative)
+
+
+# The KeyInfo records of all the keys
+_key_info = dict(
+    (key, _make_key_info(key, signature, relative))
+    for (signature, couple) in enumerate(keys, -7)
+    for (key, relative) in (couple, couple[::-1])
+)
 
 
 def is_valid_key(key):
     """Return True if key is in a recognized format. False if not."""
-    for couple in keys:
-        if key in couple:
-            return True
-    return False
+    try:
+        return key in _key_info
+    except TypeError:
+        return False
+
+
+def get_key_info(key="C"):
+    """Return the KeyInfo record of key: a named tuple with the key, mode,
+    name, signature, accidentals, notes and relative key.
+
+    Raise a NoteFormatError if the key is not recognised.
+
+    Example:
+    >>> get_key_info('g').notes
+    ('G', 'A', 'Bb', 'C', 'D', 'Eb', 'F')
+    >>> get_key_info('g').relative
+    'Bb'
+    """
+    try:
+        return _key_info[key]
+    except (KeyError, TypeError):
+        raise NoteFormatError("unrecognized format for key '%s'" % key)
 
 
 def get_key(accidentals=0):
@@ -81,27 +139,12 @@ def get_key_signature(key="C"):
     0 for C or a, negative numbers for flat key signatures, positive numbers
     for sharp key signatures.
     """
-    if not is_valid_key(key):
-        raise NoteFormatError("unrecognized format for key '%s'" % key)
-
-    for couple in keys:
-        if key in couple:
-            accidentals = keys.index(couple) - 7
-            return accidentals
+    return get_key_info(key).signature
 
 
 def get_key_signature_accidentals(key="C"):
     """Return the list of accidentals present into the key signature."""
-    accidentals = get_key_signature(key)
-    res = []
-
-    if accidentals < 0:
-        for i in range(-accidentals):
-            res.append("{0}{1}".format(list(reversed(notes.fifths))[i], "b"))
-    elif accidentals > 0:
-        for i in range(accidentals):
-            res.append("{0}{1}".format(notes.fifths[i], "#"))
-    return res
+    return list(get_key_info(key).accidentals)
 
 
 def get_notes(key="C"):
@@ -113,31 +156,7 @@ def get_notes(key="C"):
     >>> get_notes('c')
     ['C', 'D', 'Eb', 'F', 'G', 'Ab', 'Bb']
     """
-    if key in _key_cache:
-        return _key_cache[key]
-    if not is_valid_key(key):
-        raise NoteFormatError("unrecognized format for key '%s'" % key)
-    result = []
-
-    # Calculate notes
-    altered_notes = [x[0] for x in get_key_signature_accidentals(key)]
-
-    if get_key_signature(key) < 0:
-        symbol = "b"
-    elif get_key_signature(key) > 0:
-        symbol = "#"
-
-    raw_tonic_index = base_scale.index(key.upper()[0])
-
-    for note in islice(cycle(base_scale), raw_tonic_index, raw_tonic_index + 7):
-        if note in altered_notes:
-            result.append("%s%s" % (note, symbol))
-        else:
-            result.append(note)
-
-    # Save result to cache
-    _key_cache[key] = result
-    return result
+    return list(get_key_info(key).notes)
 
 
 def relative_major(key):
@@ -147,10 +166,9 @@ def relative_major(key):
     >>> relative_major('a')
     'C'
     """
-    for couple in keys:
-        if key == couple[1]:
-            return couple[0]
-    raise NoteFormatError("'%s' is not a minor key" % key)
+    if not is_valid_key(key) or _key_info[key].mode != "minor":
+        raise NoteFormatError("'%s' is not a minor key" % key)
+    return _key_info[key].relative
 
 
 def relative_minor(key):
@@ -160,35 +178,54 @@ def relative_minor(key):
     >>> relative_minor('C')
     'a'
     """
-    for couple in keys:
-        if key == couple[0]:
-            return couple[1]
-    raise NoteFormatError("'%s' is not a major key" % key)
+    if not is_valid_key(key) or _key_info[key].mode != "major":
+        raise NoteFormatError("'%s' is not a major key" % key)
+    return _key_info[key].relative
 
 
 class Key(object):
 
-    """A key object."""
+    """A key object.
 
-    def __init__(self, key="C"):
-        self.key = key
+    Keys are immutable and interned, so all the Bars in a key share the same
+    Key object.
 
-        if self.key[0].islower():
-            self.mode = "minor"
-        else:
-            self.mode = "major"
+    Example:
+    >>> Key('Eb') is Key('Eb')
+    True
+    >>> Key('f#').name
+    'F sharp minor'
+    """
+
+    __slots__ = ("key", "mode", "name", "signature")
+
+    _interned = {}
 
+    def __new__(cls, key="C"):
         try:
-            symbol = self.key[1]
-            if symbol == "#":
-                symbol = "sharp "
-            else:
-                symbol = "flat "
-        except:
-            symbol = ""
-        self.name = "{0} {1}{2}".format(self.key[0].upper(), symbol, self.mode)
-
-        self.signature = get_key_signature(self.key)
+            return cls._interned[key]
+        except (KeyError, TypeError):
+            pass
+        info = get_key_info(key)
+        self = object.__new__(cls)
+        for attr in cls.__slots__:
+            object.__setattr__(self, attr, getattr(info, attr))
+        cls._interned[key] = self
+        return self
+
+    @property
+    def info(self):
+        """The KeyInfo record of this key."""
+        return _key_info[self.key]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Key objects are immutable")
+
+    def __reduce__(self):
+        return (Key, (self.key,))
+
+    def __hash__(self):
+        return hash(self.key)
 
     def __eq__(self, other):
         if self.key == other.key:
@@ -32,6 +32,166 @@ from six.moves import range
 _note_dict = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
 fifths = ["F", "C", "G", "D", "A", "E", "B"]
 
+_letters = "CDEFGAB"
+_letter_semitones = (0, 2, 4, 5, 7, 9, 11)
+
+_sharp_names = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+_flat_names = ("C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B")
+
+# A table of parsed note names, filled with every note with up to four
+# accidentals at the end of this module. Other spellings are parsed on every
+# call, so arbitrary input can't make the table grow.
+_pitch_cache = {}
+
+# Pitches with more accidentals or with octaves outside this range are not
+# interned
+_MAX_INTERNED_ACCIDENTALS = 4
+_INTERNED_OCTAVES = range(-1, 11)
+
+
+class Pitch(object):
+    """A spelled pitch: a letter, a number of accidentals and optionally an
+    octave.
+
+    The letter is an index into 'CDEFGAB' and the accidentals are counted
+    as an integer (positive for sharps, negative for flats). Pitches are
+    immutable. Pitches with up to four accidentals in the octaves -1 to 10
+    are interned, so equal pitches are the same object; the rest compare by
+    value.
+
+    Examples:
+    >>> Pitch.from_string('Eb')
+    Pitch('Eb')
+    >>> Pitch.from_string('C##') is Pitch(0, 2)
+    True
+    >>> int(Pitch.from_string('Cb'))
+    11
+    >>> str(Pitch(6, -1, 4))
+    'Bb-4'
+    """
+
+    __slots__ = ("letter", "accidentals", "octave", "name")
+
+    _interned = {}
+
+    def __new__(cls, letter, accidentals=0, octave=None):
+        key = (letter, accidentals, octave)
+        if key in cls._interned:
+            return cls._interned[key]
+        if letter not in range(7):
+            raise RangeError("letter out of bounds (0-6): %r" % letter)
+        self = object.__new__(cls)
+        if accidentals < 0:
+            name = _letters[letter] + "b" * -accidentals
+        else:
+            name = _letters[letter] + "#" * accidentals
+        object.__setattr__(self, "letter", letter)
+        object.__setattr__(self, "accidentals", accidentals)
+        object.__setattr__(self, "octave", octave)
+        object.__setattr__(self, "name", name)
+        if -_MAX_INTERNED_ACCIDENTALS <= accidentals <= _MAX_INTERNED_ACCIDENTALS and (
+            octave is None or octave in _INTERNED_OCTAVES
+        ):
+            cls._interned[key] = self
+        return self
+
+    @classmethod
+    def from_string(cls, note, octave=None):
+        """Return the Pitch for a note in the form of C, C#, Cb, C##, etc.
+
+        Throw a NoteFormatError exception if the note format is not
+        recognised.
+        """
+        pitch = to_pitch(note)
+        if octave is None:
+            return pitch
+        return cls(pitch.letter, pitch.accidentals, octave)
+
+    @property
+    def semitones(self):
+        """The number of semitones above C (C-0 if the pitch has an octave),
+        without reducing the accidentals."""
+        res = _letter_semitones[self.letter] + self.accidentals
+        if self.octave is not None:
+            res += self.octave * 12
+        return res
+
+    @property
+    def pitch_class(self):
+        """The pitch class of this pitch in the range of 0-11."""
+        return (_letter_semitones[self.letter] + self.accidentals) % 12
+
+    def augment(self):
+        """Return this pitch raised by a sharp."""
+        return Pitch(self.letter, self.accidentals + 1, self.octave)
+
+    def diminish(self):
+        """Return this pitch lowered by a flat."""
+        return Pitch(self.letter, self.accidentals - 1, self.octave)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Pitch objects are immutable")
+
+    def __reduce__(self):
+        return (Pitch, (self.letter, self.accidentals, self.octave))
+
+    def __eq__(self, other):
+        if not isinstance(other, Pitch):
+            return NotImplemented
+        return (self.letter, self.accidentals, self.octave) == (
+            other.letter,
+            other.accidentals,
+            other.octave,
+        )
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash((self.letter, self.accidentals, self.octave))
+
+    def __int__(self):
+        """Return the pitch class, or the octave multiplied by twelve plus
+        the semitones above C if the pitch has an octave (like Note does)."""
+        if self.octave is None:
+            return self.pitch_class
+        return self.semitones
+
+    def __str__(self):
+        if self.octave is None:
+            return self.name
+        return "%s-%d" % (self.name, self.octave)
+
+    def __repr__(self):
+        return "Pitch(%r)" % str(self)
+
+
+def to_pitch(note):
+    """Return the Pitch for note, which can be a string or a Pitch.
+
+    Throw a NoteFormatError exception if the note format is not recognised.
+    """
+    if isinstance(note, Pitch):
+        return note
+    try:
+        return _pitch_cache[note]
+    except (KeyError, TypeError):
+        pass
+    if not note or note[0] not in _note_dict:
+        raise NoteFormatError("Unknown note format '%s'" % note)
+    accidentals = 0
+    for post in note[1:]:
+        if post == "#":
+            accidentals += 1
+        elif post == "b":
+            accidentals -= 1
+        else:
+            raise NoteFormatError("Unknown note format '%s'" % note)
+    return Pitch(_letters.index(note[0]), accidentals)
+
 
 def int_to_note(note_int, accidentals="#"):
     """Convert integers in the range of 0-11 to notes in the form of C or C#
@@ -51,12 +211,10 @@ def int_to_note(note_int, accidentals="#"):
     """
     if note_int not in range(12):
         raise RangeError("int out of bounds (0-11): %d" % note_int)
-    ns = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-    nf = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
     if accidentals == "#":
-        return ns[note_int]
+        return _sharp_names[note_int]
     elif accidentals == "b":
-        return nf[note_int]
+        return _flat_names[note_int]
     else:
         raise FormatError("'%s' not valid as accidental" % accidentals)
 
@@ -68,6 +226,8 @@ def is_enharmonic(note1, note2):
 
 def is_valid_note(note):
     """Return True if note is in a recognised format. False if not."""
+    if isinstance(note, Pitch) or note in _pitch_cache:
+        return True
     if note[0] not in _note_dict:
         return False
     for post in note[1:]:
@@ -82,18 +242,7 @@ def note_to_int(note):
 
     Throw a NoteFormatError exception if the note format is not recognised.
     """
-    if is_valid_note(note):
-        val = _note_dict[note[0]]
-    else:
-        raise NoteFormatError("Unknown note format '%s'" % note)
-
-    # Check for '#' and 'b' postfixes
-    for post in note[1:]:
-        if post == "b":
-            val -= 1
-        elif post == "#":
-            val += 1
-    return val % 12
+    return to_pitch(note).pitch_class
 
 
 def reduce_accidentals(note):
@@ -103,18 +252,11 @@ def reduce_accidentals(note):
     >>> reduce_accidentals('C####')
     'E'
     """
-    val = note_to_int(note[0])
-    for token in note[1:]:
-        if token == "b":
-            val -= 1
-        elif token == "#":
-            val += 1
-        else:
-            raise NoteFormatError("Unknown note format '%s'" % note)
-    if val >= note_to_int(note[0]):
-        return int_to_note(val % 12)
+    pitch = to_pitch(note)
+    if pitch.accidentals >= 0:
+        return int_to_note(pitch.pitch_class)
     else:
-        return int_to_note(val % 12, "b")
+        return int_to_note(pitch.pitch_class, "b")
 
 
 def remove_redundant_accidentals(note):
@@ -126,6 +268,8 @@ def remove_redundant_accidentals(note):
     >>> remove_redundant_accidentals('Eb##b')
     'E'
     """
+    if is_valid_note(note):
+        return to_pitch(note).name
     val = 0
     for token in note[1:]:
         if token == "b":
@@ -151,6 +295,8 @@ def augment(note):
     >>> augment('Cb')
     'C'
     """
+    if isinstance(note, Pitch):
+        return note.augment()
     if note[-1] != "b":
         return note + "#"
     else:
@@ -166,7 +312,12 @@ def diminish(note):
     >>> diminish('C#')
     'C'
     """
+    if isinstance(note, Pitch):
+        return note.diminish()
     if note[-1] != "#":
         return note + "b"
     else:
         return note[:-1]
+
+
+_pitch_cache.update((p.name, p) for p in [Pitch(l, a) for l in range(7) for a in range(-4, 5)])
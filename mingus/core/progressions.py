@@ -29,15 +29,57 @@ vice versa.
 """
 from __future__ import absolute_import
 
+from bisect import bisect_right
+
 from mingus.core import notes
 from mingus.core import chords
 from mingus.core import intervals
+from mingus.core import keys
+from mingus.core import cache
 import six
 from six.moves import range
 
 numerals = ["I", "II", "III", "IV", "V", "VI", "VII"]
 numeral_intervals = [0, 2, 4, 5, 7, 9, 11]
 
+# The function of the chords on every degree, by interval name
+_interval_functions = {
+    "unison": "I",
+    "second": "ii",
+    "third": "iii",
+    "fourth": "IV",
+    "fifth": "V",
+    "sixth": "vi",
+    "seventh": "vii",
+}
+
+_function_names = {
+    "I": "tonic",
+    "ii": "supertonic",
+    "iii": "mediant",
+    "IV": "subdominant",
+    "V": "dominant",
+    "vi": "submediant",
+    "vii": "subtonic",
+}
+
+# The triad and seventh chord expected on every degree
+_expected_chords = {
+    "I": ("M", "M7"),
+    "ii": ("m", "m7"),
+    "iii": ("m", "m7"),
+    "IV": ("M", "M7"),
+    "V": ("M", "7"),
+    "vi": ("m", "m7"),
+    "vii": ("dim", "m7b5"),
+}
+
+# A cache for the direct substitutions of chords
+_substitutions_cache = cache.LRUCache("progressions.substitutions")
+
+# A cache for to_chords
+_chords_cache = cache.LRUCache("progressions.to_chords")
+
 
 def to_chords(progression, key="C"):
     """Convert a list of chord functions or a string to a list of chords.
@@ -65,6 +107,20 @@ def to_chords(progression, key="C"):
     """
     if isinstance(progression, six.string_types):
         progression = [progression]
+    try:
+        cache_key = (tuple(progression), key)
+        res = _chords_cache.get(cache_key)
+    except TypeError:
+        return _to_chords(progression, key)
+    if res is None:
+        res = tuple(tuple(r) for r in _to_chords(progression, key))
+        _chords_cache.put(cache_key, res)
+    return [list(r) for r in res]
+
+
+def _to_chords(progression, key="C"):
+    """Convert a list of chord functions to a list of chords, without
+    consulting the cache."""
     result = []
     for chord in progression:
         # strip preceding accidentals from the string
@@ -98,7 +154,9 @@ def to_chords(progression, key="C"):
 def determine(chord, key, shorthand=False):
     """Determine the harmonic function of chord in key.
 
-    This function can also deal with lists of chords.
+    This function can also deal with lists of chords. The key can also be a
+    minor key ('a') or a Key object, in which case the functions are
+    relative to its tonic.
 
     Examples:
     >>> determine(['C', 'E', 'G'], 'C')
@@ -118,96 +176,123 @@ def determine(chord, key, shorthand=False):
             result.append(determine(c, key, shorthand))
         return result
 
-    func_dict = {
-        "I": "tonic",
-        "ii": "supertonic",
-        "iii": "mediant",
-        "IV": "subdominant",
-        "V": "dominant",
-        "vi": "submediant",
-        "vii": "subtonic",
-    }
-    expected_chord = [
-        ["I", "M", "M7"],
-        ["ii", "m", "m7"],
-        ["iii", "m", "m7"],
-        ["IV", "M", "M7"],
-        ["V", "M", "7"],
-        ["vi", "m", "m7"],
-        ["vii", "dim", "m7b5"],
-    ]
-    type_of_chord = chords.determine(chord, True, False, True)
-    for chord in type_of_chord:
-        name = chord[0]
-
-        # Get accidentals
-        a = 1
-        for n in chord[1:]:
-            if n == "b":
-                name += "b"
-            elif n == "#":
-                name += "#"
+    for name in chords.determine(chord, True, False, True):
+        result.append(_chord_function(name, key, shorthand))
+    return result
+
+
+def determine_progression(progression, key, shorthand=False):
+    """Determine the harmonic functions of all the chords in progression.
+
+    The chords can be lists of notes or NoteContainers. The key can be a
+    single key (a string or a Key), a list with the key of every chord or a
+    dictionary that maps the index of a chord to the key starting at that
+    chord.
+
+    Return a list with the result of determine for every chord. Chords that
+    occur more than once are only analyzed once, which makes this a lot
+    faster than calling determine for every chord of a long piece.
+
+    Example:
+    >>> determine_progression([['C', 'E', 'G'], ['G', 'B', 'D', 'F'], ['C', 'E', 'G']], 'C', True)
+    [['I'], ['V7'], ['I']]
+    >>> determine_progression([['C', 'E', 'G'], ['C', 'E', 'G']], {0: 'C', 1: 'G'}, True)
+    [['I'], ['IV']]
+    """
+    if isinstance(key, six.string_types + (keys.Key,)):
+        key_of = lambda i: key
+    elif isinstance(key, dict):
+        starts = sorted(key)
+        key_of = lambda i: key[starts[max(bisect_right(starts, i) - 1, 0)]]
+    else:
+        key_of = lambda i: key[i]
+
+    names = {}
+    functions = {}
+    result = []
+    for (i, chord) in enumerate(progression):
+        if hasattr(chord, "get_note_names"):
+            chord = chord.get_note_names()
+        chord = tuple(chord)
+        k = key_of(i)
+        if (chord, k) not in functions:
+            if chord not in names:
+                names[chord] = chords.determine(list(chord), True, False, True)
+            res = []
+            for name in names[chord]:
+                if (name, k) not in functions:
+                    functions[name, k] = _chord_function(name, k, shorthand)
+                res.append(functions[name, k])
+            functions[chord, k] = res
+        result.append(list(functions[chord, k]))
+    return result
+
+
+def _chord_function(chord, key, shorthand=False):
+    """Return the harmonic function in key of a chord in shorthand."""
+    name = chord[0]
+
+    # Get accidentals
+    a = 1
+    for n in chord[1:]:
+        if n == "b":
+            name += "b"
+        elif n == "#":
+            name += "#"
+        else:
+            break
+        a += 1
+    chord_type = chord[a:]
+
+    # Determine chord function
+    (interval_type, interval) = intervals.determine(_tonic(key), name).split(" ")
+    func = _interval_functions.get(interval)
+
+    # Check whether the chord is altered or not
+    if func in _expected_chords:
+        (triad, seventh) = _expected_chords[func]
+        if chord_type == triad:
+            # Triads
+            if not shorthand:
+                func = _function_names[func]
+        elif chord_type == seventh:
+            # Sevenths
+            if shorthand:
+                func += "7"
             else:
-                break
-            a += 1
-        chord_type = chord[a:]
-
-        # Determine chord function
-        (interval_type, interval) = intervals.determine(key, name).split(" ")
-        if interval == "unison":
-            func = "I"
-        elif interval == "second":
-            func = "ii"
-        elif interval == "third":
-            func = "iii"
-        elif interval == "fourth":
-            func = "IV"
-        elif interval == "fifth":
-            func = "V"
-        elif interval == "sixth":
-            func = "vi"
-        elif interval == "seventh":
-            func = "vii"
-
-        # Check whether the chord is altered or not
-        for x in expected_chord:
-            if x[0] == func:
-                # Triads
-                if chord_type == x[1]:
-                    if not shorthand:
-                        func = func_dict[func]
-                elif chord_type == x[2]:
-                    # Sevenths
-                    if shorthand:
-                        func += "7"
-                    else:
-                        func = func_dict[func] + " seventh"
-                else:
-                    # Other
-                    if shorthand:
-                        func += chord_type
-                    else:
-                        func = func_dict[func] + chords.chord_shorthand_meaning[chord_type]
-
-        # Handle b's and #'s (for instance Dbm in key C is bII)
-        if shorthand:
-            if interval_type == "minor":
-                func = "b" + func
-            elif interval_type == "augmented":
-                func = "#" + func
-            elif interval_type == "diminished":
-                func = "bb" + func
+                func = _function_names[func] + " seventh"
         else:
-            if interval_type == "minor":
-                func = "minor " + func
-            elif interval_type == "augmented":
-                func = "augmented " + func
-            elif interval_type == "diminished":
-                func = "diminished " + func
-
-        # Add to results
-        result.append(func)
-    return result
+            # Other
+            if shorthand:
+                func += chord_type
+            else:
+                func = _function_names[func] + chords.chord_shorthand_meaning[chord_type]
+
+    # Handle b's and #'s (for instance Dbm in key C is bII)
+    if shorthand:
+        if interval_type == "minor":
+            func = "b" + func
+        elif interval_type == "augmented":
+            func = "#" + func
+        elif interval_type == "diminished":
+            func = "bb" + func
+    else:
+        if interval_type == "minor":
+            func = "minor " + func
+        elif interval_type == "augmented":
+            func = "augmented " + func
+        elif interval_type == "diminished":
+            func = "diminished " + func
+    return func
+
+
+def _tonic(key):
+    """Return the tonic of key, which can be a Key, a major key ('C') or a
+    minor key ('c')."""
+    key = getattr(key, "key", key)
+    if key[:1].islower():
+        return key[0].upper() + key[1:]
+    return key
 
 
 def parse_string(progression):
@@ -397,12 +482,61 @@ def substitute(progression, substitute_index, depth=0):
     """Give a list of possible substitutions for progression[substitute_index].
 
     If depth > 0 the substitutions of each result will be recursively added
-    as well.
+    as well. See iter_substitutions for a search that doesn't repeat
+    results.
 
     Example:
     >>> substitute(['I', 'IV', 'V', 'I'], 0)
     ['III', 'III7', 'VI', 'VI7', 'I7']
     """
+    res = list(_substitutions(progression[substitute_index]))
+    res2 = []
+    if depth > 0:
+        for x in res:
+            res2 += substitute([x], 0, depth - 1)
+    return res + res2
+
+
+def iter_substitutions(progression, substitute_index, depth=0, limit=None):
+    """Generate the possible substitutions for progression[substitute_index]
+    breadth first.
+
+    The direct substitutions come first, then their substitutions and so
+    on, up to depth levels deep (or until there are no new ones if depth
+    is None). Every chord is only generated once and the chord that is
+    substituted is never generated. Stop after limit results if limit is
+    not None. The progression is not changed.
+
+    Example:
+    >>> list(iter_substitutions(['I', 'IV', 'V', 'I'], 0, 1, 7))
+    ['III', 'III7', 'VI', 'VI7', 'I7', 'IV', 'IV7']
+    """
+    seen = set([parse_string(progression[substitute_index])])
+    level = [progression[substitute_index]]
+    count = 0
+    d = 0
+    while level and (depth is None or d <= depth):
+        next_level = []
+        for chord in level:
+            for x in _substitutions(chord):
+                key = parse_string(x)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if limit is not None and count >= limit:
+                    return
+                yield x
+                count += 1
+                next_level.append(x)
+        level = next_level
+        d += 1
+
+
+def _substitutions(chord):
+    """Return the direct substitutions for chord as a tuple."""
+    res = _substitutions_cache.get(chord)
+    if res is not None:
+        return res
     res = []
     simple_substitutions = [
         ("I", "III"),
@@ -415,8 +549,7 @@ def substitute(progression, substitute_index, depth=0):
         ("V", "IVdim7"),
         ("V", "bVIIdim7"),
     ]
-    p = progression[substitute_index]
-    (roman, acc, suff) = parse_string(p)
+    (roman, acc, suff) = parse_string(chord)
 
     # Do the simple harmonic substitutions
     if suff == "" or suff == "7":
@@ -465,13 +598,9 @@ def substitute(progression, substitute_index, depth=0):
             acc += interval_diff(last, next, 3)
             res.append(tuple_to_string((next, acc, suff)))
             last = next
-    res2 = []
-    if depth > 0:
-        for x in res:
-            new_progr = progression
-            new_progr[substitute_index] = x
-            res2 += substitute(new_progr, substitute_index, depth - 1)
-    return res + res2
+    res = tuple(res)
+    _substitutions_cache.put(chord, res)
+    return res
 
 
 def interval_diff(progression1, progression2, interval):
@@ -49,16 +49,52 @@ Other scales
  * Chromatic(note)
  * WholeTone(note)
  * Octatonic(note)
+
+Custom scales
+ * Scale(note, formula)
 """
 from __future__ import absolute_import
 
-from mingus.core import intervals
-from mingus.core.notes import augment, diminish, reduce_accidentals
-from mingus.core.keys import keys, get_notes
+from mingus.core import cache, intervals
+from mingus.core.notes import augment, diminish, reduce_accidentals, note_to_int, is_valid_note
+from mingus.core.keys import keys, get_notes, is_valid_key
 from mingus.core.mt_exceptions import NoteFormatError, FormatError, RangeError
 from six.moves import range
 
 
+# The notes of the scales, by (formula, tonic, octaves)
+_scale_cache = cache.LRUCache("scales.notes")
+
+# (name, ascending mask, descending mask, ascending notes, descending notes)
+# for every scale determine recognizes. Built the first time it's needed.
+_determine_index = []
+
+
+def _pitch_class_mask(notes):
+    """Return an integer with bit n set for every note in notes with pitch
+    class n."""
+    mask = 0
+    for note in notes:
+        mask |= 1 << note_to_int(note)
+    return mask
+
+
+def _build_determine_index():
+    for key in keys:
+        for scale in _Scale.__subclasses__():
+            if scale.type == "major":
+                s = scale(key[0])
+            elif scale.type == "minor":
+                s = scale(get_notes(key[1])[0])
+            else:
+                continue
+            asc = frozenset(s.ascending())
+            desc = frozenset(s.descending())
+            _determine_index.append(
+                (s.name, _pitch_class_mask(asc), _pitch_class_mask(desc), asc, desc)
+            )
+
+
 def determine(notes):
     """Determine the scales containing the notes.
 
@@ -69,30 +105,94 @@ def determine(notes):
     ['G melodic minor', 'G Bachian', 'D harmonic major']
     """
     notes = set(notes)
+    if not _determine_index:
+        _build_determine_index()
+    try:
+        mask = _pitch_class_mask(notes)
+    except (NoteFormatError, TypeError, IndexError):
+        return []
+
+    # Compare the pitch classes first, then the spelling
     res = []
+    for (name, asc_mask, desc_mask, asc, desc) in _determine_index:
+        if (not mask & ~asc_mask and notes <= asc) or (not mask & ~desc_mask and notes <= desc):
+            res.append(name)
+    return res
 
-    for key in keys:
-        for scale in _Scale.__subclasses__():
-            if scale.type == "major":
-                if notes <= set(scale(key[0]).ascending()) or notes <= set(
-                    scale(key[0]).descending()
-                ):
-                    res.append(scale(key[0]).name)
-            elif scale.type == "minor":
-                if notes <= set(scale(get_notes(key[1])[0]).ascending()) or notes <= set(
-                    scale(get_notes(key[1])[0]).descending()
-                ):
-                    res.append(scale(get_notes(key[1])[0]).name)
+
+def best_fit(notes, count=5):
+    """Rank the scales determine recognizes by how well they fit the notes,
+    ignoring the spelling.
+
+    Return a list of at most count (name, score) tuples, best first. The
+    score is the part of the notes (counting repeated notes) that is in the
+    scale. Scales that fit equally well are in the order determine uses.
+
+    Example:
+    >>> best_fit(['C', 'D', 'E', 'F', 'F#', 'G', 'A', 'B'], 3)
+    [('C major', 0.875), ('A natural minor', 0.875), ('A melodic minor', 0.875)]
+    """
+    if not _determine_index:
+        _build_determine_index()
+    weights = [0] * 12
+    for note in notes:
+        weights[note_to_int(note)] += 1
+    total = float(sum(weights))
+    if not total:
+        return []
+    res = []
+    for (name, asc_mask, desc_mask, asc, desc) in _determine_index:
+        score = 0
+        for mask in (asc_mask, desc_mask):
+            score = max(score, sum(w for (n, w) in enumerate(weights) if mask >> n & 1))
+        res.append((name, score / total))
+    res.sort(key=lambda x: -x[1])
+    return res[:count]
+
+
+def _formula_notes(tonic, formula, octaves):
+    """Return the notes of the scale built from formula on tonic, repeated
+    for the number of octaves and closed with the tonic, as a tuple."""
+    cache_key = (formula, tonic, octaves)
+    res = _scale_cache.get(cache_key)
+    if res is None:
+        if not is_valid_note(tonic):
+            raise NoteFormatError("Unrecognised note '%s'" % tonic)
+        notes = [intervals.from_shorthand(tonic, step) for step in formula]
+        res = tuple(notes * octaves + [notes[0]])
+        _scale_cache.put(cache_key, res)
     return res
 
 
+def _diatonic_formula(semitones):
+    """Return the formula of the diatonic scale with semitones between the
+    notes on the positions in semitones (1-7)."""
+    res = ["1"]
+    half_notes = 0
+    for n in range(1, 7):
+        half_notes += 1 if n in semitones else 2
+        diff = half_notes - [0, 2, 4, 5, 7, 9, 11][n]
+        res.append(("#" * diff if diff > 0 else "b" * -diff) + str(n + 1))
+    return tuple(res)
+
+
 class _Scale(object):
 
     """General class implementing general methods.
 
     Not to be used by the final user.
+
+    Scales that set formula get their notes from it: a tuple with the
+    intervals from the tonic to every note of the scale, in the shorthand
+    intervals.from_shorthand understands. Set descending_formula if the
+    scale goes down differently, and mode to 'major' or 'minor' if the
+    tonic has to be the tonic of a valid key.
     """
 
+    formula = None
+    descending_formula = None
+    mode = None
+
     def __init__(self, note, octaves):
         if note.islower():
             raise NoteFormatError("Unrecognised note '%s'" % note)
@@ -118,14 +218,28 @@ class _Scale(object):
         return not self.__eq__(other)
 
     def __len__(self):
+        if self.formula is not None:
+            return len(self._notes(self.formula))
         return len(self.ascending())
 
+    def _notes(self, formula):
+        """Return the cached notes of formula on the tonic."""
+        if self.mode is not None:
+            key = self.tonic if self.mode == "major" else self.tonic.lower()
+            if not is_valid_key(key):
+                raise NoteFormatError("unrecognized format for key '%s'" % key)
+        return _formula_notes(self.tonic, formula, self.octaves)
+
     def ascending(self):
         """Return the list of ascending notes."""
-        raise NotImplementedError
+        if self.formula is None:
+            raise NotImplementedError
+        return list(self._notes(self.formula))
 
     def descending(self):
         """Return the list of descending notes."""
+        if self.descending_formula is not None:
+            return list(reversed(self._notes(self.descending_formula)))
         return list(reversed(self.ascending()))
 
     def degree(self, degree_number, direction="a"):
@@ -137,15 +251,49 @@ class _Scale(object):
         if degree_number < 1:
             raise RangeError("degree '%s' out of range" % degree_number)
         if direction == "a":
-            notes = self.ascending()[:-1]
-            return notes[degree_number - 1]
+            if self.formula is not None:
+                notes = self._notes(self.formula)
+            else:
+                notes = self.ascending()
+            return notes[:-1][degree_number - 1]
         elif direction == "d":
-            notes = list(reversed(self.descending())[:-1])
+            notes = list(reversed(self.descending()))[:-1]
             return notes[degree_number - 1]
         else:
             raise FormatError("Unrecognised direction '%s'" % direction)
 
 
+class Scale(_Scale):
+
+    """A scale built from a formula, for scales that don't have a class of
+    their own.
+
+    The formula lists the intervals from the tonic to the notes of the
+    scale in shorthand ('1', 'b3', '#4', etc.).
+
+    Example:
+    >>> print(Scale('C', ('1', '2', 'b3', '#4', '5', '6', 'b7'), name='C dorian #4'))
+    Ascending:  C D Eb F# G A Bb C
+    Descending: C Bb A G F# Eb D C
+    """
+
+    type = "custom"
+
+    def __init__(self, note, formula, octaves=1, descending_formula=None, name=None):
+        """Create the scale with the formula starting on the chosen note.
+
+        The descending_formula can be used for scales that go down
+        differently, like the melodic minor.
+        """
+        super(Scale, self).__init__(note, octaves)
+        self.formula = tuple(formula)
+        if descending_formula is not None:
+            self.descending_formula = tuple(descending_formula)
+        if name is None:
+            name = "{0} scale {1}".format(self.tonic, " ".join(self.formula))
+        self.name = name
+
+
 # The diatonic scales
 
 
@@ -170,15 +318,7 @@ class Diatonic(_Scale):
         super(Diatonic, self).__init__(note, octaves)
         self.semitones = semitones
         self.name = "{0} diatonic, semitones in {1}".format(self.tonic, self.semitones)
-
-    def ascending(self):
-        notes = [self.tonic]
-        for n in range(1, 7):
-            if n in self.semitones:
-                notes.append(intervals.minor_second(notes[-1]))
-            else:
-                notes.append(intervals.major_second(notes[-1]))
-        return notes * self.octaves + [notes[0]]
+        self.formula = _diatonic_formula(semitones)
 
 
 # Ancient scales
@@ -195,16 +335,13 @@ class Ionian(_Scale):
     """
 
     type = "ancient"
+    formula = _diatonic_formula((3, 7))
 
     def __init__(self, note, octaves=1):
         """Create the ionian mode scale starting on the chosen note."""
         super(Ionian, self).__init__(note, octaves)
         self.name = "{0} ionian".format(self.tonic)
 
-    def ascending(self):
-        notes = Diatonic(self.tonic, (3, 7)).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class Dorian(_Scale):
 
@@ -217,16 +354,13 @@ class Dorian(_Scale):
     """
 
     type = "ancient"
+    formula = _diatonic_formula((2, 6))
 
     def __init__(self, note, octaves=1):
         """Create the dorian mode scale starting on the chosen note."""
         super(Dorian, self).__init__(note, octaves)
         self.name = "{0} dorian".format(self.tonic)
 
-    def ascending(self):
-        notes = Diatonic(self.tonic, (2, 6)).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class Phrygian(_Scale):
 
@@ -239,16 +373,13 @@ class Phrygian(_Scale):
     """
 
     type = "ancient"
+    formula = _diatonic_formula((1, 5))
 
     def __init__(self, note, octaves=1):
         """Create the phrygian mode scale starting on the chosen note."""
         super(Phrygian, self).__init__(note, octaves)
         self.name = "{0} phrygian".format(self.tonic)
 
-    def ascending(self):
-        notes = Diatonic(self.tonic, (1, 5)).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class Lydian(_Scale):
 
@@ -261,16 +392,13 @@ class Lydian(_Scale):
     """
 
     type = "ancient"
+    formula = _diatonic_formula((4, 7))
 
     def __init__(self, note, octaves=1):
         """Create the lydian mode scale starting on the chosen note."""
         super(Lydian, self).__init__(note, octaves)
         self.name = "{0} lydian".format(self.tonic)
 
-    def ascending(self):
-        notes = Diatonic(self.tonic, (4, 7)).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class Mixolydian(_Scale):
 
@@ -283,16 +411,13 @@ class Mixolydian(_Scale):
     """
 
     type = "ancient"
+    formula = _diatonic_formula((3, 6))
 
     def __init__(self, note, octaves=1):
         """Create the mixolydian mode scale starting on the chosen note."""
         super(Mixolydian, self).__init__(note, octaves)
         self.name = "{0} mixolydian".format(self.tonic)
 
-    def ascending(self):
-        notes = Diatonic(self.tonic, (3, 6)).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class Aeolian(_Scale):
 
@@ -305,16 +430,13 @@ class Aeolian(_Scale):
     """
 
     type = "ancient"
+    formula = _diatonic_formula((2, 5))
 
     def __init__(self, note, octaves=1):
         """Create the aeolian mode scale starting on the chosen note."""
         super(Aeolian, self).__init__(note, octaves)
         self.name = "{0} aeolian".format(self.tonic)
 
-    def ascending(self):
-        notes = Diatonic(self.tonic, (2, 5)).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class Locrian(_Scale):
 
@@ -327,16 +449,13 @@ class Locrian(_Scale):
     """
 
     type = "ancient"
+    formula = _diatonic_formula((1, 4))
 
     def __init__(self, note, octaves=1):
         """Create the locrian mode scale starting on the chosen note."""
         super(Locrian, self).__init__(note, octaves)
         self.name = "{0} locrian".format(self.tonic)
 
-    def ascending(self):
-        notes = Diatonic(self.tonic, (1, 4)).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 # The major scales
 
@@ -352,16 +471,14 @@ class Major(_Scale):
     """
 
     type = "major"
+    formula = ("1", "2", "3", "4", "5", "6", "7")
+    mode = "major"
 
     def __init__(self, note, octaves=1):
         """Create the major scale starting on the chosen note."""
         super(Major, self).__init__(note, octaves)
         self.name = "{0} major".format(self.tonic)
 
-    def ascending(self):
-        notes = get_notes(self.tonic)
-        return notes * self.octaves + [notes[0]]
-
 
 class HarmonicMajor(_Scale):
 
@@ -374,17 +491,14 @@ class HarmonicMajor(_Scale):
     """
 
     type = "major"
+    formula = ("1", "2", "3", "4", "5", "b6", "7")
+    mode = "major"
 
     def __init__(self, note, octaves=1):
         """Create the harmonic major scale starting on the chosen note."""
         super(HarmonicMajor, self).__init__(note, octaves)
         self.name = "{0} harmonic major".format(self.tonic)
 
-    def ascending(self):
-        notes = Major(self.tonic).ascending()[:-1]
-        notes[5] = diminish(notes[5])
-        return notes * self.octaves + [notes[0]]
-
 
 # The minor scales
 
@@ -400,16 +514,14 @@ class NaturalMinor(_Scale):
     """
 
     type = "minor"
+    formula = ("1", "2", "b3", "4", "5", "b6", "b7")
+    mode = "minor"
 
     def __init__(self, note, octaves=1):
         """Return the natural minor scale starting on the chosen note."""
         super(NaturalMinor, self).__init__(note, octaves)
         self.name = "{0} natural minor".format(self.tonic)
 
-    def ascending(self):
-        notes = get_notes(self.tonic.lower())
-        return notes * self.octaves + [notes[0]]
-
 
 class HarmonicMinor(_Scale):
 
@@ -422,17 +534,14 @@ class HarmonicMinor(_Scale):
     """
 
     type = "minor"
+    formula = ("1", "2", "b3", "4", "5", "b6", "7")
+    mode = "minor"
 
     def __init__(self, note, octaves=1):
         """Create the harmonic minor scale starting on the chosen note."""
         super(HarmonicMinor, self).__init__(note, octaves)
         self.name = "{0} harmonic minor".format(self.tonic)
 
-    def ascending(self):
-        notes = NaturalMinor(self.tonic).ascending()[:-1]
-        notes[6] = augment(notes[6])
-        return notes * self.octaves + [notes[0]]
-
 
 class MelodicMinor(_Scale):
 
@@ -445,22 +554,15 @@ class MelodicMinor(_Scale):
     """
 
     type = "minor"
+    formula = ("1", "2", "b3", "4", "5", "6", "7")
+    descending_formula = NaturalMinor.formula
+    mode = "minor"
 
     def __init__(self, note, octaves=1):
         """Create the melodic minor scale starting on the chosen note."""
         super(MelodicMinor, self).__init__(note, octaves)
         self.name = "{0} melodic minor".format(self.tonic)
 
-    def ascending(self):
-        notes = NaturalMinor(self.tonic).ascending()[:-1]
-        notes[5] = augment(notes[5])
-        notes[6] = augment(notes[6])
-        return notes * self.octaves + [notes[0]]
-
-    def descending(self):
-        notes = NaturalMinor(self.tonic).descending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class Bachian(_Scale):
 
@@ -473,6 +575,8 @@ class Bachian(_Scale):
     """
 
     type = "minor"
+    formula = ("1", "2", "b3", "4", "5", "6", "7")
+    mode = "minor"
 
     def __init__(self, note, octaves=1):
         """Create the Bachian (also known as "real melodic minor" and "jazz")
@@ -480,10 +584,6 @@ class Bachian(_Scale):
         super(Bachian, self).__init__(note, octaves)
         self.name = "{0} Bachian".format(self.tonic)
 
-    def ascending(self):
-        notes = MelodicMinor(self.tonic).ascending()[:-1]
-        return notes * self.octaves + [notes[0]]
-
 
 class MinorNeapolitan(_Scale):
 
@@ -496,22 +596,15 @@ class MinorNeapolitan(_Scale):
     """
 
     type = "minor"
+    formula = ("1", "b2", "b3", "4", "5", "b6", "7")
+    descending_formula = ("1", "b2", "b3", "4", "5", "b6", "b7")
+    mode = "minor"
 
     def __init__(self, note, octaves=1):
         """Create the minor Neapolitan scale starting on the chosen note."""
         super(MinorNeapolitan, self).__init__(note, octaves)
         self.name = "{0} minor Neapolitan".format(self.tonic)
 
-    def ascending(self):
-        notes = HarmonicMinor(self.tonic).ascending()[:-1]
-        notes[1] = diminish(notes[1])
-        return notes * self.octaves + [notes[0]]
-
-    def descending(self):
-        notes = NaturalMinor(self.tonic).descending()[:-1]
-        notes[6] = diminish(notes[6])
-        return notes * self.octaves + [notes[0]]
-
 
 # Other scales
 
@@ -539,26 +632,35 @@ class Chromatic(_Scale):
         self.name = "{0} chromatic".format(self.tonic)
 
     def ascending(self):
-        notes = [self.tonic]
-        for note in get_notes(self.key)[1:] + [self.tonic]:
-            if intervals.determine(notes[-1], note) == ("major second"):
-                notes.append(augment(notes[-1]))
-                notes.append(note)
-            else:
-                notes.append(note)
-        notes.pop()
-        return notes * self.octaves + [notes[0]]
+        return list(self._chromatic(True))
 
     def descending(self):
+        return list(self._chromatic(False))
+
+    def _chromatic(self, up):
+        cache_key = ("chromatic", up, self.key, self.octaves)
+        res = _scale_cache.get(cache_key)
+        if res is not None:
+            return res
         notes = [self.tonic]
-        for note in reversed(get_notes(self.key)):
-            if intervals.determine(note, notes[-1]) == ("major second"):
-                notes.append(reduce_accidentals(diminish(notes[-1])))
-                notes.append(note)
-            else:
-                notes.append(note)
+        if up:
+            for note in get_notes(self.key)[1:] + [self.tonic]:
+                if intervals.determine(notes[-1], note) == ("major second"):
+                    notes.append(augment(notes[-1]))
+                    notes.append(note)
+                else:
+                    notes.append(note)
+        else:
+            for note in reversed(get_notes(self.key)):
+                if intervals.determine(note, notes[-1]) == ("major second"):
+                    notes.append(reduce_accidentals(diminish(notes[-1])))
+                    notes.append(note)
+                else:
+                    notes.append(note)
         notes.pop()
-        return notes * self.octaves + [notes[0]]
+        res = tuple(notes * self.octaves + [notes[0]])
+        _scale_cache.put(cache_key, res)
+        return res
 
 
 class WholeTone(_Scale):
@@ -572,18 +674,13 @@ class WholeTone(_Scale):
     """
 
     type = "other"
+    formula = ("1", "2", "3", "#4", "#5", "#6")
 
     def __init__(self, note, octaves=1):
         """Create the whole tone scale starting on the chosen note."""
         super(WholeTone, self).__init__(note, octaves)
         self.name = "{0} whole tone".format(self.tonic)
 
-    def ascending(self):
-        notes = [self.tonic]
-        for note in range(5):
-            notes.append(intervals.major_second(notes[-1]))
-        return notes * self.octaves + [notes[0]]
-
 
 class Octatonic(_Scale):
 
@@ -596,17 +693,10 @@ class Octatonic(_Scale):
     """
 
     type = "other"
+    formula = ("1", "2", "b3", "4", "b5", "b6", "6", "7")
 
     def __init__(self, note, octaves=1):
         """Create the octatonic (also known as "diminished") scale starting
         on the chosen note."""
         super(Octatonic, self).__init__(note, octaves)
         self.name = "{0} octatonic".format(self.tonic)
-
-    def ascending(self):
-        notes = [self.tonic]
-        for i in range(3):
-            notes.extend([intervals.major_second(notes[-1]), intervals.minor_third(notes[-1])])
-        notes.append(intervals.major_seventh(notes[0]))
-        notes[-2] = intervals.major_sixth(notes[0])
-        return notes * self.octaves + [notes[0]]
@@ -33,8 +33,17 @@ As you can see these calculations can be quite tiresome and can clutter
 up your code. This module is here to help do the conversion.
 
 Medieval backwards compatibility privided.
+
+Floating point note values can't represent most tuplets and dotted notes
+exactly, so adding up their lengths slowly drifts. Where that matters, note
+values can be given as Fractions instead (see to_fraction and length),
+which keeps the arithmetic exact.
 """
 from __future__ import absolute_import, division
+
+from fractions import Fraction
+
+import six
 from six.moves import range
 
 longa = 0.25
@@ -122,13 +131,51 @@ base_septuplets = [
 ]
 
 
+# The largest denominator to_fraction looks for in floating point values
+MAX_DENOMINATOR = 1000000
+
+
+def to_fraction(value):
+    """Return the note value as a Fraction.
+
+    Floating point values are converted to the nearest fraction with a
+    denominator of at most MAX_DENOMINATOR, which recovers the exact value
+    of dotted notes and tuplets.
+
+    Example:
+    >>> to_fraction(dots(eighth))
+    Fraction(16, 3)
+    """
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, six.integer_types):
+        return Fraction(value)
+    return Fraction(value).limit_denominator(MAX_DENOMINATOR)
+
+
+def length(value):
+    """Return the exact length of a note value in whole notes.
+
+    Example:
+    >>> length(triplet(eighth))
+    Fraction(1, 12)
+    """
+    return 1 / to_fraction(value)
+
+
 def add(value1, value2):
     """Return the value of the two combined.
 
-    Example:
+    The result is an exact Fraction if one of the values is a Fraction.
+
+    Examples:
     >>> add(eighth, quarter)
     2.6666666666666665
+    >>> add(Fraction(eighth), quarter)
+    Fraction(8, 3)
     """
+    if isinstance(value1, Fraction) or isinstance(value2, Fraction):
+        return 1 / (length(value1) + length(value2))
     return 1 / (1.0 / value1 + 1.0 / value2)
 
 
@@ -136,12 +183,15 @@ def subtract(value1, value2):
     """Return the note value for value1 minus value2.
 
     There are no exceptions for producing negative values, which can be
-    useful for taking differences.
+    useful for taking differences. The result is an exact Fraction if one
+    of the values is a Fraction.
 
     Example:
     >>> subtract(quarter, eighth)
     8.0
     """
+    if isinstance(value1, Fraction) or isinstance(value2, Fraction):
+        return 1 / (length(value1) - length(value2))
     return 1 / (1.0 / value1 - 1.0 / value2)
 
 
@@ -249,8 +299,18 @@ def determine(value):
     (8, 0, 7, 4)
 
     This function recognizes all the base values, triplets, quintuplets,
-    septuplets and up to four dots. The values are matched on range.
+    septuplets and up to four dots. They are looked up in a table, exact
+    values and Fractions first; other values are matched on range.
     """
+    if value in _base_values:
+        return (value, 0, 1, 1)
+    try:
+        return _value_table[value]
+    except (KeyError, TypeError):
+        pass
+    res = _value_table.get(to_fraction(value))
+    if res is not None:
+        return res
     i = -2
     for v in base_values:
         if value == v:
@@ -258,7 +318,7 @@ def determine(value):
         if value < v:
             break
         i += 1
-    scaled = float(value) / 2 ** i
+    scaled = float(value) / 2**i
     if scaled >= 0.9375:  # base value
         return (base_values[i], 0, 1, 1)
     elif scaled >= 0.8125:
@@ -275,7 +335,29 @@ def determine(value):
         return (base_values[i + 1], 0, 5, 4)
     d = 3
     for x in range(2, 5):
-        d += 2 ** x
-        if scaled == 2.0 ** x / d:
+        d += 2**x
+        if scaled == 2.0**x / d:
             return (v, x, 1, 1)
     return (base_values[i + 1], 0, 1, 1)
+
+
+def _fill_value_table():
+    """Fill the determine table with every base value with up to four dots
+    and as a triplet, quintuplet and septuplet, by their exact values and
+    as floats."""
+    for base in base_values:
+        exact = to_fraction(base)
+        values = [(exact * 2**n / (2 ** (n + 1) - 1), (base, n, 1, 1)) for n in range(1, 5)]
+        values += [(exact * r1 / r2, (base, 0, r1, r2)) for (r1, r2) in [(3, 2), (5, 4), (7, 4)]]
+        for (v, res) in values:
+            # The floats go in first, so looking up a float or int compares
+            # it to a float key even when the value is exact
+            _value_table[float(v)] = res
+            _value_table[v] = res
+
+
+_base_values = frozenset(base_values)
+
+# The result of determine, by value
+_value_table = {}
+_fill_value_table()
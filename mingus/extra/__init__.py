@@ -21,4 +21,12 @@ from __future__ import absolute_import
 from mingus.extra import lilypond
 from mingus.extra.tunings import StringTuning
 
-__all__ = ["lilypond", "fft", "musicxml", "tunings", "tablature", "StringTuning"]
+__all__ = [
+    "lilypond",
+    "fft",
+    "musicxml",
+    "tunings",
+    "tablature",
+    "key_detection",
+    "StringTuning",
+]
@@ -28,7 +28,7 @@ import wave
 import struct
 import numpy
 from mingus.containers.note import Note
-from numpy.fft import fft as _fft
+from numpy.fft import fft as _fft, rfft as _rfft
 import operator
 from six.moves import range
 from six.moves import zip
@@ -44,6 +44,10 @@ _log_cache = []
 for x in range(129):
     _log_cache.append(Note().from_int(x).to_hertz())
 _last_asked = None
+_log_array = numpy.array(_log_cache[:128])
+
+# The note index of every bin, by (chunksize, freq, maxNote)
+_bin_cache = {}
 
 
 def _find_log_index(f):
@@ -140,12 +144,7 @@ def data_from_file(file):
     data = struct.unpack(("%sh" % fp.getnframes()) * channels, data)
 
     # Only use first channel
-    channel1 = []
-    n = 0
-    for d in data:
-        if n % channels == 0:
-            channel1.append(d)
-        n += 1
+    channel1 = list(data[::channels])
     fp.close()
     return (channel1, freq, bits)
 
@@ -162,12 +161,69 @@ def analyze_chunks(data, freq, bits, chunksize=512):
 
     Making the chunksize a power of two works fastest.
     """
-    res = []
-    while data != []:
-        f = find_frequencies(data[:chunksize], freq, bits)
-        res.append(sorted(find_notes(f), key=operator.itemgetter(1))[-1][0])
-        data = data[chunksize:]
-    return res
+    (found, amplitudes) = analyze_frames(data, freq, bits, chunksize)
+    return [Note().from_int(x) if x >= 0 else None for x in found.tolist()]
+
+
+def _bin_notes(chunksize, freq, maxNote):
+    """Return the note index of every positive frequency bin of a chunk.
+
+    Bins with a frequency of 0 are left out; bins that don't fall below
+    maxNote get index 128, like in find_notes.
+    """
+    key = (chunksize, freq, maxNote)
+    if key not in _bin_cache:
+        freqs = numpy.arange(1, chunksize // 2 + 1) * (freq / float(chunksize))
+        res = numpy.searchsorted(_log_array, freqs, "left")
+        res[res >= maxNote] = 128
+        _bin_cache[key] = res
+    return _bin_cache[key]
+
+
+def _dominant_notes(frames, freq, maxNote):
+    """Return the dominant note index and its amplitude for every row of
+    frames, a 2D array of samples."""
+    (count, n) = frames.shape
+    p = numpy.abs(_rfft(frames, axis=1)) / float(n)
+    p = p * p * 2
+    if n % 2 == 0:
+        p[:, -1] /= 2
+    bins = _bin_notes(n, freq, maxNote)
+    if len(bins) == 0:
+        return (numpy.full(count, 128), numpy.zeros(count))
+
+    # The bins are sorted by note, so the amplitudes of every note can be
+    # summed with reduceat over the runs of equal indices
+    (found, starts) = numpy.unique(bins, return_index=True)
+    res = numpy.zeros((count, 129))
+    res[:, found] = numpy.add.reduceat(p[:, 1:], starts, axis=1)
+
+    # Like sorted(...)[-1] in find_Note, the highest note wins a tie
+    best = 128 - numpy.argmax(res[:, ::-1], axis=1)
+    return (best, res[numpy.arange(count), best])
+
+
+def analyze_frames(data, freq, bits=16, chunksize=512, maxNote=100):
+    """Cut the one channel data in chunks of chunksize samples and find the
+    dominant note in every chunk with one batched FFT.
+
+    Return two NumPy arrays: the integer value of the dominant note in
+    every chunk (see Note.from_int) and its amplitude. Chunks in which no
+    note below maxNote is found get -1.
+
+    This gives the same notes as analyze_chunks, but a lot faster.
+    """
+    data = numpy.asarray(data, dtype=float)
+    full = len(data) // chunksize
+    # A view on the data, without copying
+    frames = data[: full * chunksize].reshape(full, chunksize)
+    (found, amplitudes) = _dominant_notes(frames, freq, maxNote)
+    if len(data) % chunksize:
+        (last, last_amplitude) = _dominant_notes(data[full * chunksize :][None, :], freq, maxNote)
+        found = numpy.concatenate((found, last))
+        amplitudes = numpy.concatenate((amplitudes, last_amplitude))
+    found[found == 128] = -1
+    return (found, amplitudes)
 
 
 def find_melody(file="440_480_clean.wav", chunksize=512):
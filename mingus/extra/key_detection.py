@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, key_detection module.
+#    Copyright (C) 2008-2009, Bart Spaans
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Estimate the key of Tracks and Compositions.
+
+The notes are counted in a pitch class histogram, weighted by their
+duration, which is then correlated with a key profile (the typical weight
+of the twelve pitch classes in a major and a minor key) rotated to every
+tonic. The key with the highest correlation wins.
+
+The key of a whole piece is found with determine_key; sliding_keys finds
+the key around every bar, which can be used to set Bar.key (see set_keys)
+or passed to progressions.determine.
+
+Keys are named like in mingus.core.keys: 'C' for C major and 'a' for A
+minor.
+"""
+from __future__ import absolute_import
+
+from mingus.containers.bar import Bar
+from mingus.containers.composition import Composition
+from mingus.containers.note_table import NoteTable
+from mingus.containers.track import Track
+from mingus.core import keys, notes
+from six.moves import range
+
+# The Krumhansl-Kessler profiles for major and minor keys
+KRUMHANSL_KESSLER = (
+    (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88),
+    (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17),
+)
+
+# Temperley's profiles for major and minor keys
+TEMPERLEY = (
+    (5.0, 2.0, 3.5, 2.0, 4.5, 4.0, 2.0, 4.5, 2.0, 3.5, 1.5, 4.0),
+    (5.0, 2.0, 3.5, 4.5, 2.0, 4.0, 2.0, 4.5, 3.5, 2.0, 1.5, 4.0),
+)
+
+
+def _key_names():
+    """Return the names of the major and minor keys on every pitch class,
+    preferring the spelling with the fewest accidentals."""
+    names = ([None] * 12, [None] * 12)
+    by_accidentals = sorted(range(len(keys.keys)), key=lambda i: (abs(i - 7), -i))
+    for i in by_accidentals:
+        for mode in (0, 1):
+            key = keys.keys[i][mode]
+            pc = notes.note_to_int(key[0].upper() + key[1:])
+            if names[mode][pc] is None:
+                names[mode][pc] = key
+    return names
+
+
+_names = _key_names()
+
+# The centered key profiles rotated to every tonic and their norms, by
+# profile
+_profile_cache = {}
+
+
+def _rotated_profiles(profile):
+    if profile in _profile_cache:
+        return _profile_cache[profile]
+    res = []
+    for mode in (0, 1):
+        mean = sum(profile[mode]) / 12.0
+        centered = [p - mean for p in profile[mode]]
+        norm = sum(p * p for p in centered) ** 0.5
+        for tonic in range(12):
+            rotated = tuple(centered[(pc - tonic) % 12] for pc in range(12))
+            res.append((_names[mode][tonic], rotated, norm))
+    _profile_cache[profile] = res
+    return res
+
+
+def _to_table(music):
+    if isinstance(music, NoteTable):
+        return music
+    if isinstance(music, Composition):
+        return NoteTable.from_composition(music)
+    if isinstance(music, Bar):
+        t = Track()
+        t.add_bar(music)
+        music = t
+    return NoteTable.from_track(music)
+
+
+def bar_histograms(music):
+    """Return the duration weighted pitch class histogram of every bar in
+    music, which can be a Bar, Track, Composition or NoteTable.
+
+    The bars of the tracks in a Composition are added up by their position
+    in the track. A quarter note weighs 0.25, a whole note 1.0.
+
+    Example:
+    >>> t = Track()
+    >>> t.add_notes(['C', 'E'], 2)
+    True
+    >>> t.add_notes('G', 2)
+    True
+    >>> bar_histograms(t)
+    [[0.5, 0.0, 0.0, 0.0, 0.5, 0.0, 0.0, 0.5, 0.0, 0.0, 0.0, 0.0]]
+    """
+    table = _to_table(music)
+    starts = list(table.track_bars) + [len(table.bar_keys)]
+    n = max([starts[i + 1] - starts[i] for i in range(len(starts) - 1)] or [0])
+    bars = [[0.0] * 12 for i in range(n)]
+    for (bar, pitch, duration, name, track) in zip(
+        table.bar, table.pitch, table.duration, table.name, table.track
+    ):
+        if name >= 0:
+            bars[bar - starts[track]][pitch % 12] += 1.0 / duration
+    return bars
+
+
+def pitch_class_histogram(music):
+    """Return the duration weighted pitch class histogram of all the notes
+    in music (a Bar, Track, Composition or NoteTable)."""
+    res = [0.0] * 12
+    for h in bar_histograms(music):
+        for pc in range(12):
+            res[pc] += h[pc]
+    return res
+
+
+def key_correlations(histogram, profile=KRUMHANSL_KESSLER):
+    """Return the 24 keys with the correlation between histogram and their
+    key profile, the best fitting key first.
+
+    Return an empty list if all the pitch classes weigh the same (for
+    instance when there are no notes at all).
+
+    Example:
+    >>> key_correlations([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1])[0][0]
+    'C'
+    """
+    mean = sum(histogram) / 12.0
+    centered = [h - mean for h in histogram]
+    norm = sum(h * h for h in centered) ** 0.5
+    if norm == 0:
+        return []
+    res = []
+    for (key, rotated, profile_norm) in _rotated_profiles(profile):
+        r = sum(h * p for (h, p) in zip(centered, rotated)) / (norm * profile_norm)
+        res.append((key, r))
+    res.sort(key=lambda x: -x[1])
+    return res
+
+
+def determine_key(music, profile=KRUMHANSL_KESSLER):
+    """Return the most likely key of music (a Bar, Track, Composition or
+    NoteTable), or None if it has no notes.
+
+    Example:
+    >>> t = Track()
+    >>> for n in ['A', 'B', 'C', 'D', 'E', 'F', 'G#', 'A']:
+    ...     t.add_notes(n, 4) and None
+    >>> t.add_notes(['A', 'C', 'E'], 1)
+    True
+    >>> determine_key(t)
+    'a'
+    """
+    res = key_correlations(pitch_class_histogram(music), profile)
+    if not res:
+        return None
+    return res[0][0]
+
+
+def sliding_keys(music, window=4, profile=KRUMHANSL_KESSLER):
+    """Return the most likely key around every bar of music (a Bar, Track,
+    Composition or NoteTable).
+
+    The key of a bar is determined from the notes in the window bars
+    around it (cut off at the start and end of the piece). The histogram
+    of the window is kept up to date by adding the bar that comes into the
+    window and subtracting the one that leaves it, so every bar is only
+    counted twice. Bars with no notes in their window get None.
+    """
+    bars = bar_histograms(music)
+    before = (window - 1) // 2
+    histogram = [0.0] * 12
+    (lo, hi) = (0, 0)
+    res = []
+    for i in range(len(bars)):
+        while hi < min(len(bars), i - before + window):
+            for pc in range(12):
+                histogram[pc] += bars[hi][pc]
+            hi += 1
+        while lo < i - before:
+            for pc in range(12):
+                histogram[pc] -= bars[lo][pc]
+                # Don't let rounding errors make up notes that aren't there
+                if histogram[pc] < 1e-9:
+                    histogram[pc] = 0.0
+            lo += 1
+        correlations = key_correlations(histogram, profile)
+        res.append(correlations[0][0] if correlations else None)
+    return res
+
+
+def set_keys(music, window=4, profile=KRUMHANSL_KESSLER):
+    """Set the key of every bar in music (a Track or Composition) to the
+    key found by sliding_keys and return the keys.
+
+    Bars without notes around them keep their key.
+    """
+    found = sliding_keys(music, window, profile)
+    tracks = music.tracks if isinstance(music, Composition) else [music]
+    for t in tracks:
+        for (b, key) in zip(t.bars, found):
+            if key is not None:
+                b.key = keys.Key(key)
+    return found
@@ -21,8 +21,13 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 import binascii
+import multiprocessing
+import os
+from collections import namedtuple
+from fractions import Fraction
+from struct import unpack_from
 
-from six import binary_type
+from six import binary_type, string_types
 from six.moves import range
 
 import mingus.core.intervals as intervals
@@ -33,19 +38,43 @@ from mingus.containers.instrument import MidiInstrument
 from mingus.containers.note import Note
 from mingus.containers.note_container import NoteContainer
 from mingus.containers.track import Track
-from mingus.core.keys import Key
+from mingus.core.keys import Key, major_keys, minor_keys
 
 
-def MIDI_to_Composition(file):
+def MIDI_to_Composition(file, exact=False):
     """Convert a MIDI file to a mingus.containers.Composition and return it
     in a tuple with the last used tempo in beats per minute (this will
     change in the future).
 
+    If exact is True, the note values are Fractions and the Bars keep their
+    positions as Fractions (see Bar), so no rounding errors add up.
+
     This function can raise all kinds of exceptions (IOError, HeaderError,
     TimeDivisionError, FormatError), so be sure to try and catch.
     """
     m = MidiFile()
-    return m.MIDI_to_Composition(file)
+    return m.MIDI_to_Composition(file, exact)
+
+
+def MIDI_to_events(file, tracks=None):
+    """Return an iterator over the events in a MIDI file, one track at a
+    time, without building a Composition.
+
+    The events are NoteOn, NoteOff, ControlChange, ProgramChange,
+    ChannelEvent, Tempo, TimeSignature, KeySignature, TrackName, MetaEvent
+    and SysExEvent records. They all start with the track number, the
+    absolute tick and the absolute time in seconds. Use tracks to only get
+    the events of the tracks with those numbers.
+
+    This function can raise the same exceptions as MIDI_to_Composition.
+
+    Example:
+    >>> for event in MIDI_to_events('song.mid'):  # doctest: +SKIP
+    ...     if isinstance(event, NoteOn):
+    ...         print(event.time, event.note)
+    """
+    m = MidiFile()
+    return m.iter_events(m.read_midi_file(file), tracks)
 
 
 class HeaderError(Exception):
@@ -61,6 +90,180 @@ class FormatError(Exception):
     pass
 
 
+def _parse_events(view, pos, end):
+    """Parse the events of a track chunk found between pos and end in view.
+
+    Return a list of (delta_time, status, data1, data2) tuples:
+
+     * channel events have the status byte (running status is resolved,
+       and cancelled by meta and system exclusive events) and one or two
+       parameters; data2 is None for program change and
+       channel aftertouch events. A note on with velocity 0 is returned as
+       a note off.
+     * meta events have status 0xFF, the meta event type as data1 and the
+       data in bytes as data2.
+     * system exclusive events have status 0xF0 or 0xF7, None as data1 and
+       the data in bytes as data2.
+    """
+    events = []
+    append = events.append
+    running = None
+    while pos < end:
+        # Delta time
+        b = view[pos]
+        pos += 1
+        delta_time = b & 0x7F
+        while b & 0x80:
+            b = view[pos]
+            pos += 1
+            delta_time = (delta_time << 7) | (b & 0x7F)
+
+        status = view[pos]
+        if status < 0xF0:
+            if status & 0x80:
+                running = status
+                pos += 1
+            elif running is None:
+                raise FormatError("Unknown event type %d. Byte %d." % (status >> 4, pos))
+            else:
+                status = running
+            if 0xC0 <= status < 0xE0:
+                append((delta_time, status, view[pos], None))
+                pos += 1
+            else:
+                param2 = view[pos + 1]
+                if param2 == 0 and 0x90 <= status < 0xA0:
+                    status -= 0x10
+                append((delta_time, status, view[pos], param2))
+                pos += 2
+            continue
+
+        # Meta and system exclusive events, which cancel running status
+        pos += 1
+        running = None
+        data1 = None
+        if status == 0xFF:
+            data1 = view[pos]
+            pos += 1
+        elif status != 0xF0 and status != 0xF7:
+            raise FormatError("Unknown event type %d. Byte %d." % (status, pos))
+        b = view[pos]
+        pos += 1
+        length = b & 0x7F
+        while b & 0x80:
+            b = view[pos]
+            pos += 1
+            length = (length << 7) | (b & 0x7F)
+        append((delta_time, status, data1, view[pos : pos + length].tobytes()))
+        pos += length
+    return events
+
+
+# The records MIDI_to_events returns
+_fields = ["track", "tick", "time"]
+NoteOn = namedtuple("NoteOn", _fields + ["channel", "note", "velocity"])
+NoteOff = namedtuple("NoteOff", _fields + ["channel", "note", "velocity"])
+ControlChange = namedtuple("ControlChange", _fields + ["channel", "controller", "value"])
+ProgramChange = namedtuple("ProgramChange", _fields + ["channel", "program"])
+# Note aftertouch, channel aftertouch and pitch bend events
+ChannelEvent = namedtuple("ChannelEvent", _fields + ["status", "data1", "data2"])
+Tempo = namedtuple("Tempo", _fields + ["mpqn", "bpm"])
+TimeSignature = namedtuple("TimeSignature", _fields + ["numerator", "denominator"])
+KeySignature = namedtuple("KeySignature", _fields + ["key"])
+TrackName = namedtuple("TrackName", _fields + ["name"])
+MetaEvent = namedtuple("MetaEvent", _fields + ["meta_event", "data"])
+SysExEvent = namedtuple("SysExEvent", _fields + ["status", "data"])
+
+
+def _tempo_map(events, time_division):
+    """Return the tempo changes in events as a list of (tick, time, seconds
+    per tick) tuples, starting at tick 0.
+
+    time_division is the dictionary MidiFile.parse_time_division returns.
+    """
+    if time_division["fps"]:
+        # The tempo doesn't matter if the time division is in frames
+        frames = time_division["SMPTE_frames"] * time_division["clock_ticks"]
+        if not frames:
+            raise TimeDivisionError("Ticks per frame can't be zero.")
+        return [(0, 0.0, 1.0 / frames)]
+    ticks_per_beat = float(time_division["ticks_per_beat"])
+    if not ticks_per_beat:
+        raise TimeDivisionError("Ticks per beat can't be zero.")
+    result = [(0, 0.0, 0.5 / ticks_per_beat)]
+    tick = 0
+    for (delta_time, status, data1, data2) in events:
+        tick += delta_time
+        if status == 0xFF and data1 == 0x51 and len(data2) == 3:
+            (last_tick, time, seconds) = result[-1]
+            time += (tick - last_tick) * seconds
+            seconds = unpack_from(">I", b"\x00" + data2)[0] / 1000000.0 / ticks_per_beat
+            if tick == last_tick:
+                result[-1] = (tick, time, seconds)
+            else:
+                result.append((tick, time, seconds))
+    return result
+
+
+def _event_records(track, events, tempo_map):
+    """Yield the events returned by _parse_events as records with absolute
+    ticks and times."""
+    i = 0
+    (start_tick, start_time, seconds) = tempo_map[0]
+    next_tick = tempo_map[1][0] if len(tempo_map) > 1 else None
+    tick = 0
+    for (delta_time, status, data1, data2) in events:
+        tick += delta_time
+        while next_tick is not None and tick >= next_tick:
+            i += 1
+            (start_tick, start_time, seconds) = tempo_map[i]
+            next_tick = tempo_map[i + 1][0] if len(tempo_map) > i + 1 else None
+        time = start_time + (tick - start_tick) * seconds
+        event_type = status >> 4
+        if event_type == 9:
+            yield NoteOn(track, tick, time, status & 0x0F, data1, data2)
+        elif event_type == 8:
+            yield NoteOff(track, tick, time, status & 0x0F, data1, data2)
+        elif event_type == 11:
+            yield ControlChange(track, tick, time, status & 0x0F, data1, data2)
+        elif event_type == 12:
+            yield ProgramChange(track, tick, time, status & 0x0F, data1)
+        elif status < 0xF0:
+            yield ChannelEvent(track, tick, time, status, data1, data2)
+        elif status != 0xFF:
+            yield SysExEvent(track, tick, time, status, data2)
+        elif data1 == 0x51 and len(data2) == 3:
+            mpqn = unpack_from(">I", b"\x00" + data2)[0]
+            yield Tempo(track, tick, time, mpqn, 60000000.0 / mpqn if mpqn else 0.0)
+        elif data1 == 0x58 and len(data2) >= 2:
+            yield TimeSignature(track, tick, time, data2[0], 2 ** data2[1])
+        elif data1 == 0x59 and len(data2) >= 2 and data2[0] in _key_signatures:
+            sharps = _key_signatures[data2[0]]
+            key = minor_keys[sharps + 7] if data2[1] else major_keys[sharps + 7]
+            yield KeySignature(track, tick, time, key)
+        elif data1 == 0x03:
+            yield TrackName(track, tick, time, data2.decode("latin-1"))
+        else:
+            yield MetaEvent(track, tick, time, data1, data2)
+
+
+# The number of sharps (negative for flats) by key signature byte
+_key_signatures = dict(((n & 0xFF), n) for n in range(-7, 8))
+
+
+def _event_dict(status, data1, data2):
+    """Convert an event returned by _parse_events to the dictionary that
+    MidiFile.parse_midi_event returns."""
+    if status == 0xFF:
+        return {"event": 0x0F, "meta_event": data1, "data": data2}
+    elif status >= 0xF0:
+        return {"event": status, "data": data2}
+    event = {"event": status >> 4, "channel": status & 0x0F, "param1": data1}
+    if data2 is not None:
+        event["param2"] = data2
+    return event
+
+
 class MidiFile(object):
 
     """A class that parses a MIDI file."""
@@ -69,95 +272,95 @@ class MidiFile(object):
     meter = (4, 4)
     bytes_read = 0
 
-    def MIDI_to_Composition(self, file):
-        (header, track_data) = self.parse_midi_file(file)
+    def MIDI_to_Composition(self, file, exact=False):
+        (header, track_data) = self.parse_midi_data(self.read_midi_file(file))
         c = Composition()
         if header[2]["fps"]:
             print("Don't know how to parse this yet")
             return c
         ticks_per_beat = header[2]["ticks_per_beat"]
         for track in track_data:
-            t = Track()
-            b = Bar()
+            t = Track(exact=exact)
+            b = Bar(exact=exact)
             metronome = 1  # Tick once every quarter note
             thirtyseconds = 8  # 8 thirtyseconds in a quarter note
             meter = (4, 4)
             key = "C"
-            for e in track:
-                (deltatime, event) = e
+            for (deltatime, status, data1, data2) in track:
+                event_type = status >> 4
                 duration = float(deltatime) / (ticks_per_beat * 4.0)
                 if duration != 0.0:
-                    duration = 1.0 / duration
+                    if exact:
+                        duration = Fraction(ticks_per_beat * 4, deltatime)
+                    else:
+                        duration = 1.0 / duration
                     if len(b.bar) > 0:
                         current_length = b.bar[-1][1]
                         b.bar[-1][1] = duration
                         if current_length - duration != 0:
-                            b.current_beat -= 1.0 / current_length
-                            b.current_beat += 1.0 / duration
+                            b.current_beat -= b._length(current_length)
+                            b.current_beat += b._length(duration)
                     if not b.place_notes(NoteContainer(), duration):
                         t + b
-                        b = Bar(key, meter)
+                        b = Bar(key, meter, exact)
                         b.place_notes(NoteContainer(), duration)
 
-                if event["event"] == 8:
+                if event_type == 8:
                     if deltatime == 0:
                         pass
-                elif event["event"] == 9:
+                elif event_type == 9:
                     # note on
-                    n = Note(
-                        notes.int_to_note(event["param1"] % 12),
-                        event["param1"] // 12 - 1,
-                    )
-                    n.channel = event["channel"]
-                    n.velocity = event["param2"]
+                    n = Note(notes.int_to_note(data1 % 12), data1 // 12 - 1)
+                    n.channel = status & 0x0F
+                    n.velocity = data2
                     if len(b.bar) > 0:
                         b.bar[-1][2] + n
                     else:
                         b + n
-                elif event["event"] == 10:
+                elif event_type == 10:
                     # note aftertouch
                     pass
-                elif event["event"] == 11:
+                elif event_type == 11:
                     # controller select
                     pass
-                elif event["event"] == 12:
+                elif event_type == 12:
                     # program change
                     i = MidiInstrument()
-                    i.instrument_nr = event["param1"]
+                    i.instrument_nr = data1
                     t.instrument = i
-                elif event["event"] == 0x0F:
+                elif status == 0xFF:
                     # meta event Text
-                    if event["meta_event"] == 1:
+                    if data1 == 1:
                         pass
-                    elif event["meta_event"] == 3:
+                    elif data1 == 3:
                         # Track name
-                        t.name = event["data"].decode("ascii")
-                    elif event["meta_event"] == 6:
+                        t.name = data2.decode("ascii")
+                    elif data1 == 6:
                         # Marker
                         pass
-                    elif event["meta_event"] == 7:
+                    elif data1 == 7:
                         # Cue Point
                         pass
-                    elif event["meta_event"] == 47:
+                    elif data1 == 47:
                         # End of Track
                         pass
-                    elif event["meta_event"] == 81:
+                    elif data1 == 81:
                         # Set tempo warning Only the last change in bpm will get
                         # saved currently
-                        mpqn = self.bytes_to_int(event["data"])
+                        mpqn = self.bytes_to_int(data2)
                         bpm = 60000000 // mpqn
-                    elif event["meta_event"] == 88:
+                    elif data1 == 88:
                         # Time Signature
-                        d = event["data"]
+                        d = data2
                         thirtyseconds = self.bytes_to_int(d[3])
                         metronome = self.bytes_to_int(d[2]) / 24.0
                         denom = 2 ** self.bytes_to_int(d[1])
                         numer = self.bytes_to_int(d[0])
                         meter = (numer, denom)
                         b.set_meter(meter)
-                    elif event["meta_event"] == 89:
+                    elif data1 == 89:
                         # Key Signature
-                        d = event["data"]
+                        d = data2
                         sharps = self.bytes_to_int(d[0])
                         minor = self.bytes_to_int(d[0])
                         if minor:
@@ -171,9 +374,12 @@ class MidiFile(object):
                                 key = intervals.major_fifth(key)
                         b.key = Key(key)
                     else:
-                        print("Unsupported META event", event["meta_event"])
+                        print("Unsupported META event", data1)
+                elif status == 0xF0 or status == 0xF7:
+                    # system exclusive
+                    pass
                 else:
-                    print("Unsupported MIDI event", event)
+                    print("Unsupported MIDI event", _event_dict(status, data1, data2))
             t + b
             c.tracks.append(t)
         return (c, bpm)
@@ -375,22 +581,113 @@ class MidiFile(object):
         Return the header -as a tuple containing respectively the MIDI
         format, the number of tracks and the time division-, the parsed
         track data and the number of bytes read.
+
+        The events are dictionaries like the ones parse_midi_event returns.
+        Use parse_midi_data for a faster, more compact representation.
         """
+        (header, track_data) = self.parse_midi_data(self.read_midi_file(file))
+        result = []
+        for track in track_data:
+            result.append([[e[0], _event_dict(e[1], e[2], e[3])] for e in track])
+        return (header, result)
+
+    def read_midi_file(self, file):
+        """Return the contents of a MIDI file in bytes."""
         try:
             f = open(file, "rb")
         except:
             raise IOError("File not found")
-        self.bytes_read = 0
-        header = self.parse_midi_file_header(f)
-        tracks = header[1]
+        try:
+            return f.read()
+        finally:
+            f.close()
+
+    def parse_midi_data(self, data):
+        """Parse the contents of a MIDI file, given as bytes or anything else
+        that supports the buffer protocol (an mmap, for instance).
+
+        Return the header -as a tuple containing respectively the MIDI
+        format, the number of tracks and the time division- and the track
+        data. Every track is a list of (delta_time, status, data1, data2)
+        tuples; see _parse_events.
+        """
+        view = memoryview(data)
+        (header, pos) = self._parse_header(view)
         result = []
-        while tracks > 0:
-            events = self.parse_track(f)
-            result.append(events)
-            tracks -= 1
-        f.close()
+        for (pos, end) in self._track_chunks(view, pos, header[1]):
+            try:
+                result.append(_parse_events(view, pos, end))
+            except IndexError:
+                raise IOError("Couldn't read MIDI event from file.")
         return (header, result)
 
+    def iter_events(self, data, tracks=None):
+        """Return an iterator over the events in the contents of a MIDI
+        file, one track at a time.
+
+        The events are lightweight records (NoteOn, NoteOff, Tempo, ...)
+        that carry the track number, the absolute tick and the absolute
+        time in seconds. Tracks are only parsed when the iterator gets to
+        them, so callers can filter the events or stop early cheaply. Use
+        tracks to only get the events of the tracks with those numbers.
+
+        The header is checked right away; the other errors are raised
+        while iterating.
+        """
+        view = memoryview(data)
+        (header, pos) = self._parse_header(view)
+        return self._iter_events(view, pos, header, tracks)
+
+    def _iter_events(self, view, pos, header, tracks):
+        (format_type, number_of_tracks, time_division) = header
+        tempo_map = None
+        for (n, (pos, end)) in enumerate(self._track_chunks(view, pos, number_of_tracks)):
+            # The tempo changes of format 1 files are in the first track
+            if tracks is not None and n not in tracks and (format_type != 1 or n > 0):
+                continue
+            try:
+                events = _parse_events(view, pos, end)
+            except IndexError:
+                raise IOError("Couldn't read MIDI event from file.")
+            if format_type != 1 or n == 0:
+                tempo_map = _tempo_map(events, time_division)
+            if tracks is None or n in tracks:
+                for event in _event_records(n, events, tempo_map):
+                    yield event
+
+    def _parse_header(self, view):
+        """Parse the header chunk and return the header and the position of
+        the first chunk after it."""
+        self.bytes_read = 0
+        if view[0:4].tobytes() != b"MThd":
+            raise HeaderError("Not a valid MIDI file header. Byte 0.")
+        if len(view) < 14:
+            raise IOError("Couldn't read the header from file.")
+        (chunk_size, format_type, number_of_tracks, time_division) = unpack_from(">IHHH", view, 4)
+        if chunk_size < 6:
+            raise HeaderError("Header chunk is too small. Byte 4.")
+        if format_type not in [0, 1, 2]:
+            raise FormatError("%d is not a valid MIDI format." % format_type)
+        header = (format_type, number_of_tracks, self.parse_time_division(time_division))
+        return (header, 8 + chunk_size)
+
+    def _track_chunks(self, view, pos, number_of_tracks):
+        """Yield the start and end positions of the data of the track chunks,
+        skipping chunks of unknown types."""
+        found = 0
+        self.bytes_read = min(pos, len(view))
+        while found < number_of_tracks:
+            if pos + 8 > len(view):
+                raise HeaderError("Not a valid Track header. Byte %d." % pos)
+            chunk_type = view[pos : pos + 4].tobytes()
+            (chunk_size,) = unpack_from(">I", view, pos + 4)
+            pos += 8
+            if chunk_type == b"MTrk":
+                found += 1
+                yield (pos, min(pos + chunk_size, len(view)))
+            pos += chunk_size
+            self.bytes_read = min(pos, len(view))
+
     def parse_varbyte_as_int(self, fp, return_bytes_read=True):
         """Read a variable length byte from the file and return the
         corresponding integer."""
@@ -414,6 +711,88 @@ class MidiFile(object):
             return (result, bytes_read)
 
 
+def MIDI_files_to_Compositions(paths, workers=None, chunksize=1, parse=MIDI_to_Composition):
+    """Parse a lot of MIDI files in a pool of worker processes.
+
+    paths can be a list of files, or a directory in which all the .mid
+    and .midi files will be parsed. Return a MidiBatch; iterate over it
+    to get (path, result) tuples as the files are parsed. The result is
+    the (Composition, bpm) tuple MIDI_to_Composition returns or, when a
+    file couldn't be parsed, the exception that was raised.
+
+    workers is the number of processes (the number of CPUs by default;
+    1 parses the files in this process) and chunksize is the number of
+    files that is sent to a worker at a time. Use parse to parse the
+    files with another function; it has to be defined at the top level
+    of a module so the workers can find it.
+    """
+    return MidiBatch(paths, workers, chunksize, parse)
+
+
+def _parse_file(args):
+    """Parse one file for MidiBatch, returning the exception if it fails."""
+    (parse, path) = args
+    try:
+        return (path, parse(path))
+    except Exception as e:
+        return (path, e)
+
+
+class MidiBatch(object):
+
+    """An iterator over the results of parsing a batch of MIDI files.
+
+    The counters total, done and failed keep track of the progress. They
+    start over every time the batch is iterated.
+    """
+
+    def __init__(self, paths, workers=None, chunksize=1, parse=MIDI_to_Composition):
+        if isinstance(paths, string_types):
+            paths = self.find_files(paths)
+        self.paths = list(paths)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunksize = chunksize
+        self.parse = parse
+        self.total = len(self.paths)
+        self.done = 0
+        self.failed = 0
+
+    @staticmethod
+    def find_files(directory):
+        """Return the sorted paths of the MIDI files in directory and its
+        subdirectories."""
+        result = []
+        for (root, dirs, files) in os.walk(directory):
+            for f in files:
+                if os.path.splitext(f)[1].lower() in (".mid", ".midi"):
+                    result.append(os.path.join(root, f))
+        return sorted(result)
+
+    def __iter__(self):
+        self.done = 0
+        self.failed = 0
+        return self._iter_results()
+
+    def _iter_results(self):
+        jobs = [(self.parse, path) for path in self.paths]
+        pool = None
+        if self.workers == 1 or len(jobs) <= 1:
+            results = (_parse_file(job) for job in jobs)
+        else:
+            pool = multiprocessing.Pool(min(self.workers, len(jobs)))
+            results = pool.imap_unordered(_parse_file, jobs, self.chunksize)
+        try:
+            for (path, result) in results:
+                self.done += 1
+                if isinstance(result, Exception):
+                    self.failed += 1
+                yield (path, result)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+
 if __name__ == "__main__":
     from sys import argv
     from mingus.midi import fluidsynth, midi_file_out
@@ -22,6 +22,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 from mingus.midi.midi_track import MidiTrack
+from mingus.midi.midi_events import TRACK_HEADER
 from binascii import a2b_hex
 from six.moves import range
 
@@ -41,12 +42,12 @@ class MidiFile(object):
 
     def get_midi_data(self):
         """Collect and return the raw, binary MIDI data from the tracks."""
-        tracks = [t.get_midi_data() for t in self.tracks if t.track_data != b""]
+        tracks = [t.get_midi_data() for t in self.tracks if not t.is_empty()]
         return self.header() + b"".join(tracks)
 
     def header(self):
         """Return a header for type 1 MIDI file."""
-        tracks = a2b_hex("%04x" % len([t for t in self.tracks if t.track_data != ""]))
+        tracks = a2b_hex("%04x" % len([t for t in self.tracks if not t.is_empty()]))
         return b"MThd\x00\x00\x00\x06\x00\x01" + tracks + self.time_division
 
     def reset(self):
@@ -72,6 +73,94 @@ class MidiFile(object):
         return True
 
 
+class _CountingWriter(object):
+
+    """Count the bytes written to a binary file object. If the file object
+    is None the bytes are only counted."""
+
+    def __init__(self, fp=None):
+        self.fp = fp
+        self.size = 0
+
+    def write(self, data):
+        if self.fp is not None:
+            self.fp.write(data)
+        self.size += len(data)
+
+
+def _is_seekable(fp):
+    try:
+        if hasattr(fp, "seekable"):
+            return fp.seekable()
+        fp.tell()
+        return True
+    except (AttributeError, IOError, OSError):
+        return False
+
+
+def stream_Tracks(fp, tracks, bpm=120, repeat=0):
+    """Write mingus.Tracks to the binary file object fp as a type 1 MIDI
+    file; return the number of bytes written.
+
+    The events of every track are written to fp bar by bar, so no track is
+    ever held in memory as a whole. The size of each track chunk is patched
+    in afterwards if fp is seekable; otherwise each track is rendered twice,
+    once to measure it and once to write it.
+    """
+    midi_tracks = [MidiTrack(bpm) for _ in tracks]
+    out = _CountingWriter(fp)
+    out.write(MidiFile(midi_tracks).header())
+    seekable = _is_seekable(fp)
+    for midi_track, track in zip(midi_tracks, tracks):
+        if seekable:
+            start = fp.tell()
+            out.write(midi_track.header())
+        else:
+            counter = MidiTrack(bpm)
+            for _ in range(repeat + 1):
+                counter.play_Track(track, _CountingWriter())
+            out.write(counter.header())
+        for _ in range(repeat + 1):
+            midi_track.play_Track(track, out)
+        midi_track.flush(out)
+        out.write(midi_track.end_of_track())
+        if seekable:
+            end = fp.tell()
+            fp.seek(start)
+            fp.write(midi_track.header())
+            fp.seek(end)
+    return out.size
+
+
+def stream_Composition(fp, composition, bpm=120, repeat=0):
+    """Write a mingus.Composition to the binary file object fp; return the
+    number of bytes written.
+
+    See stream_Tracks.
+    """
+    return stream_Tracks(fp, composition.tracks, bpm, repeat)
+
+
+def _stream_file(file, tracks, bpm, repeat, verbose):
+    """Stream tracks to file, reporting errors like MidiFile.write_file
+    does."""
+    try:
+        f = open(file, "wb")
+    except (IOError, OSError):
+        print("Couldn't open '%s' for writing." % file)
+        return False
+    try:
+        written = stream_Tracks(f, tracks, bpm, repeat)
+    except (IOError, OSError):
+        print("An error occured while writing data to %s." % file)
+        return False
+    finally:
+        f.close()
+    if verbose:
+        print("Written %d bytes to %s." % (written, file))
+    return True
+
+
 def write_Note(file, note, bpm=120, repeat=0, verbose=False):
     """Expect a Note object from mingus.containers and save it into a MIDI
     file, specified in file.
@@ -126,27 +215,15 @@ def write_Track(file, track, bpm=120, repeat=0, verbose=False):
     number. The class MidiInstrument in mingus.containers.Instrument has
     this attribute by default.
     """
-    m = MidiFile()
-    t = MidiTrack(bpm)
-    m.tracks = [t]
-    while repeat >= 0:
-        t.play_Track(track)
-        repeat -= 1
-    return m.write_file(file, verbose)
+    return _stream_file(file, [track], bpm, repeat, verbose)
 
 
 def write_Composition(file, composition, bpm=120, repeat=0, verbose=False):
-    """Write a mingus.Composition to a MIDI file."""
-    m = MidiFile()
-    t = []
-    for x in range(len(composition.tracks)):
-        t += [MidiTrack(bpm)]
-    m.tracks = t
-    while repeat >= 0:
-        for i in range(len(composition.tracks)):
-            m.tracks[i].play_Track(composition.tracks[i])
-        repeat -= 1
-    return m.write_file(file, verbose)
+    """Write a mingus.Composition to a MIDI file.
+
+    The tracks are streamed to the file; see stream_Tracks.
+    """
+    return _stream_file(file, composition.tracks, bpm, repeat, verbose)
 
 
 if __name__ == "__main__":
@@ -30,16 +30,23 @@ from struct import pack
 
 from six.moves import range
 
+from mingus.core import value
 from mingus.core.keys import Key, major_keys, minor_keys
 from mingus.midi.midi_events import *
 
+# The variable length bytes of all the values that fit in two bytes, which
+# covers nearly every delta time.
+_varbytes = tuple(
+    [pack("B", v) for v in range(0x80)]
+    + [pack("BB", v >> 7 | 0x80, v & 0x7F) for v in range(0x80, 0x4000)]
+)
+
 
 class MidiTrack(object):
 
     """A class used to generate MIDI events from the objects in
     mingus.containers."""
 
-    track_data = b""
     delta_time = b"\x00"
     delay = 0
     bpm = 120
@@ -47,9 +54,28 @@ class MidiTrack(object):
     instrument = 1
 
     def __init__(self, start_bpm=120):
-        self.track_data = b""
+        self._data = bytearray()
+        self._flushed = 0
         self.set_tempo(start_bpm)
 
+    @property
+    def track_data(self):
+        """The bytes of the events in this track.
+
+        The events are collected in a growable buffer; reading this
+        property makes a copy, so use get_midi_data to get the whole track.
+        """
+        return bytes(self._data)
+
+    @track_data.setter
+    def track_data(self, data):
+        self._data = bytearray(data)
+
+    def is_empty(self):
+        """Return True if no events have been added to this track, flushed
+        or not."""
+        return self._flushed == 0 and len(self._data) == 0
+
     def end_of_track(self):
         """Return the bytes for an end of track meta event."""
         return b"\x00\xff\x2f\x00"
@@ -69,7 +95,7 @@ class MidiTrack(object):
 
         assert 0 <= velocity <= 0x7F
 
-        self.track_data += self.note_on(channel, int(note) + 12, velocity)
+        self._data += self.note_on(channel, int(note) + 12, velocity)
 
     def play_NoteContainer(self, notecontainer):
         """Convert a mingus.containers.NoteContainer to the equivalent MIDI
@@ -92,8 +118,17 @@ class MidiTrack(object):
         self.set_meter(bar.meter)
         self.set_deltatime(0)
         self.set_key(bar.key)
+        # In exact bars the positions are rounded instead of the lengths, so
+        # the rounding errors don't add up. Other bars round every length,
+        # as they always have.
+        position = 0
         for x in bar:
-            tick = int(round((1.0 / x[1]) * 288))
+            if bar.exact:
+                end = position + value.length(x[1]) * 288
+                tick = int(round(end)) - int(round(position))
+                position = end
+            else:
+                tick = int(round((1.0 / x[1]) * 288))
             if x[2] is None or len(x[2]) == 0:
                 self.delay += tick
             else:
@@ -106,9 +141,13 @@ class MidiTrack(object):
                 self.set_deltatime(self.int_to_varbyte(tick))
                 self.stop_NoteContainer(x[2])
 
-    def play_Track(self, track):
+    def play_Track(self, track, output=None):
         """Convert a Track object to MIDI events and write them to the
-        track_data."""
+        track_data.
+
+        If output is given, the events are flushed to it after every bar
+        (see flush), so the track_data never holds more than one bar.
+        """
         if hasattr(track, "name"):
             self.set_track_name(track.name)
         self.delay = 0
@@ -118,12 +157,27 @@ class MidiTrack(object):
             self.instrument = instr.instrument_nr
         for bar in track:
             self.play_Bar(bar)
+            if output is not None:
+                self.flush(output)
+
+    def flush(self, output):
+        """Write the track_data to the binary file object output and empty
+        it; return the number of bytes written.
+
+        The flushed bytes still count towards the chunk size in header, but
+        are no longer part of get_midi_data.
+        """
+        size = len(self._data)
+        output.write(self._data)
+        self._flushed += size
+        self._data = bytearray()
+        return size
 
     def stop_Note(self, note):
         """Add a note_off event for note to event_track."""
         channel = note.channel
         velocity = note.velocity
-        self.track_data += self.note_off(channel, int(note) + 12, velocity)
+        self._data += self.note_off(channel, int(note) + 12, velocity)
 
     def stop_NoteContainer(self, notecontainer):
         """Add note_off events for each note in the NoteContainer to the
@@ -139,8 +193,8 @@ class MidiTrack(object):
 
     def set_instrument(self, channel, instr, bank=1):
         """Add a program change and bank select event to the track_data."""
-        self.track_data += self.select_bank(channel, bank)
-        self.track_data += self.program_change_event(channel, instr)
+        self._data += self.select_bank(channel, bank)
+        self._data += self.program_change_event(channel, instr)
 
     def header(self):
         """Return the bytes for the header of track.
@@ -149,7 +203,8 @@ class MidiTrack(object):
         call this function when you're done adding data (when you're not
         using get_midi_data).
         """
-        chunk_size = a2b_hex("%08x" % (len(self.track_data) + len(self.end_of_track())))
+        size = self._flushed + len(self._data) + len(self.end_of_track())
+        chunk_size = a2b_hex("%08x" % size)
         return TRACK_HEADER + chunk_size
 
     def get_midi_data(self):
@@ -157,7 +212,7 @@ class MidiTrack(object):
 
         Include header, track_data and the end of track meta event.
         """
-        return self.header() + self.track_data + self.end_of_track()
+        return self.header() + self._data + self.end_of_track()
 
     def midi_event(self, event_type, channel, param1, param2=None):
         """Convert and return the parameters as a MIDI event in bytes."""
@@ -187,7 +242,8 @@ class MidiTrack(object):
 
     def reset(self):
         """Reset track_data and delta_time."""
-        self.track_data = b""
+        self._data = bytearray()
+        self._flushed = 0
         self.delta_time = b"\x00"
 
     def set_deltatime(self, delta_time):
@@ -210,7 +266,7 @@ class MidiTrack(object):
     def set_tempo(self, bpm):
         """Convert the bpm to a midi event and write it to the track_data."""
         self.bpm = bpm
-        self.track_data += self.set_tempo_event(self.bpm)
+        self._data += self.set_tempo_event(self.bpm)
 
     def set_tempo_event(self, bpm):
         """Calculate the microseconds per quarter note."""
@@ -220,7 +276,7 @@ class MidiTrack(object):
 
     def set_meter(self, meter=(4, 4)):
         """Add a time signature event for meter to track_data."""
-        self.track_data += self.time_signature_event(meter)
+        self._data += self.time_signature_event(meter)
 
     def time_signature_event(self, meter=(4, 4)):
         """Return a time signature event for meter."""
@@ -232,7 +288,7 @@ class MidiTrack(object):
         """Add a key signature event to the track_data."""
         if isinstance(key, Key):
             key = key.name[0]
-        self.track_data += self.key_signature_event(key)
+        self._data += self.key_signature_event(key)
 
     def key_signature_event(self, key="C"):
         """Return the bytes for a key signature event."""
@@ -249,7 +305,7 @@ class MidiTrack(object):
 
     def set_track_name(self, name):
         """Add a meta event for the track."""
-        self.track_data += self.track_name_event(name)
+        self._data += self.track_name_event(name)
 
     def track_name_event(self, name):
         """Return the bytes for a track name meta event."""
@@ -264,6 +320,9 @@ class MidiTrack(object):
         are more bytes following. The remaining 7 bits (mask 0x7F) are used
         to store the value.
         """
+        if 0 <= value < 0x4000:
+            return _varbytes[value]
+
         # Warning: bit kung-fu ahead. The length of the integer in bytes
         length = int(log(max(value, 1), 0x80)) + 1
 
@@ -29,11 +29,22 @@ attached to the Sequencer.
 from __future__ import absolute_import
 
 from mingus.containers.instrument import MidiInstrument, MidiInstr, MidiPercuInstr
+from mingus.containers.note import Note
 from mingus.containers.percussion_note import PercussionNote
 from six.moves import range
 import six
 
 
+def _note_setting(note, attr, default):
+    """Return the velocity or channel set on note, or default if it was not
+    set on the note itself."""
+    if isinstance(note, Note):
+        value = getattr(note, "_" + attr)
+    else:
+        value = getattr(note, "__dict__", {}).get(attr)
+    return default if value is None else value
+
+
 class Sequencer(object):
 
     """A general purpose sequencer for the objects in mingus.containers.
@@ -147,11 +158,8 @@ class Sequencer(object):
         you can set the Note.velocity and Note.channel attributes, which
         will take presedence over the function arguments.
         """
-        if hasattr(note, '__dict__'):
-            if "velocity" in note.__dict__:
-                velocity = note.velocity
-            if "channel" in note.__dict__:
-                channel = note.channel
+        velocity = _note_setting(note, "velocity", velocity)
+        channel = _note_setting(note, "channel", channel)
 
         if isinstance(note, PercussionNote):
             note_i = note.key_number
@@ -181,8 +189,7 @@ class Sequencer(object):
         If Note.channel is set, it will take presedence over the channel
         argument given here.
         """
-        if hasattr(note, '__dict__') and "channel" in note.__dict__:
-            channel = note.channel
+        channel = _note_setting(note, "channel", channel)
         if isinstance(note, PercussionNote):
             note_i = note.key_number
         if isinstance(note, MidiPercuInstr):
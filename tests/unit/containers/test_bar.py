@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
+import doctest
+import pickle
 import unittest
+from fractions import Fraction
 
-from mingus.containers.bar import Bar
+import mingus.containers.bar
+from mingus.containers.bar import Bar, BarEntry
 from mingus.containers.note import Note
 from mingus.containers.note_container import NoteContainer
+from mingus.containers.percussion_note import PercussionNote
 from mingus.core.keys import Key
 
 
@@ -166,3 +171,88 @@ class test_Bar(unittest.TestCase):
         b + ["C", "E", "G"]
         b + ["F", "A", "C"]
         self.assertEqual([[0.0, ["I"]], [0.25, ["IV"]]], b.determine_progression(True))
+
+    def test_exact(self):
+        b = Bar(exact=True)
+        for i in range(11):
+            self.assertTrue(b.place_notes("C", 12))
+        self.assertFalse(b.is_full())
+        self.assertEqual(Fraction(12), b.value_left())
+        self.assertTrue(b.place_notes("C", 12))
+        self.assertTrue(b.is_full())
+        self.assertEqual(Fraction(1), b.current_beat)
+        b.remove_last_entry()
+        self.assertEqual(Fraction(11, 12), b.current_beat)
+        self.assertFalse(Bar(exact=True).place_notes("C", 0.5))
+
+    def test_entries(self):
+        b = Bar()
+        b.place_notes("C", 4)
+        b.place_rest(2)
+        self.assertTrue(isinstance(b[0], BarEntry))
+        self.assertEqual([0.0, 4, NoteContainer("C")], b[0])
+        self.assertEqual([[0.0, 4, NoteContainer("C")], [0.25, 2, None]], b.bar)
+        (beat, duration, notes) = b[1]
+        self.assertEqual((0.25, 2, None), (beat, duration, notes))
+        self.assertEqual(None, b[-1][-1])
+        b[1] = "E"
+        self.assertEqual(NoteContainer("E"), b[1].notes)
+        b[1][1] = 8
+        self.assertEqual(8, b.bar[1].duration)
+        self.assertFalse(hasattr(b, "__dict__"))
+        self.assertFalse(hasattr(b[0], "__dict__"))
+        self.assertEqual([0.0, 4], b[0][:2])
+        self.assertEqual([NoteContainer("C"), 4, 0.0], b[0][::-1])
+
+    def test_pickle(self):
+        b = Bar("Eb", (3, 4), exact=True)
+        b.place_notes(NoteContainer(["C", "E"]), 4)
+        b.place_rest(8)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            c = pickle.loads(pickle.dumps(b, protocol))
+            self.assertEqual(b.bar, c.bar)
+            self.assertEqual((b.key, b.meter, b.exact), (c.key, c.meter, c.exact))
+            self.assertEqual(Fraction(3, 8), c.current_beat)
+            self.assertTrue(c.place_notes("G", 4))
+
+    def test_place_notes_at(self):
+        b = Bar()
+        for n in ["C", "E", "G", "B"]:
+            b.place_notes(n, 4)
+        b.place_notes_at("A", 0.5)
+        b.place_notes_at("D", 0.3)
+        self.assertEqual(NoteContainer(["G", "A"]), b[2][2])
+        self.assertEqual([1, 1, 2, 1], [len(x[2]) for x in b])
+
+    def test_from_events(self):
+        b = Bar.from_events([("C", 4), (None, 4), ([52, 55], 2, 90, 3)], "F", (4, 4))
+        self.assertEqual([[0.0, 4, NoteContainer("C")], [0.25, 4, None]], b.bar[:2])
+        self.assertEqual(["E-4", "G-4"], [repr(n)[1:-1] for n in b[2][2]])
+        self.assertEqual([90, 90], [n.velocity for n in b[2][2]])
+        self.assertTrue(b.is_full())
+        self.assertEqual(Key("F"), b.key)
+        b = Bar.from_events([("C", 12)] * 12, exact=True)
+        self.assertTrue(b.exact and b.is_full())
+        self.assertRaises(ValueError, Bar.from_events, [("C", 2)] * 3)
+        self.assertRaises(ValueError, Bar.from_events, [("C", 4, 200)])
+        n = Note("C")
+        b = Bar.from_events([(n, 4), (n, 4, 100)], validate=False)
+        self.assertTrue(b[0][2][0] is n)
+        self.assertEqual((64, 100), (n.velocity, b[1][2][0].velocity))
+
+    def test_from_events_copies_notes(self):
+        kick = PercussionNote("ACOUSTIC_BASS_DRUM")
+        n = Note("E", 2)
+        (n.string, n.fret) = (5, 0)
+        b = Bar.from_events([(kick, 4, 90), ([n, "B"], 4, 80)])
+        self.assertEqual((PercussionNote, 90), (type(b[0][2][0]), b[0][2][0].velocity))
+        self.assertEqual("ACOUSTIC_BASS_DRUM", b[0][2][0].name)
+        self.assertEqual(64, kick.velocity)
+        self.assertEqual(["E-2", "B-2"], [repr(x)[1:-1] for x in b[1][2]])
+        self.assertEqual((5, 0, 80), (b[1][2][0].string, b[1][2][0].fret, b[1][2][0].velocity))
+        self.assertEqual(64, n.velocity)
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(mingus.containers.bar))
+    return tests
@@ -1,12 +1,38 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
+import pickle
 import unittest
 
 # noinspection PyUnresolvedReferences
 from mingus.containers.composition import Composition
+from mingus.containers.track import Track
 
 
 class test_Composition(unittest.TestCase):
     def setUp(self):
         pass
+
+    def test_init(self):
+        c = Composition()
+        self.assertEqual(
+            ("Untitled", "", "", "", ""), (c.title, c.subtitle, c.author, c.email, c.description)
+        )
+        self.assertEqual([], c.selected_tracks)
+        self.assertFalse(c.selected_tracks is Composition().selected_tracks)
+        self.assertFalse(hasattr(c, "__dict__"))
+
+    def test_pickle(self):
+        c = Composition()
+        c.set_title("Title", "Subtitle")
+        t = Track()
+        t.name = "Piano"
+        t.add_notes(["C", "E", "G"], 2)
+        t.add_notes(None, 2)
+        c.add_track(t)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            d = pickle.loads(pickle.dumps(c, protocol))
+            self.assertEqual(("Title", "Subtitle"), (d.title, d.subtitle))
+            self.assertEqual("Piano", d.tracks[0].name)
+            self.assertEqual(t.bars[0].bar, d.tracks[0].bars[0].bar)
+            self.assertTrue(d.tracks[0].add_notes("B", 4))
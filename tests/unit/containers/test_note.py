@@ -2,11 +2,13 @@
 from __future__ import absolute_import
 
 import doctest
+import pickle
 import unittest
 
 import mingus.containers.note
 from mingus.containers.mt_exceptions import NoteFormatError
 from mingus.containers.note import Note
+from mingus.containers.percussion_note import PercussionNote
 
 
 class test_Note(unittest.TestCase):
@@ -42,6 +44,31 @@ class test_Note(unittest.TestCase):
         self.assertEqual(71, int(self.b5))
         self.assertEqual(59, int(self.b4))
 
+    def test_int_cache(self):
+        n = Note("C", 4)
+        self.assertEqual(48, int(n))
+        n.augment()
+        self.assertEqual(49, int(n))
+        n.octave_up()
+        self.assertEqual(61, int(n))
+        n.transpose("3")
+        self.assertEqual(65, int(n))
+        n.from_int(12)
+        self.assertEqual(12, int(n))
+        n.set_note("B", 2)
+        self.assertEqual(35, int(n))
+        n.name = "Bb"
+        n.octave = 3
+        self.assertEqual(46, int(n))
+
+    def test_hash(self):
+        self.assertEqual(hash(Note("C#")), hash(Note("Db")))
+        self.assertEqual(hash(49), hash(Note("C#")))
+        self.assertEqual(2, len(set([Note("C#"), Note("Db"), Note("C#", 5)])))
+        self.assertEqual("b", {Note("B#", 3): "a", Note("C", 4): "b"}[Note("C")])
+        self.assertFalse(hasattr(Note(), "__dict__"))
+        self.assertFalse(hasattr(Note(), "string"))
+
     def test_set_note(self):
         n = Note()
         self.assertTrue(n.set_note("C", 5, {}))
@@ -139,6 +166,16 @@ class test_Note(unittest.TestCase):
         with self.assertRaises(ValueError):
             Note("A", 4, {"velocity": -1})
 
+    def test_pickle(self):
+        n = Note("F#", 3, velocity=90)
+        (n.string, n.fret) = (2, 4)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            m = pickle.loads(pickle.dumps(n, protocol))
+            self.assertEqual(("F#", 3, 90, None), (m.name, m.octave, m._velocity, m._channel))
+            self.assertEqual((2, 4, int(n)), (m.string, m.fret, int(m)))
+            drum = pickle.loads(pickle.dumps(PercussionNote("HIGH_TOM", duration=5), protocol))
+            self.assertEqual(("HIGH_TOM", 50, 5), (drum.name, int(drum), drum.duration))
+
 
 def load_tests(loader, tests, ignore):
     tests.addTests(doctest.DocTestSuite(mingus.containers.note))
@@ -59,6 +59,57 @@ class test_NoteContainers(unittest.TestCase):
         n.remove_note("G")
         self.assertEqual(NoteContainer([]), n)
 
+    def test_remove_note_index(self):
+        n = NoteContainer([Note("C", 4), Note("C", 5), Note("E", 4), Note("G", 4)])
+        n.remove_note(Note("B#", 3))
+        self.assertEqual(NoteContainer(["E-4", "G-4", "C-5"]), n)
+        n.remove_note("E", 5)
+        self.assertTrue(Note("E", 4) in n)
+        n.remove_note("E", 4)
+        self.assertFalse(Note("E", 4) in n)
+        n.notes.append(Note("C", 3))
+        n.remove_duplicate_notes()
+        self.assertTrue(Note("C", 3) in n)
+        self.assertEqual(3, len(n))
+
+    def test_add_notes_sorted(self):
+        n = NoteContainer([Note().from_int(x) for x in (50, 20, 70, 20, 35, 60, 50)])
+        self.assertEqual([20, 35, 50, 60, 70], [int(x) for x in n])
+        self.assertTrue(Note().from_int(35) in n)
+        self.assertFalse(Note().from_int(36) in n)
+        self.assertFalse(None in n)
+        n[0] = Note().from_int(80)
+        self.assertTrue(Note().from_int(80) in n)
+        self.assertFalse(Note().from_int(20) in n)
+        n.add_note(Note().from_int(40))
+        self.assertEqual([35, 40, 50, 60, 70, 80], [int(x) for x in n])
+        n.transpose("3")
+        self.assertTrue(Note().from_int(39) in n)
+        self.assertEqual(NoteContainer(["C", "E"]), NoteContainer(["C", "E", "C-4"]))
+
+    def test_index_notes_changed_in_place(self):
+        n = NoteContainer(["C", "E", "G"])
+        n[0].octave_up()
+        self.assertTrue(Note("C", 5) in n)
+        self.assertFalse(Note("C", 4) in n)
+        self.assertEqual(["E-4", "G-4", "C-5", "D-5"], [repr(x)[1:-1] for x in n.add_note("D")])
+        n.remove_note(Note("C", 5))
+        self.assertEqual(["E-4", "G-4", "D-5"], [repr(x)[1:-1] for x in n])
+
+        # Notes shared by two containers
+        a = NoteContainer(["C", "E", "G"])
+        b = NoteContainer(a.notes)
+        a.transpose("3")
+        self.assertTrue(Note("G#") in b)
+        self.assertFalse(Note("C") in b)
+
+        n = NoteContainer(["C", "E", "G"])
+        n.notes.reverse()
+        self.assertEqual(["C-4", "D-4", "E-4", "G-4"], [repr(x)[1:-1] for x in n.add_note("D")])
+        n.notes.reverse()
+        n.remove_duplicate_notes()
+        self.assertEqual(4, len(n))
+
     def test_determine(self):
         n = NoteContainer(["C", "E", "G"])
         self.assertEqual(["C major triad"], n.determine())
@@ -0,0 +1,124 @@
+from __future__ import absolute_import
+
+import doctest
+import unittest
+from fractions import Fraction
+
+import mingus.containers.note_table
+from mingus.containers import Bar, Composition, Note, NoteContainer, Track
+from mingus.containers.instrument import Piano
+from mingus.containers.percussion_note import PercussionNote
+from mingus.containers.note_table import NONE_REST, REST, NoteTable
+
+
+class test_NoteTable(unittest.TestCase):
+    def setUp(self):
+        self.t = Track(Piano())
+        self.t.name = "Piano"
+        b = Bar("Eb", (3, 4))
+        b.place_notes(NoteContainer(["C", "Eb", "G"]), 4)
+        b.place_rest(4)
+        b.place_notes(Note("Bb", 3, velocity=90, channel=3), 4)
+        self.t.add_bar(b)
+        b = Bar("c", (4, 4))
+        b.place_notes(NoteContainer(), 2)
+        b.place_notes("B#", 2)
+        self.t.add_bar(b)
+
+    def test_columns(self):
+        table = NoteTable.from_track(self.t)
+        self.assertEqual(7, len(table))
+        self.assertEqual([0.0, 0.0, 0.0, 0.25, 0.5, 0.75, 1.25], list(table.onset))
+        self.assertEqual([60, 63, 67, 0, 58, 0, 72], list(table.pitch))
+        self.assertEqual([NONE_REST, REST], [table.name[3], table.name[5]])
+        self.assertEqual("B#", table.names[table.name[6]])
+        self.assertEqual([4, 5, 6], table.select(0.5, 2.0))
+        self.assertEqual([3, 4], table.select(0.25, 0.75, 0))
+
+    def test_round_trip(self):
+        c = Composition()
+        c.add_track(self.t)
+        c.add_track(Track())
+        c.set_title("Test")
+        c2 = NoteTable.from_composition(c).to_composition()
+        self.assertEqual("Test", c2.title)
+        self.assertEqual(2, len(c2.tracks))
+        t = c2.tracks[0]
+        self.assertEqual(("Piano", self.t.instrument), (t.name, t.instrument))
+        for (b1, b2) in zip(self.t.bars, t.bars):
+            self.assertEqual(b1.key, b2.key)
+            self.assertEqual(b1.meter, b2.meter)
+            self.assertEqual(b1.current_beat, b2.current_beat)
+            self.assertEqual(b1.bar, b2.bar)
+        n = t.bars[0][2][2][0]
+        self.assertEqual((90, 3), (n.velocity, n.channel))
+        self.assertEqual(None, t.bars[0][1][2])
+        self.assertEqual(0, len(t.bars[1][0][2]))
+
+    def test_round_trip_entries(self):
+        t = Track()
+        b = Bar()
+        b.bar = [[0.0, 4, NoteContainer(["C-4"])], [0.0, 4, NoteContainer(["E-4"])]]
+        b.current_beat = 0.25
+        t.add_bar(b)
+        t.add_notes(Note("G", 4, velocity=10), 8)
+        table = NoteTable.from_track(t)
+        self.assertEqual([0, 1, 2], list(table.entry))
+        t2 = table.to_track()
+        self.assertEqual(
+            "[[0.0, 4, ['C-4']], [0.0, 4, ['E-4']], [0.25, 8, ['G-4']]]", repr(t2.bars[0])
+        )
+        self.assertEqual([int, int, int], [type(e[1]) for e in t2.bars[0].bar])
+        n = t2.bars[0][2][2][0]
+        self.assertEqual((10, None), (n._velocity, n._channel))
+        self.assertEqual((10, -1), (table.velocity[2], table.channel[2]))
+
+    def test_round_trip_percussion(self):
+        t = Track()
+        kick = PercussionNote("ACOUSTIC_BASS_DRUM", velocity=100, duration=250)
+        t.add_notes(NoteContainer([kick, PercussionNote("HIGH_TOM")]), 4)
+        t.add_notes("C", 4)
+        table = NoteTable.from_track(t)
+        table.transpose("3")
+        notes = table.to_track().bars[0][0][2]
+        self.assertEqual([PercussionNote, PercussionNote], [type(n) for n in notes])
+        self.assertEqual(["ACOUSTIC_BASS_DRUM", "HIGH_TOM"], [n.name for n in notes])
+        self.assertEqual([35, 50], [int(n) for n in notes])
+        self.assertEqual((100, 250), (notes[0].velocity, notes[0].duration))
+        self.assertEqual("E-4", repr(table.to_track().bars[0][1][2][0])[1:-1])
+
+    def test_round_trip_tablature(self):
+        t = Track()
+        n = Note("E", 2)
+        (n.string, n.fret) = (5, 0)
+        m = Note("B", 3)
+        (m.string, m.fret) = (1, 4)
+        t.add_notes(NoteContainer([n, m]), 2)
+        notes = NoteTable.from_track(t).to_track().bars[0][0][2]
+        self.assertEqual(["E-2", "B-3"], [repr(x)[1:-1] for x in notes])
+        self.assertEqual([(5, 0), (1, 4)], [(x.string, x.fret) for x in notes])
+
+    def test_round_trip_exact(self):
+        t = Track(exact=True)
+        for i in range(4):
+            t.add_notes("C", 12)
+        t2 = NoteTable.from_track(t).to_track()
+        self.assertTrue(t2.exact and t2.bars[0].exact)
+        self.assertEqual(t.bars[0].bar, t2.bars[0].bar)
+        self.assertEqual(Fraction(1, 3), t2.bars[0].current_beat)
+        self.assertEqual(Fraction(1, 4), t2.bars[0][3][0])
+        self.assertTrue(t2.add_notes("C", 12))
+
+    def test_transpose(self):
+        table = NoteTable.from_track(self.t)
+        table.transpose("3", False)
+        for bar in self.t.bars:
+            bar.transpose("3", False)
+        self.assertEqual(self.t.bars[0].bar, table.to_track().bars[0].bar)
+        self.assertEqual(self.t.bars[1].bar, table.to_track().bars[1].bar)
+        self.assertEqual([56, 59, 63, 0, 54, 0, 68], list(table.pitch))
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(mingus.containers.note_table))
+    return tests
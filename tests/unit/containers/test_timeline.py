@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+
+import doctest
+import unittest
+
+import mingus.containers.timeline
+from mingus.containers import Bar, Composition, NoteContainer, Track
+from mingus.containers.timeline import Timeline, seconds_to_time
+
+
+class test_Timeline(unittest.TestCase):
+    def setUp(self):
+        self.t = Track()
+        b = Bar("C", (3, 4))
+        b.place_notes(NoteContainer(["C", "E", "G"]), 2)
+        b.place_rest(4)
+        self.t.add_bar(b)
+        b = Bar()
+        b.place_notes("A", 4)
+        b.place_notes(NoteContainer(), 4)
+        b.place_notes("B", 2)
+        self.t.add_bar(b)
+        self.u = Track()
+        self.u.add_notes("C-3", 1)
+        self.u.add_notes("F-3", 1)
+
+    def test_columns(self):
+        tl = Timeline(self.t)
+        self.assertEqual(3, len(tl))
+        self.assertEqual([0.0, 0.75, 1.25], list(tl.onset))
+        self.assertEqual([0.5, 1.0, 1.75], list(tl.offset))
+        self.assertEqual([0, 1, 1], list(tl.bar))
+        self.assertEqual([0, 0, 2], list(tl.entry))
+        self.assertEqual([[0.0, 0.75, 1.75]], tl.bar_starts)
+
+    def test_at(self):
+        tl = Timeline(self.t)
+        self.assertEqual([0], tl.at(0.0))
+        self.assertEqual([], tl.at(0.5))
+        self.assertEqual([1], tl.at(0.75))
+        self.assertEqual([], tl.at(1.1))
+        self.assertEqual([2], tl.at(1.7))
+        self.assertEqual([], tl.at(1.75))
+        self.assertEqual([], tl.at(-1))
+        self.assertEqual([], Timeline(Track()).at(0.0))
+
+    def test_between(self):
+        tl = Timeline(self.t)
+        self.assertEqual([0, 1], tl.between(0.25, 1.0))
+        self.assertEqual([1], tl.between(0.5, 1.25))
+        self.assertEqual([0, 1, 2], tl.between(-1, 10))
+        self.assertEqual([], tl.between(1.0, 1.25))
+
+    def test_composition(self):
+        c = Composition()
+        c.add_track(self.t)
+        c.add_track(self.u)
+        tl = Timeline(c)
+        self.assertEqual([0, 1, 0, 1, 0], list(tl.track))
+        self.assertEqual(["C-3", "C-4", "E-4", "G-4"], [repr(n)[1:-1] for n in tl.notes_at(0.25)])
+        self.assertEqual(["F-3", "B-4"], [repr(n)[1:-1] for n in tl.notes_at(1.5)])
+        self.assertEqual((1, 0.5), tl.position(1.25))
+        self.assertEqual((1, 0.5), tl.position(1.5, 1))
+        self.assertEqual((1, 1.0), tl.position(2.0, 1))
+        self.assertEqual((0, -0.5), tl.position(-0.5))
+
+    def test_long_notes(self):
+        t = Track()
+        for i in range(500):
+            t.add_notes("E", 8)
+        # A note that sounds for the first four bars
+        t.bars[0][0][1] = 0.25
+        tl = Timeline(t)
+        for time in (0.0, 1.3, 2.99, 3.5, 60.0):
+            expected = [r for r in range(len(tl)) if tl.onset[r] <= time < tl.offset[r]]
+            self.assertEqual(expected, tl.at(time))
+        self.assertEqual([0, 2], tl.between(0.3, 0.375))
+        self.assertEqual([56, 57], tl.between(7.0, 7.25))
+
+    def test_exact(self):
+        t = Track(exact=True)
+        for i in range(30):
+            t.add_notes("C", 12)
+        tl = Timeline(t)
+        self.assertEqual([24], tl.at(2.0))
+        self.assertEqual([0.0, 1.0, 2.0, 3.0], tl.bar_starts[0])
+
+    def test_seconds_to_time(self):
+        self.assertEqual(1.0, seconds_to_time(2))
+        self.assertEqual(0.25, seconds_to_time(0.25, 240))
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(mingus.containers.timeline))
+    return tests
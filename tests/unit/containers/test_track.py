@@ -5,6 +5,8 @@ import unittest
 
 import mingus.containers.track
 from mingus.containers.instrument import Instrument, Piano, Guitar
+from mingus.containers.mt_exceptions import InstrumentRangeError
+from mingus.containers.note import Note
 from mingus.containers.track import Track
 
 
@@ -35,6 +37,45 @@ class test_Track(unittest.TestCase):
     def test_add(self):
         pass
 
+    def test_exact(self):
+        t = Track(exact=True)
+        for i in range(3000):
+            t.add_notes("C", 10)
+        self.assertEqual(300, len(t))
+        for b in t:
+            self.assertEqual(10, len(b))
+            self.assertTrue(b.exact and b.is_full())
+
+    def test_extend(self):
+        t = Track()
+        self.assertTrue(t.extend([(48, 4), ("E", 4, 90, 2), ([Note("G"), "C-5"], 2)]))
+        self.assertEqual([48, 52, 55, 60], [int(n) for (b, d, nc) in t.get_notes() for n in nc])
+        self.assertEqual((90, 2), (t[0][1][2][0].velocity, t[0][1][2][0].channel))
+        self.assertTrue(t.extend([(None, 2), ("A", 2)]))
+        self.assertEqual([3, 2], [len(b) for b in t])
+        self.assertEqual(None, t[1][0][2])
+        self.assertFalse(t.extend([("B", 2), ("C", 1), ("D", 4)]))
+        self.assertEqual([3, 2, 1], [len(b) for b in t])
+        u = Track()
+        for n in ["C", "E", "G"]:
+            u.add_notes(n, 4)
+        v = Track()
+        v.extend([("C", 4), ("E", 4), ("G", 4)])
+        self.assertEqual(u, v)
+        u.add_notes(["G", "C", "E"], 4)
+        v.extend([(["G", "C", "E"], 4)])
+        self.assertEqual(["G-4", "C-5", "E-5"], [repr(n)[1:-1] for n in v[0][3][2]])
+        self.assertEqual(u, v)
+
+    def test_extend_validate(self):
+        t = Track(Guitar())
+        self.assertRaises(InstrumentRangeError, t.extend, [("E-3", 4), ("D-3", 4)])
+        self.assertEqual(1, len(t[0]))
+        self.assertRaises(InstrumentRangeError, t.extend, [(list(range(50, 57)), 4)])
+        self.assertRaises(ValueError, t.extend, [("E-3", 4, 200)])
+        self.assertTrue(t.extend([("D-3", 4, 200)], validate=False))
+        self.assertEqual(200, t[0][1][2][0].velocity)
+
     def test_transpose(self):
         t = Track()
         t + "C"
@@ -48,4 +89,5 @@ class test_Track(unittest.TestCase):
 
 def load_tests(loader, tests, ignore):
     tests.addTests(doctest.DocTestSuite(mingus.containers.note))
+    tests.addTests(doctest.DocTestSuite(mingus.containers.track))
     return tests
@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+
+import doctest
+import unittest
+
+import mingus.core.cache as cache
+import mingus.core.chords as chords
+import mingus.core.intervals as intervals
+import mingus.core.progressions as progressions
+
+
+class test_cache(unittest.TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.set_maxsize(cache.DEFAULT_MAXSIZE)
+
+    def test_lru_eviction(self):
+        c = cache.LRUCache("test", 2)
+        c.put("a", 1)
+        c.put("b", 2)
+        self.assertEqual(1, c.get("a"))
+        c.put("c", 3)
+        self.assertTrue("a" in c)
+        self.assertFalse("b" in c)
+        self.assertEqual(None, c.get("b"))
+        self.assertEqual(cache.CacheInfo(1, 1, 1, 2, 2), c.info())
+        c.resize(0)
+        self.assertEqual(0, len(c))
+        c.put("d", 4)
+        self.assertEqual(0, len(c))
+        del cache.caches["test"]
+
+    def test_from_shorthand_copies(self):
+        res = chords.from_shorthand("Am7")
+        res.append("X")
+        self.assertEqual(["A", "C", "E", "G"], chords.from_shorthand("Am7"))
+        self.assertEqual(1, cache.info("chords.from_shorthand").hits)
+        self.assertEqual(["G", "B", "D", "F", "A"], chords.from_shorthand("Dm|G"))
+        self.assertEqual(["G", "B", "D", "F", "A"], chords.from_shorthand("Dm|G"))
+
+    def test_to_chords_copies(self):
+        res = progressions.to_chords(["I", "V7"])
+        res[0].append("X")
+        res.append(["X"])
+        self.assertEqual(
+            [["C", "E", "G"], ["G", "B", "D", "F"]], progressions.to_chords(["I", "V7"])
+        )
+        self.assertEqual([["C", "E", "G"]], progressions.to_chords("I"))
+        self.assertEqual(["C", "E", "G"], chords.I("C"))
+
+    def test_set_maxsize(self):
+        cache.set_maxsize(1)
+        intervals.from_shorthand("A", "b3")
+        intervals.from_shorthand("D", "2")
+        self.assertEqual(cache.CacheInfo(0, 2, 1, 1, 1), cache.info("intervals.from_shorthand"))
+        self.assertEqual("C", intervals.from_shorthand("A", "b3"))
+        cache.set_maxsize(None, "intervals.from_shorthand")
+        self.assertEqual(None, cache.info()["intervals.from_shorthand"].maxsize)
+
+    def test_substitutions(self):
+        cache.set_maxsize(2, "progressions.substitutions")
+        expected = progressions.substitute(["I", "IV", "V7"], 0, 2)
+        self.assertEqual(2, cache.info("progressions.substitutions").currsize)
+        self.assertTrue(cache.info("progressions.substitutions").evictions > 0)
+        self.assertEqual(expected, progressions.substitute(["I", "IV", "V7"], 0, 2))
+        cache.clear("progressions.substitutions")
+        self.assertEqual(0, cache.info("progressions.substitutions").currsize)
+
+    def test_note_signatures(self):
+        cache.set_maxsize(2, "chords.note_signature")
+        for chord in (["C", "E", "G"], ["H", "E"], ["C#b", "E"], ["D", "F#", "A"]):
+            chords._chord_signature(chord)
+        info = cache.info("chords.note_signature")
+        self.assertEqual(2, info.currsize)
+        self.assertTrue(info.evictions > 0)
+        self.assertFalse("H" in cache.caches["chords.note_signature"])
+        self.assertEqual(["D major triad"], chords.determine(["D", "F#", "A"]))
+        cache.clear("chords.note_signature")
+        self.assertEqual(0, cache.info("chords.note_signature").currsize)
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(cache))
+    return tests
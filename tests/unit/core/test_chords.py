@@ -4,6 +4,8 @@ import doctest
 import unittest
 
 import mingus.core.chords as chords
+import mingus.core.notes as notes
+import mingus.core.progressions as progressions
 from mingus.core.mt_exceptions import FormatError, NoteFormatError
 
 
@@ -435,6 +437,124 @@ class test_chords(unittest.TestCase):
             "chord name",
         )
 
+    def test_determine_index(self):
+        for x in chords.chord_shorthand:
+            for root in ["C", "F#", "Bb", "E##", "Dbb"]:
+                chord = chords.from_shorthand(root + x)
+                for i in range(len(chord)):
+                    inversion = chord[i:] + chord[:i]
+                    for shorthand in [False, True]:
+                        try:
+                            expected = chords._determine(inversion, shorthand)
+                        except TypeError:
+                            continue
+                        self.assertEqual(expected, chords.determine(inversion, shorthand))
+        self.assertEqual(
+            chords._determine(["C#b", "E", "G", "B"]), chords.determine(["C#b", "E", "G", "B"])
+        )
+        self.assertEqual(["Dm", "FM6"], chords.determine(["D", "F", "A"], True))
+
+    def test_from_formula(self):
+        # The chords the hand written builders returned before the formula table
+        expected = {
+            "m": ["Eb", "Gb", "Bb"],
+            "M": ["Eb", "G", "Bb"],
+            "": ["Eb", "G", "Bb"],
+            "dim": ["Eb", "Gb", "Bbb"],
+            "aug": ["Eb", "G", "B"],
+            "+": ["Eb", "G", "B"],
+            "7#5": ["Eb", "G", "B", "Db"],
+            "M7+5": ["Eb", "G", "B", "Db"],
+            "M7+": ["Eb", "G", "B", "D"],
+            "m7+": ["Eb", "G", "B", "Db"],
+            "7+": ["Eb", "G", "B", "D"],
+            "sus47": ["Eb", "Ab", "Bb", "Db"],
+            "sus4": ["Eb", "Ab", "Bb"],
+            "sus2": ["Eb", "F", "Bb"],
+            "sus": ["Eb", "Ab", "Bb"],
+            "11": ["Eb", "Bb", "Db", "Ab"],
+            "sus4b9": ["Eb", "Ab", "Bb", "Fb"],
+            "susb9": ["Eb", "Ab", "Bb", "Fb"],
+            "m7": ["Eb", "Gb", "Bb", "Db"],
+            "M7": ["Eb", "G", "Bb", "D"],
+            "7": ["Eb", "G", "Bb", "Db"],
+            "dom7": ["Eb", "G", "Bb", "Db"],
+            "m7b5": ["Eb", "Gb", "Bbb", "Db"],
+            "dim7": ["Eb", "Gb", "Bbb", "Dbb"],
+            "m/M7": ["Eb", "Gb", "Bb", "D"],
+            "mM7": ["Eb", "Gb", "Bb", "D"],
+            "m6": ["Eb", "Gb", "Bb", "C"],
+            "M6": ["Eb", "G", "Bb", "C"],
+            "6": ["Eb", "G", "Bb", "C"],
+            "6/7": ["Eb", "G", "Bb", "C", "Db"],
+            "67": ["Eb", "G", "Bb", "C", "Db"],
+            "6/9": ["Eb", "G", "Bb", "C", "F"],
+            "69": ["Eb", "G", "Bb", "C", "F"],
+            "9": ["Eb", "G", "Bb", "Db", "F"],
+            "7b9": ["Eb", "G", "Bb", "Db", "Fb"],
+            "7#9": ["Eb", "G", "Bb", "Db", "F#"],
+            "M9": ["Eb", "G", "Bb", "D", "F"],
+            "m9": ["Eb", "Gb", "Bb", "Db", "F"],
+            "7#11": ["Eb", "G", "Bb", "Db", "A"],
+            "m11": ["Eb", "Gb", "Bb", "Db", "Ab"],
+            "M13": ["Eb", "G", "Bb", "D", "F", "C"],
+            "m13": ["Eb", "Gb", "Bb", "Db", "F", "C"],
+            "13": ["Eb", "G", "Bb", "Db", "F", "C"],
+            "7b5": ["Eb", "G", "Bbb", "Db"],
+            "hendrix": ["Eb", "G", "Bb", "Db", "Gb"],
+            "7b12": ["Eb", "G", "Bb", "Db", "Gb"],
+            "5": ["Eb", "Bb"],
+        }
+        self.assertEqual(sorted(expected), sorted(chords.chord_shorthand))
+        for x in expected:
+            self.assertEqual(expected[x], chords.from_formula("Eb", chords.chord_formulas[x]))
+            self.assertEqual(expected[x], chords.chord_shorthand[x]("Eb"))
+        self.assertEqual(
+            ["C", "E", "G", "Bb", "D", "F#", "A"],
+            chords.from_formula("C", ("1", "3", "5", "b7", "9", "#11", "13")),
+        )
+        self.assertRaises(FormatError, chords.from_formula, "C", ("1", "b"))
+
+    def test_determine_polychords_pruning(self):
+        # Every triad determine_triad can name passes the pitch class filter
+        for x in ["C", "F#", "Bb", "E##"]:
+            for y in chords.chord_shorthand:
+                triad = chords.from_shorthand(x + y)[:3]
+                if len(triad) == 3 and chords.determine_triad(triad, True, True):
+                    root = notes.note_to_int(triad[0])
+                    self.assertTrue(
+                        (
+                            (notes.note_to_int(triad[1]) - root) % 12,
+                            (notes.note_to_int(triad[2]) - root) % 12,
+                        )
+                        in chords._triad_masks
+                    )
+        self.assertEqual([], chords.determine_polychords(["C", "C#", "D", "D#", "E", "F"]))
+        self.assertEqual(
+            ["C#dim|CM", "C#dim|C7", "C#dim|C13", "A7|CM", "A7|C7", "A7|C13"],
+            chords.determine_polychords(["C", "E", "G", "Bb", "A", "C#", "E", "G"]),
+        )
+        self.assertEqual([], chords.determine_polychords(["C"] * 15))
+
+    def test_register_chord(self):
+        chords.register_chord("add9", ("1", "3", "5", "9"), "add nine")
+        try:
+            self.assertEqual(["F", "A", "C", "G"], chords.from_shorthand("Fadd9"))
+            self.assertEqual(["Eb", "F", "A", "C", "G"], chords.from_shorthand("Fadd9/Eb"))
+            self.assertTrue("F add nine" in chords.determine(["F", "A", "C", "G"]))
+            self.assertTrue("Fadd9" in chords.determine(["F", "A", "C", "G"], True))
+            self.assertTrue("F add nine, first inversion" in chords.determine(["A", "C", "G", "F"]))
+            self.assertEqual([["F", "A", "C", "G"]], progressions.to_chords(["IVadd9"]))
+            self.assertRaises(FormatError, chords.register_chord, "add9", ("1", "9"), "")
+            self.assertRaises(FormatError, chords.register_chord, "m", ("1", "b3"), "")
+            self.assertRaises(FormatError, chords.register_chord, "x", ("3", "5"), "")
+        finally:
+            chords.unregister_chord("add9")
+        self.assertEqual(" dominant ninth", chords.chord_shorthand_meaning["add9"])
+        self.assertRaises(FormatError, chords.from_shorthand, "Fadd9")
+        self.assertFalse("F add nine" in chords.determine(["F", "A", "C", "G"]))
+        self.assertRaises(FormatError, chords.unregister_chord, "add9")
+
     def test_determine_polychord(self):
         self.chordsTest(
             [  # insano test
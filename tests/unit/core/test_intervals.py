@@ -360,6 +360,16 @@ class test_intervals(unittest.TestCase):
         self.assertEqual("E", intervals.from_shorthand("D", "2"))
         self.assertEqual("F#", intervals.from_shorthand("D", "3"))
 
+    def test_interval_tables(self):
+        self.assertEqual(756, len(intervals._interval_table))
+        for (note, letters, half_notes), res in intervals._interval_table.items():
+            pitch = intervals.notes.to_pitch(note)
+            self.assertEqual(res, intervals._interval_from(pitch, letters, half_notes))
+        self.assertEqual("Bbb", intervals.minor_seventh("Cb"))
+        self.assertEqual("F#####", intervals.major_third("D####"))
+        self.assertEqual("diminished seventh", intervals.determine("C#", "Bb"))
+        self.assertEqual("bbbbbbbbbbb7", intervals.determine("C", "B#", True))
+
     def test_invert(self):
         self.assertEqual(["C", "E"], intervals.invert(["E", "C"]))
 
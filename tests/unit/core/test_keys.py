@@ -67,6 +67,30 @@ class test_keys(unittest.TestCase):
                 "The minor of %s is not %s, expecting %s" % (k, keys.relative_minor(k), known[k]),
             )
 
+    def test_get_notes_copies(self):
+        keys.get_notes("F").append("X")
+        keys.get_notes("F")[0] = "X"
+        self.assertEqual(self.scale["F"], keys.get_notes("F"))
+        self.assertEqual(tuple(self.scale["F"]), keys.get_key_info("F").notes)
+
+    def test_key_info(self):
+        info = keys.get_key_info("d#")
+        self.assertEqual(("minor", "D sharp minor", 6, "F#"), info[1:4] + (info.relative,))
+        self.assertEqual(("F#", "C#", "G#", "D#", "A#", "E#"), info.accidentals)
+        self.assertRaises(keys.NoteFormatError, keys.get_key_info, "X")
+        self.assertRaises(keys.NoteFormatError, keys.relative_major, "C")
+        self.assertFalse(keys.is_valid_key(["C"]))
+
+    def test_key(self):
+        k = keys.Key("Eb")
+        self.assertTrue(k is keys.Key("Eb"))
+        self.assertEqual(("Eb", "major", "E flat major", -3), (k.key, k.mode, k.name, k.signature))
+        self.assertEqual(k.info, keys.get_key_info("Eb"))
+        self.assertEqual(1, len(set([k, keys.Key("Eb")])))
+        self.assertNotEqual(k, keys.Key("eb"))
+        self.assertRaises(AttributeError, setattr, k, "key", "C")
+        self.assertRaises(keys.NoteFormatError, keys.Key, "H")
+
 
 def load_tests(loader, tests, ignore):
     tests.addTests(doctest.DocTestSuite(keys))
@@ -4,7 +4,7 @@ import doctest
 import unittest
 
 import mingus.core.notes as notes
-from mingus.core.mt_exceptions import RangeError
+from mingus.core.mt_exceptions import NoteFormatError, RangeError
 
 
 class test_notes(unittest.TestCase):
@@ -106,6 +106,37 @@ class test_notes(unittest.TestCase):
                 % (x, notes.diminish(x), known[x]),
             )
 
+    def test_pitch(self):
+        self.assertTrue(notes.Pitch.from_string("C##") is notes.Pitch(0, 2))
+        self.assertTrue(notes.Pitch.from_string("Eb##b") is notes.Pitch.from_string("E"))
+        self.assertEqual("Bbb", notes.Pitch(6, -2).name)
+        self.assertEqual(11, int(notes.Pitch.from_string("Cb")))
+        self.assertEqual(59, int(notes.Pitch.from_string("Cb", 5)))
+        self.assertEqual("Db-4", str(notes.Pitch.from_string("Db", 4).diminish().augment()))
+        self.assertRaises(AttributeError, setattr, notes.Pitch(0), "letter", 1)
+        self.assertRaises(NoteFormatError, notes.to_pitch, "H")
+        self.assertRaises(NoteFormatError, notes.to_pitch, "C$")
+
+    def test_pitch_interoperates_with_strings(self):
+        pitch = notes.Pitch.from_string("F#")
+        self.assertTrue(notes.is_valid_note(pitch))
+        self.assertEqual(6, notes.note_to_int(pitch))
+        self.assertEqual("G", notes.reduce_accidentals(notes.augment(pitch)))
+        self.assertTrue(notes.augment(pitch) is notes.Pitch(3, 2))
+
+    def test_pitch_tables_are_bounded(self):
+        cached = len(notes._pitch_cache)
+        interned = len(notes.Pitch._interned)
+        for i in range(5, 50):
+            self.assertEqual(i % 12, notes.note_to_int("C" + "#" * i))
+            self.assertEqual("C" + "#" * i, notes.Pitch(0, i).name)
+            self.assertEqual(12 * (100 + i), int(notes.Pitch(0, 0, 100 + i)))
+        self.assertEqual(cached, len(notes._pitch_cache))
+        self.assertEqual(interned, len(notes.Pitch._interned))
+        self.assertEqual(notes.Pitch(0, 7), notes.Pitch.from_string("C#######"))
+        self.assertEqual(1, len(set([notes.Pitch(0, 7), notes.Pitch(0, 7)])))
+        self.assertNotEqual(notes.Pitch(0, 7), notes.Pitch(0, 7, 4))
+
 
 def load_tests(loader, tests, ignore):
     tests.addTests(doctest.DocTestSuite(notes))
@@ -3,6 +3,8 @@ from __future__ import absolute_import
 import unittest
 
 import mingus.core.progressions as progressions
+from mingus.containers.note_container import NoteContainer
+from mingus.core.keys import Key
 
 
 class test_progressions(unittest.TestCase):
@@ -51,6 +53,29 @@ class test_progressions(unittest.TestCase):
         self.assertTrue("I" in progressions.substitute(["VI"], 0))
         self.assertTrue("IIM" in progressions.substitute(["VIIm"], 0))
 
+    def test_substitute_does_not_change_progression(self):
+        progression = ["I", "IV", "V7", "I"]
+        progressions.substitute(progression, 2, 2)
+        self.assertEqual(["I", "IV", "V7", "I"], progression)
+
+    def test_iter_substitutions(self):
+        progression = ["I", "VIIdim7", "I"]
+        for depth in range(4):
+            res = list(progressions.iter_substitutions(progression, 1, depth))
+            self.assertEqual(len(set(res)), len(res))
+            self.assertEqual(
+                set(progressions.substitute(progression, 1, depth)) - set(["VIIdim7"]), set(res)
+            )
+        self.assertEqual(["I", "VIIdim7", "I"], progression)
+        self.assertEqual(
+            progressions.substitute(progression, 1)[:3],
+            list(progressions.iter_substitutions(progression, 1, limit=3)),
+        )
+        everything = list(progressions.iter_substitutions(["bIIIm"], 0, None))
+        self.assertEqual(len(set(everything)), len(everything))
+        self.assertFalse("bIIIm" in everything)
+        self.assertEqual([], list(progressions.iter_substitutions(["Vdom7"], 0, None)))
+
     def test_substitute_harmonic(self):
         self.assertTrue("III" in progressions.substitute_harmonic(["I"], 0))
         self.assertTrue([] == progressions.substitute_harmonic(["IM"], 0))
@@ -117,3 +142,49 @@ class test_progressions(unittest.TestCase):
             progressions.determine([["C", "E", "G"], ["G", "B", "D"]], "C", True),
         )
         self.assertEqual(["bii", "bIVM6"], progressions.determine(["Db", "Fb", "Ab"], "C", True))
+
+    def test_determine_progression(self):
+        progression = [
+            ["C", "E", "G"],
+            ["A", "C", "E", "G"],
+            ["D", "F", "A", "C"],
+            ["G", "B", "D", "F"],
+            ["C", "E", "G"],
+        ]
+        self.assertEqual(
+            [progressions.determine(c, "C", True) for c in progression],
+            progressions.determine_progression(progression, "C", True),
+        )
+        self.assertEqual(
+            [progressions.determine(c, "F") for c in progression],
+            progressions.determine_progression(progression, "F"),
+        )
+        self.assertEqual(
+            [["I"], ["vi7", "IM6"], ["ii7", "IVM6"], ["I7"], ["IV"]],
+            progressions.determine_progression(progression, {0: "C", 3: "G"}, True),
+        )
+        self.assertEqual(
+            [["I"], ["vi7", "IM6"], ["ii7", "IVM6"], ["V7"], ["V"]],
+            progressions.determine_progression(progression, ["C", "C", "C", "C", "F"], True),
+        )
+        self.assertEqual(
+            [["I"], ["V"]],
+            progressions.determine_progression(
+                [NoteContainer(["C", "E", "G"]), NoteContainer(["G", "B", "D"])], "C", True
+            ),
+        )
+        self.assertEqual(
+            [progressions.determine(c, Key("C"), True) for c in progression],
+            progressions.determine_progression(progression, Key("C"), True),
+        )
+        self.assertEqual(
+            [["I"], ["vi7", "IM6"], ["ii7", "IVM6"], ["V7"], ["V"]],
+            progressions.determine_progression(progression, [Key("C")] * 4 + [Key("F")], True),
+        )
+        self.assertEqual(
+            [["I"], ["vi7", "IM6"], ["ii7", "IVM6"], ["I7"], ["IV"]],
+            progressions.determine_progression(progression, {0: Key("C"), 3: Key("G")}, True),
+        )
+        res = progressions.determine_progression(progression, "C", True)
+        res[0].append("X")
+        self.assertEqual(["I"], res[4])
@@ -3,6 +3,8 @@ from __future__ import absolute_import
 
 import unittest
 
+import mingus.core.cache as cache
+from mingus.core.mt_exceptions import NoteFormatError
 import mingus.core.scales as scales
 
 
@@ -445,3 +447,51 @@ class test_scales(unittest.TestCase):
         self.assertNotEqual(scales.NaturalMinor("A"), scales.MelodicMinor("A"))
         self.assertNotEqual(scales.Major("F"), scales.Major("D"))
         self.assertNotEqual(scales.Ionian("E"), scales.Dorian("E"))
+
+    def test_determine(self):
+        self.assertEqual(
+            ["G melodic minor", "G Bachian", "D harmonic major"],
+            scales.determine(["A", "Bb", "E", "F#", "G"]),
+        )
+        # The spelling matters
+        self.assertEqual([], scales.determine(["A", "A#", "E", "F#", "G"]))
+        self.assertEqual([], scales.determine(["C", "X"]))
+        self.assertEqual(105, len(scales.determine([])))
+        self.assertTrue("A melodic minor" in scales.determine(["G", "F"]))
+
+    def test_best_fit(self):
+        self.assertEqual(
+            [("C major", 1.0), ("A natural minor", 1.0)],
+            scales.best_fit(["C", "E", "G", "B", "D", "F", "A"], 2),
+        )
+        res = scales.best_fit(["C", "C", "E", "G", "A#"])
+        self.assertEqual(5, len(res))
+        self.assertEqual(("Ab harmonic major", 1.0), res[0])
+        self.assertTrue(("F major", 1.0) in scales.best_fit(["C", "C", "E", "G", "A#"], 105))
+        self.assertTrue(("C major", 0.75) in scales.best_fit(["C", "C", "C", "F#"], 105))
+        self.assertEqual([], scales.best_fit([]))
+
+    def test_scale(self):
+        s = scales.Scale("D", ("1", "2", "b3", "#4", "5", "6", "b7"), name="D dorian #4")
+        self.assertEqual(["D", "E", "F", "G#", "A", "B", "C", "D"], s.ascending())
+        self.assertEqual(["D", "C", "B", "A", "G#", "F", "E", "D"], s.descending())
+        self.assertEqual("G#", s.degree(4))
+        self.assertEqual("D dorian #4", s.name)
+        s = scales.Scale("C", ("1", "b3", "4", "5", "b7"), 2, ("1", "b3", "4", "b5", "b7"))
+        self.assertEqual("C scale 1 b3 4 5 b7", s.name)
+        self.assertEqual(11, len(s.ascending()))
+        self.assertEqual(["C", "Bb", "Gb", "F", "Eb", "C"], s.descending()[:6])
+        self.assertRaises(NoteFormatError, scales.Scale("X", ("1", "3")).ascending)
+
+    def test_degree_descending(self):
+        self.assertEqual("F", scales.MelodicMinor("A").degree(6, "d"))
+        self.assertEqual("F#", scales.MelodicMinor("A").degree(6))
+
+    def test_notes_cache(self):
+        cache.clear("scales.notes")
+        res = scales.Dorian("D").ascending()
+        res.append("X")
+        self.assertEqual(["D", "E", "F", "G", "A", "B", "C", "D"], scales.Dorian("D").ascending())
+        self.assertEqual(1, cache.info("scales.notes").hits)
+        self.assertEqual(["C", "D", "E", "F", "G", "A", "B", "C"], scales.Ionian("C").ascending())
+        self.assertEqual(2, cache.info("scales.notes").misses)
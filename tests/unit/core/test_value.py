@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 import doctest
 import unittest
+from fractions import Fraction
 
 import mingus.core.value as value
 
@@ -15,6 +16,17 @@ class test_value(unittest.TestCase):
         self.assertEqual(value.add(4, 8), 8 / 3.0)
         self.assertEqual(value.add(8, 4), 8 / 3.0)
 
+    def test_add_exact(self):
+        self.assertEqual(Fraction(8, 3), value.add(Fraction(4), 8))
+        self.assertEqual(Fraction(8), value.subtract(4, Fraction(8)))
+        self.assertEqual(Fraction(1, 12), value.length(value.triplet(8)))
+        self.assertEqual(Fraction(15, 2), value.to_fraction(value.quintuplet(6)))
+
+    def test_determine_exact(self):
+        self.assertEqual(value.determine(Fraction(12)), (8, 0, 3, 2))
+        self.assertEqual(value.determine(Fraction(16, 3)), (8, 1, 1, 1))
+        self.assertEqual(value.determine(Fraction(10)), (8, 0, 5, 4))
+
     def test_dots(self):
         self.assertEqual(value.dots(4, 0), 4)
         self.assertEqual(value.dots(4, 1), 8 / 3.0)
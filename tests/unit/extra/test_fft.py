@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
+import math
+import operator
+import random
 import unittest
 
 from pkg_resources import resource_filename
@@ -9,6 +12,17 @@ import mingus.extra.fft as fft
 from mingus.containers import *
 
 
+def reference_notes(data, freq, bits, chunksize):
+    """The dominant note of every chunk, found one chunk at a time like
+    analyze_chunks used to."""
+    res = []
+    for i in range(0, len(data), chunksize):
+        f = fft.find_frequencies(data[i : i + chunksize], freq, bits)
+        (note, amplitude) = sorted(fft.find_notes(f), key=operator.itemgetter(1))[-1]
+        res.append((-1 if note is None else int(note), amplitude))
+    return res
+
+
 class test_fft(unittest.TestCase):
     def setUp(self):
         (self.data, self.freq, self.bits) = fft.data_from_file(
@@ -23,3 +37,37 @@ class test_fft(unittest.TestCase):
             [(Note("A-4"), 86), (Note("A-5"), 86)],
             fft.find_melody(resource_filename(__name__, "440_880_clean.wav"), 512)[:2],
         )
+
+    def test_analyze_frames(self):
+        (data, freq, bits) = fft.data_from_file(resource_filename(__name__, "440_880_clean.wav"))
+        (notes, amplitudes) = fft.analyze_frames(data, freq, bits, 512)
+        self.assertEqual(173, len(notes))
+        self.assertEqual([int(Note("A-4"))] * 86, list(notes[:86]))
+        self.assertTrue((amplitudes > 0).all())
+
+    def test_analyze_frames_reference(self):
+        (wav, freq, bits) = fft.data_from_file(resource_filename(__name__, "440_880_clean.wav"))
+        rnd = random.Random(1)
+        chords = [
+            [int(4000 * math.sin(2 * math.pi * f * i / 44100.0)) for f in (261.6, 329.6, 392.0)]
+            for i in range(5000)
+        ]
+        signals = [
+            (wav, freq, 1000),
+            ([sum(c) for c in chords], 44100, 512),
+            ([rnd.randint(-3000, 3000) for i in range(3000)], 4000, 256),
+        ]
+        for (data, freq, chunksize) in signals:
+            # The last chunk is shorter than the rest
+            self.assertNotEqual(0, len(data) % chunksize)
+            (notes, amplitudes) = fft.analyze_frames(data, freq, bits, chunksize)
+            expected = reference_notes(data, freq, bits, chunksize)
+            self.assertEqual([n for (n, a) in expected], notes.tolist())
+            for (a, (n, b)) in zip(amplitudes.tolist(), expected):
+                self.assertAlmostEqual(1.0, a / b)
+            self.assertEqual(
+                [None if n < 0 else Note().from_int(n) for (n, a) in expected],
+                fft.analyze_chunks(data, freq, bits, chunksize),
+            )
+        (notes, amplitudes) = fft.analyze_frames([0] * 600, freq, bits, 512)
+        self.assertEqual([-1, -1], list(notes))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+import doctest
+import unittest
+
+import mingus.extra.key_detection as key_detection
+from mingus.containers.bar import Bar
+from mingus.containers.composition import Composition
+from mingus.containers.track import Track
+from mingus.core import progressions, scales
+
+
+class test_key_detection(unittest.TestCase):
+    def setUp(self):
+        # Two bars of G major followed by two bars of Eb major
+        self.track = Track()
+        for scale in [scales.Major("G"), scales.Major("G"), scales.Major("Eb"), scales.Major("Eb")]:
+            for n in scale.ascending()[:-1] + [scale.tonic]:
+                self.track.add_notes(n, 8)
+
+    def test_bar_histograms(self):
+        bars = key_detection.bar_histograms(self.track)
+        self.assertEqual(4, len(bars))
+        self.assertEqual(0.25, bars[0][7])
+        self.assertEqual(0.125, bars[0][6])
+        self.assertEqual(0.0, bars[0][5])
+        self.assertEqual(0.25, bars[2][3])
+        c = Composition()
+        c.add_track(self.track)
+        c.add_track(self.track)
+        self.assertEqual(0.5, key_detection.bar_histograms(c)[0][7])
+        self.assertEqual([], key_detection.bar_histograms(Track()))
+        self.assertEqual([[0.0] * 12], key_detection.bar_histograms(Bar()))
+
+    def test_pitch_class_histogram(self):
+        histogram = key_detection.pitch_class_histogram(self.track)
+        self.assertEqual(4.0, sum(histogram))
+        self.assertEqual(0.25, histogram[8])
+        self.assertEqual(0.0, histogram[1])
+
+    def test_key_correlations(self):
+        res = key_detection.key_correlations([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1])
+        self.assertEqual(24, len(res))
+        self.assertEqual(["C", "a"], [k for (k, r) in res[:2]])
+        self.assertTrue(res[0][1] > res[1][1])
+        self.assertEqual([], key_detection.key_correlations([0.0] * 12))
+        self.assertEqual(
+            "C",
+            key_detection.key_correlations(
+                [1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1], key_detection.TEMPERLEY
+            )[0][0],
+        )
+
+    def test_determine_key(self):
+        self.assertEqual("G", key_detection.determine_key(self.track.bars[0]))
+        self.assertEqual("Eb", key_detection.determine_key(self.track.bars[3]))
+        self.assertEqual(None, key_detection.determine_key(Track()))
+        t = Track()
+        for n in ["E", "F#", "G", "A", "B", "C", "D#", "E"]:
+            t.add_notes(n, 4)
+        t.add_notes(["E", "G", "B"], 1)
+        self.assertEqual("e", key_detection.determine_key(t))
+
+    def test_sliding_keys(self):
+        self.assertEqual(["G", "G", "Eb", "Eb"], key_detection.sliding_keys(self.track, 1))
+        # The windows are centered on the bar, with the extra bar after it
+        self.assertEqual(["G", "g", "Eb", "Eb"], key_detection.sliding_keys(self.track, 2))
+        self.assertEqual(["G", "G", "c", "Eb"], key_detection.sliding_keys(self.track, 3))
+        self.assertEqual(
+            [key_detection.determine_key(self.track)] * 4,
+            key_detection.sliding_keys(self.track, 7),
+        )
+        t = Track()
+        t.add_bar(Bar())
+        t.add_bar(self.track.bars[0])
+        self.assertEqual([None, "G"], key_detection.sliding_keys(t, 1))
+
+    def test_set_keys(self):
+        key_detection.set_keys(self.track, 1)
+        self.assertEqual(["G", "G", "Eb", "Eb"], [b.key.key for b in self.track.bars])
+        self.assertEqual(
+            ["V"], progressions.determine(["D", "F#", "A"], self.track.bars[0].key, True)
+        )
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(key_detection))
+    return tests
@@ -0,0 +1,167 @@
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+from fractions import Fraction
+
+from mingus.containers import Bar, Composition, NoteContainer, Track
+from mingus.midi import midi_file_in, midi_file_out
+
+HEADER = b"MThd\x00\x00\x00\x06\x00\x01\x00\x01\x00\x60"
+
+
+def track_chunk(events):
+    return b"MTrk" + len(events).to_bytes(4, "big") + events
+
+
+class test_midi_file_in(unittest.TestCase):
+    def setUp(self):
+        self.parser = midi_file_in.MidiFile()
+
+    def test_parse_midi_data(self):
+        events = (
+            b"\x00\xff\x51\x03\x07\xa1\x20"  # set tempo
+            b"\x00\xf0\x03\x7e\x7f\xf7"  # sysex
+            b"\x00\x90\x3c\x40"  # note on
+            b"\x00\x40\x40"  # running status note on
+            b"\x81\x00\x3c\x00"  # running status note on with velocity 0
+            b"\x00\xc1\x0d"  # program change
+            b"\x00\xff\x2f\x00"  # end of track
+        )
+        data = HEADER + b"XFIR\x00\x00\x00\x02ab" + track_chunk(events)
+        (header, tracks) = self.parser.parse_midi_data(data)
+        self.assertEqual((1, 1, {"fps": False, "ticks_per_beat": 96}), header)
+        self.assertEqual(
+            [
+                (0, 0xFF, 0x51, b"\x07\xa1\x20"),
+                (0, 0xF0, None, b"\x7e\x7f\xf7"),
+                (0, 0x90, 0x3C, 0x40),
+                (0, 0x90, 0x40, 0x40),
+                (0x80, 0x80, 0x3C, 0x00),
+                (0, 0xC1, 0x0D, None),
+                (0, 0xFF, 0x2F, b""),
+            ],
+            tracks[0],
+        )
+
+    def test_parse_midi_data_errors(self):
+        self.assertRaises(midi_file_in.HeaderError, self.parser.parse_midi_data, b"MTrk")
+        self.assertRaises(
+            midi_file_in.FormatError,
+            self.parser.parse_midi_data,
+            HEADER + track_chunk(b"\x00\x3c\x40"),
+        )
+        self.assertRaises(IOError, self.parser.parse_midi_data, HEADER + track_chunk(b"\x00\x90"))
+        # Meta and system exclusive events cancel running status
+        for event in (b"\x00\xff\x01\x01a", b"\x00\xf0\x01\xf7", b"\x00\xf7\x00"):
+            self.assertRaises(
+                midi_file_in.FormatError,
+                self.parser.parse_midi_data,
+                HEADER + track_chunk(b"\x00\x90\x3c\x40" + event + b"\x00\x3c\x00"),
+            )
+        self.assertRaises(midi_file_in.HeaderError, self.parser.parse_midi_data, HEADER)
+
+    def test_parse_midi_file(self):
+        c = Composition()
+        t = Track()
+        b = Bar()
+        b.place_notes(NoteContainer(["C", "E"]), 2)
+        b.place_notes("G", 2)
+        t.add_bar(b)
+        c.add_track(t)
+        (fd, path) = tempfile.mkstemp(suffix=".mid")
+        os.close(fd)
+        try:
+            midi_file_out.write_Composition(path, c)
+            (header, tracks) = self.parser.parse_midi_file(path)
+            (composition, bpm) = midi_file_in.MIDI_to_Composition(path)
+        finally:
+            os.remove(path)
+        self.assertEqual({"event": 9, "channel": 1, "param1": 60, "param2": 64}, tracks[0][4][1])
+        self.assertEqual({"event": 15, "meta_event": 47, "data": b""}, tracks[0][-1][1])
+        self.assertEqual(120, bpm)
+        self.assertEqual(["C-4", "E-4"], [repr(n)[1:-1] for n in composition[0][0][0][2]])
+
+    def test_parse_midi_file_exact(self):
+        c = Composition()
+        t = Track(exact=True)
+        for i in range(20):
+            t.add_notes("C", 10)
+        c.add_track(t)
+        (fd, path) = tempfile.mkstemp(suffix=".mid")
+        os.close(fd)
+        try:
+            midi_file_out.write_Composition(path, c)
+            (composition, bpm) = midi_file_in.MIDI_to_Composition(path, exact=True)
+        finally:
+            os.remove(path)
+        for b in composition[0].bars[:2]:
+            self.assertTrue(b.exact)
+            self.assertEqual(10, len(b))
+            self.assertEqual(1, b.current_beat)
+            self.assertEqual(Fraction(288, 29), b[0][1])
+
+    def test_iter_events(self):
+        conductor = (
+            b"\x00\xff\x51\x03\x07\xa1\x20"  # 120 bpm
+            b"\x00\xff\x59\x02\xfd\x01"  # 3 flats, minor
+            b"\x81\x40\xff\x51\x03\x0f\x42\x40"  # 60 bpm after two beats
+            b"\x00\xff\x2f\x00"
+        )
+        events = (
+            b"\x00\xff\x03\x04Bass"
+            b"\x00\x91\x3c\x40"
+            b"\x81\x40\x3c\x00"  # note off after two beats
+            b"\x60\x91\x40\x50"  # note on after another beat
+            b"\x00\xff\x2f\x00"
+        )
+        data = (
+            b"MThd\x00\x00\x00\x06\x00\x01\x00\x02\x00\x60"
+            + track_chunk(conductor)
+            + track_chunk(events)
+        )
+        result = list(self.parser.iter_events(data, tracks=[1]))
+        self.assertEqual(
+            [
+                midi_file_in.TrackName(1, 0, 0.0, "Bass"),
+                midi_file_in.NoteOn(1, 0, 0.0, 1, 60, 64),
+                midi_file_in.NoteOff(1, 192, 1.0, 1, 60, 0),
+                midi_file_in.NoteOn(1, 288, 2.0, 1, 64, 80),
+                midi_file_in.MetaEvent(1, 288, 2.0, 47, b""),
+            ],
+            result,
+        )
+        result = self.parser.iter_events(data)
+        self.assertEqual(midi_file_in.Tempo(0, 0, 0.0, 500000, 120.0), next(result))
+        self.assertEqual(midi_file_in.KeySignature(0, 0, 0.0, "c"), next(result))
+        self.assertEqual(60.0, next(result).bpm)
+        self.assertEqual(9, len(list(result)) + 3)
+        self.assertRaises(midi_file_in.HeaderError, self.parser.iter_events, b"MTrk")
+
+    def test_midi_files_to_compositions(self):
+        t = Track()
+        t.add_notes("C")
+        directory = tempfile.mkdtemp()
+        good = os.path.join(directory, "good.mid")
+        bad = os.path.join(directory, "sub", "bad.MID")
+        os.mkdir(os.path.dirname(bad))
+        midi_file_out.write_Track(good, t)
+        with open(bad, "wb") as f:
+            f.write(b"RIFF")
+        with open(os.path.join(directory, "notes.txt"), "w") as f:
+            f.write("C E G")
+        try:
+            for workers in (1, 2):
+                batch = midi_file_in.MIDI_files_to_Compositions(directory, workers)
+                self.assertEqual([good, bad], batch.paths)
+                results = dict(batch)
+                self.assertEqual(120, results[good][1])
+                self.assertEqual("C-4", repr(results[good][0][0][0][0][2][0])[1:-1])
+                self.assertTrue(isinstance(results[bad], midi_file_in.HeaderError))
+                self.assertEqual((2, 2, 1), (batch.total, batch.done, batch.failed))
+                self.assertEqual(2, len(list(batch)))
+                self.assertEqual((2, 2, 1), (batch.total, batch.done, batch.failed))
+        finally:
+            shutil.rmtree(directory)
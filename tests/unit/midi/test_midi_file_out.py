@@ -0,0 +1,84 @@
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from mingus.containers import Bar, Composition, MidiInstrument, NoteContainer, Track
+from mingus.midi import midi_file_out
+from mingus.midi.midi_track import MidiTrack
+
+
+class _Unseekable(object):
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        self.buffer.write(data)
+
+
+class test_midi_file_out(unittest.TestCase):
+    def setUp(self):
+        self.composition = Composition()
+        for name, key in [("Piano", "C"), ("Bass", "Ab")]:
+            track = Track()
+            track.name = name
+            track.instrument = MidiInstrument()
+            track.instrument.instrument_nr = 13
+            for i in range(8):
+                bar = Bar(key, (3, 4))
+                bar.place_notes(NoteContainer(["A", "C", "E"]), 4)
+                bar.place_notes(None, 4)
+                bar.place_notes("G", 4)
+                track.add_bar(bar)
+            self.composition.add_track(track)
+
+    def render(self, repeat=0):
+        m = midi_file_out.MidiFile([MidiTrack(120) for _ in self.composition.tracks])
+        for _ in range(repeat + 1):
+            for midi_track, track in zip(m.tracks, self.composition.tracks):
+                midi_track.play_Track(track)
+        return m.get_midi_data()
+
+    def test_stream_Composition(self):
+        fp = io.BytesIO()
+        fp.write(b"junk")
+        written = midi_file_out.stream_Composition(fp, self.composition, repeat=1)
+        self.assertEqual(b"junk" + self.render(1), fp.getvalue())
+        self.assertEqual(len(fp.getvalue()) - 4, written)
+
+    def test_stream_Composition_unseekable(self):
+        fp = _Unseekable()
+        written = midi_file_out.stream_Composition(fp, self.composition)
+        self.assertEqual(self.render(), fp.buffer.getvalue())
+        self.assertEqual(len(fp.buffer.getvalue()), written)
+
+    def test_empty_tracks(self):
+        empty = MidiTrack(120)
+        empty.reset()
+        m = midi_file_out.MidiFile([MidiTrack(120), empty])
+        self.assertTrue(empty.is_empty())
+        self.assertFalse(m.tracks[0].is_empty())
+        self.assertEqual(b"\x00\x01", m.header()[10:12])
+        self.assertEqual(1, m.get_midi_data().count(b"MTrk"))
+
+    def test_write_Composition(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "out.mid")
+            with open(path, "wb") as f:
+                f.write(b"junk" * 1000)
+            self.assertTrue(midi_file_out.write_Composition(path, self.composition))
+            with open(path, "rb") as f:
+                self.assertEqual(self.render(), f.read())
+            if hasattr(os, "symlink"):
+                link = os.path.join(directory, "link.mid")
+                os.symlink(path, link)
+                self.assertTrue(midi_file_out.write_Composition(link, self.composition, repeat=1))
+                self.assertTrue(os.path.islink(link))
+                with open(path, "rb") as f:
+                    self.assertEqual(self.render(1), f.read())
+        finally:
+            shutil.rmtree(directory)
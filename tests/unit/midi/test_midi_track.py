@@ -0,0 +1,60 @@
+from __future__ import absolute_import
+
+import unittest
+
+from mingus.containers import Track
+from mingus.containers.note import Note
+from mingus.midi.midi_track import MidiTrack
+
+
+class test_MidiTrack(unittest.TestCase):
+    def setUp(self):
+        self.track = MidiTrack()
+
+    def test_int_to_varbyte(self):
+        known = {
+            0: b"\x00",
+            0x40: b"\x40",
+            0x7F: b"\x7f",
+            0x80: b"\x81\x00",
+            0x2000: b"\xc0\x00",
+            0x3FFF: b"\xff\x7f",
+            0x4000: b"\x81\x80\x00",
+            0x100000: b"\xc0\x80\x00",
+            0x0FFFFFFF: b"\xff\xff\xff\x7f",
+        }
+        for value, varbyte in known.items():
+            self.assertEqual(varbyte, self.track.int_to_varbyte(value))
+
+    def test_track_data(self):
+        self.assertEqual(b"\x00\xff\x51\x03\x07\xa1\x20", self.track.track_data)
+        self.track.play_Note(Note("C", 4))
+        self.assertEqual(b"\x00\x91\x3c\x40", self.track.track_data[7:])
+        self.track.track_data += b"\x00\xb0\x07\x64"
+        self.assertEqual(
+            b"MTrk\x00\x00\x00\x13" + self.track.track_data + b"\x00\xff\x2f\x00",
+            self.track.get_midi_data(),
+        )
+        self.track.reset()
+        self.assertEqual(b"", self.track.track_data)
+
+    def test_play_Track_ticks(self):
+        def note_events(exact):
+            t = Track(exact=exact)
+            for i in range(5):
+                t.add_notes("C", 20)
+            self.track.reset()
+            self.track.play_Track(t)
+            return self.track.track_data[-40:]
+
+        # Every length is rounded, like mingus always did
+        self.assertEqual(b"\x00\x91\x3c\x40\x0e\x81\x3c\x40" * 5, note_events(False))
+        # Exact tracks round the positions, so the bar lasts 72 ticks
+        self.assertEqual(
+            b"\x00\x91\x3c\x40\x0e\x81\x3c\x40"
+            b"\x00\x91\x3c\x40\x0f\x81\x3c\x40"
+            b"\x00\x91\x3c\x40\x0e\x81\x3c\x40"
+            b"\x00\x91\x3c\x40\x0f\x81\x3c\x40"
+            b"\x00\x91\x3c\x40\x0e\x81\x3c\x40",
+            note_events(True),
+        )